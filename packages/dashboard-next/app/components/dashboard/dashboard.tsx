@@ -8,20 +8,27 @@ const SERVER_URL = "/api/proxy";
 export default function Dashboard() {
   const [cards, setCards] = useState<DashboardCard[]>([]);
 
-  // 1. Initial Load
-  useEffect(() => {
+  const loadCards = () => {
     fetch(`${SERVER_URL}/event/notifications`)
       .then((res) => res.json())
       .then((data) => {
         setCards(data);
       })
       .catch((err) => console.error("Failed to load cards", err));
+  };
+
+  // 1. Initial Load
+  useEffect(() => {
+    loadCards();
   }, []);
 
   // 2. Live Updates
   useEffect(() => {
     const eventSource = new EventSource(`${SERVER_URL}/event/stream`);
 
+    // Sent when the server can no longer replay what we missed since Last-Event-ID
+    eventSource.addEventListener("resync", loadCards);
+
     eventSource.onmessage = (event) => {
       const newCard = JSON.parse(event.data);
       setCards((prev) => {
@@ -0,0 +1,285 @@
+import re
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from redis.asyncio import Redis
+from core.config import config
+from core.redis_db import r
+from core.helpers.metrics import registry
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+# Capped stream the tele-bot appends card events to ({"data": <json>} entries)
+EVENTS_STREAM = "dashboard:stream"
+BLOCK_MS = 15000
+# How long a new listener waits for the reader to fix its starting id
+READY_TIMEOUT_SEC = 5.0
+# <ms>[-<seq>], both unsigned 64-bit. [0-9] rather than \d, which also
+# matches non-ASCII digits that Redis rejects.
+STREAM_ID_RE = re.compile(r"[0-9]{1,20}(-[0-9]{1,20})?")
+STREAM_ID_MAX = 2**64 - 1
+
+SSE_DROPPED = registry.counter("sse_dropped_events_total", "Events dropped for slow SSE clients, counted as they drop")
+# Exported as 0 before the first drop rather than missing
+SSE_DROPPED.inc(amount=0)
+
+
+def stream_id_key(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def is_stream_id(value: str | None) -> bool:
+    """Whether Redis would accept `value` as an exclusive XRANGE start"""
+    if not value or not STREAM_ID_RE.fullmatch(value):
+        return False
+    key = stream_id_key(value)
+    # Nothing can follow the largest id, so Redis rejects "(" before it too
+    return all(part <= STREAM_ID_MAX for part in key) and key != (STREAM_ID_MAX, STREAM_ID_MAX)
+
+
+class ReplayGap(Exception):
+    """The requested position is no longer (fully) retained by the stream"""
+
+
+class OverflowPolicy:
+    DROP_OLDEST = "drop_oldest"
+    RESYNC = "resync"
+
+
+class ClientStream:
+    """
+    Bounded buffer between the broadcaster and one SSE connection. When the
+    connection cannot keep up, the overflow policy either drops the oldest
+    entries or discards the whole backlog and asks the client to resync.
+    """
+
+    def __init__(self, maxsize: int, policy: str = OverflowPolicy.DROP_OLDEST):
+        self._items: deque[tuple[str, str, float]] = deque()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._wakeup = asyncio.Event()
+        self.resync_pending = False
+        self.dropped = 0
+
+    @property
+    def lag(self) -> int:
+        return len(self._items)
+
+    @property
+    def lag_seconds(self) -> float:
+        if not self._items:
+            return 0.0
+        return time.monotonic() - self._items[0][2]
+
+    def offer(self, entry_id: str, payload: str) -> None:
+        if len(self._items) >= self._maxsize:
+            if self._policy == OverflowPolicy.RESYNC:
+                dropped = len(self._items)
+                self._items.clear()
+                self.resync_pending = True
+            else:
+                self._items.popleft()
+                dropped = 1
+            self.dropped += dropped
+            SSE_DROPPED.inc(amount=dropped)
+        self._items.append((entry_id, payload, time.monotonic()))
+        self._wakeup.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Waits for pending entries; False when `timeout` passed without any"""
+        if self._items or self.resync_pending:
+            return True
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def take_resync(self) -> bool:
+        pending, self.resync_pending = self.resync_pending, False
+        return pending
+
+    def drain(self, max_items: int) -> list[tuple[str, str]]:
+        batch = []
+        while self._items and len(batch) < max_items:
+            entry_id, payload, _ = self._items.popleft()
+            batch.append((entry_id, payload))
+        return batch
+
+    def stats(self) -> dict:
+        return {"lag": self.lag, "lag_seconds": round(self.lag_seconds, 3), "dropped": self.dropped}
+
+
+class EventBroadcaster:
+    """
+    Holds a single Redis stream reader per worker and fans every entry out to
+    the bounded ClientStream of each connected SSE client.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        stream: str = EVENTS_STREAM,
+        queue_size: int = 256,
+        overflow_policy: str = OverflowPolicy.DROP_OLDEST,
+    ):
+        self._r = redis_client
+        self._stream = stream
+        self._queue_size = queue_size
+        self._overflow_policy = overflow_policy
+        self._clients: set[ClientStream] = set()
+        self._task: asyncio.Task | None = None
+        self.ready = asyncio.Event()
+        self._dropped_closed = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped_closed + sum(client.dropped for client in self._clients)
+
+    def stats(self) -> dict:
+        clients = [client.stats() for client in self._clients]
+        return {
+            "clients": len(clients),
+            "dropped": self.dropped,
+            "backlog": sum(c["lag"] for c in clients),
+            "max_lag": max((c["lag"] for c in clients), default=0),
+            "max_lag_seconds": max((c["lag_seconds"] for c in clients), default=0.0),
+            "per_client": clients,
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self.ready.clear()
+            self._task = asyncio.create_task(self._pump())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @asynccontextmanager
+    async def listen(self) -> AsyncIterator[ClientStream]:
+        # Normally started by the app lifespan; covers apps run without it
+        await self.start()
+
+        client = ClientStream(self._queue_size, self._overflow_policy)
+        self._clients.add(client)
+        try:
+            # Until the reader has its starting id, an entry appended after the
+            # caller's replay could fall before that id and reach no one
+            try:
+                await asyncio.wait_for(self.ready.wait(), READY_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                server_logger.warning("Broadcaster not reading %s after %ss", self._stream, READY_TIMEOUT_SEC)
+            yield client
+        finally:
+            self._clients.discard(client)
+            self._dropped_closed += client.dropped
+
+    async def replay(self, *, after: str, limit: int) -> list[tuple[str, str]]:
+        """
+        Entries appended after `after`, oldest first. Raises ReplayGap when the
+        stream was trimmed past that point or more than `limit` entries are missing.
+        """
+        first = await self._r.xrange(self._stream, count=1)
+        if first and stream_id_key(first[0][0]) > stream_id_key(after):
+            raise ReplayGap
+
+        entries = await self._r.xrange(self._stream, min=f"({after}", count=limit + 1)
+        if len(entries) > limit:
+            raise ReplayGap
+        return [(entry_id, fields["data"]) for entry_id, fields in entries]
+
+    def dispatch(self, entry_id: str, payload: str) -> None:
+        for client in self._clients:
+            client.offer(entry_id, payload)
+
+    async def _tip(self) -> str:
+        last = await self._r.xrevrange(self._stream, count=1)
+        return last[0][0] if last else "0-0"
+
+    async def _pump(self) -> None:
+        last_id = None
+        while True:
+            try:
+                if last_id is None:
+                    last_id = await self._tip()
+                    self.ready.set()
+                    server_logger.info("Broadcaster reading %s from %s", self._stream, last_id)
+
+                response = await self._r.xread({self._stream: last_id}, block=BLOCK_MS, count=100)
+                for _, entries in response:
+                    for entry_id, fields in entries:
+                        last_id = entry_id
+                        self.dispatch(entry_id, fields["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                server_logger.error("Broadcaster stream read failed: %s", e)
+                await asyncio.sleep(1)
+
+
+async def sse_events(
+    client: ClientStream,
+    *,
+    last_sent: tuple[int, int] = (0, 0),
+    heartbeat_sec: float,
+    batch_window_ms: int = 0,
+    batch_max: int = 50,
+) -> AsyncIterator[str]:
+    """
+    Encodes a client's entries as SSE frames. Sends a comment heartbeat when idle
+    and, with a batch window, coalesces everything that arrived within it into
+    one write. Entries at or before `last_sent` (already replayed) are skipped.
+    """
+    while True:
+        if not await client.wait(heartbeat_sec):
+            yield ": ping\n\n"
+            continue
+
+        if batch_window_ms and not client.resync_pending:
+            await asyncio.sleep(batch_window_ms / 1000)
+
+        frames = []
+        if client.take_resync():
+            frames.append("event: resync\ndata: {}\n\n")
+        for entry_id, payload in client.drain(batch_max if batch_window_ms else 1):
+            if stream_id_key(entry_id) <= last_sent:
+                continue
+            frames.append(f"id: {entry_id}\ndata: {payload}\n\n")
+
+        if frames:
+            yield "".join(frames)
+
+
+broadcaster = EventBroadcaster(
+    r,
+    queue_size=config.EVENT_STREAM_QUEUE_SIZE,
+    overflow_policy=config.EVENT_STREAM_OVERFLOW_POLICY,
+)
+registry.gauge("sse_clients", "Connected SSE clients", callback=lambda: broadcaster.client_count)
+registry.gauge(
+    "sse_backlog_events",
+    "Undelivered events queued for connected SSE clients, in total and for the most behind client",
+    ("stat",),
+    callback=lambda: {("total",): (stats := broadcaster.stats())["backlog"], ("max",): stats["max_lag"]},
+)
+registry.gauge(
+    "sse_max_lag_seconds",
+    "Age of the oldest undelivered event across SSE clients",
+    callback=lambda: broadcaster.stats()["max_lag_seconds"],
+)
@@ -0,0 +1,333 @@
+import time
+import json
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from redis.asyncio import Redis
+from core.config import config
+from core.redis_db import r
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+
+ITEMS_KEY = "dashboard:items"
+ACTIVE_CHATS_KEY = "dashboard:active_chats"
+# Reverse index card_id -> chat_id, written by the tele-bot alongside the card
+CARD_CHATS_KEY = "dashboard:card_chats"
+OMIT_KEY = "userbot:omit"
+COMMANDS_CHANNEL = "userbot:commands"
+
+# Timestamp-ordered secondary indexes (score = card timestamp as epoch seconds).
+# Values mirror the DashboardCard literals in tele-bot/schemas/reply.py.
+INDEX_KEY = "dashboard:items_by_ts"
+URGENCIES = ("low", "medium", "high")
+SUGGESTED_ACTIONS = ("ignore", "reply", "calendar_event")
+
+
+def urgency_index_key(urgency: str) -> str:
+    return f"{INDEX_KEY}:urgency:{urgency}"
+
+
+def action_index_key(action: str) -> str:
+    return f"{INDEX_KEY}:action:{action}"
+
+
+# Set once the backfill has run. The index key itself is no marker: the
+# tele-bot may create it first, before any pre-index card has been indexed.
+# Versioned so indexes scored from host-local times are rescored as UTC.
+INDEX_BACKFILLED_KEY = f"{INDEX_KEY}:backfilled:utc"
+# Page size used when a caller asks for every card
+FULL_LIST_PAGE_SIZE = 500
+
+def card_score(timestamp: str) -> float:
+    """
+    Index score for a card's ISO timestamp: epoch seconds in UTC. Cards from
+    before the tele-bot wrote aware timestamps are naive; they are read as
+    UTC so the score does not depend on this host's timezone.
+    """
+    created_at = datetime.fromisoformat(timestamp)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+INDEX_KEYS = [
+    INDEX_KEY,
+    *(urgency_index_key(u) for u in URGENCIES),
+    *(action_index_key(a) for a in SUGGESTED_ACTIONS),
+]
+
+# Shared tail of every lifecycle script. Removes the card, its reverse index
+# entry, its sorted-set index entries and the active_chats pointer (only if it
+# still points at this card, so a newer follow-up card for the same chat is
+# never unlinked).
+# KEYS: items, active_chats, card_chats, [extra], *INDEX_KEYS
+# ARGV[1]: card_id, ARGV[2]: fallback chat_id
+_RELEASE_LUA = """
+local function release(card_id, fallback_chat, index_from)
+    local removed = redis.call('HDEL', KEYS[1], card_id)
+    local chat = redis.call('HGET', KEYS[3], card_id) or fallback_chat
+    if chat and chat ~= '' and redis.call('HGET', KEYS[2], chat) == card_id then
+        redis.call('HDEL', KEYS[2], chat)
+    end
+    redis.call('HDEL', KEYS[3], card_id)
+    for i = index_from, #KEYS do
+        redis.call('ZREM', KEYS[i], card_id)
+    end
+    return removed
+end
+"""
+
+# ARGV[3]: commands channel, ARGV[4]: command payload
+_REPLY_LUA = _RELEASE_LUA + """
+local card = redis.call('HGET', KEYS[1], ARGV[1])
+redis.call('PUBLISH', ARGV[3], ARGV[4])
+release(ARGV[1], ARGV[2], 4)
+return card
+"""
+
+# KEYS[4]: omit set
+_MUTE_LUA = _RELEASE_LUA + """
+redis.call('SADD', KEYS[4], ARGV[2])
+return release(ARGV[1], ARGV[2], 5)
+"""
+
+_DELETE_LUA = _RELEASE_LUA + """
+return release(ARGV[1], ARGV[2], 4)
+"""
+
+# Walks one index newest-first and returns a page of raw card JSON.
+# KEYS[1]: index to walk, KEYS[2]: items, KEYS[3..]: indexes a card must also be in
+# ARGV[1]: cursor score ('' for first page), ARGV[2]: cursor card_id,
+# ARGV[3]: page size, ARGV[4]: max index entries to inspect
+# Returns {next_score|false, next_id|false, card, ...}
+_PAGE_LUA = """
+local cursor_score = ARGV[1] ~= '' and tonumber(ARGV[1]) or nil
+local max = ARGV[1] ~= '' and ARGV[1] or '+inf'
+local limit = tonumber(ARGV[3])
+local budget = tonumber(ARGV[4])
+local ids = {}
+local scanned, offset = 0, 0
+local last_score, last_id = false, false
+
+local function page(has_more)
+    local result = {false, false}
+    if has_more then
+        result = {last_score, last_id}
+    end
+    if #ids > 0 then
+        local cards = redis.call('HMGET', KEYS[2], unpack(ids))
+        for i = 1, #cards do
+            if cards[i] then
+                result[#result + 1] = cards[i]
+            end
+        end
+    end
+    return result
+end
+
+while true do
+    local rows = redis.call('ZREVRANGEBYSCORE', KEYS[1], max, '-inf', 'WITHSCORES', 'LIMIT', offset, limit)
+    for i = 1, #rows, 2 do
+        local id, score = rows[i], rows[i + 1]
+        scanned = scanned + 1
+        -- Same-score entries come in reverse lexical order; skip the ones already served
+        if not (cursor_score and tonumber(score) == cursor_score and id >= ARGV[2]) then
+            local match = true
+            for k = 3, #KEYS do
+                if not redis.call('ZSCORE', KEYS[k], id) then
+                    match = false
+                    break
+                end
+            end
+            if match then
+                ids[#ids + 1] = id
+            end
+        end
+        last_score, last_id = score, id
+        if #ids == limit or scanned >= budget then
+            return page(true)
+        end
+    end
+    if #rows < limit * 2 then
+        return page(false)
+    end
+    offset = offset + limit
+end
+"""
+
+
+@dataclass
+class OperationLatency:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def snapshot(self) -> dict:
+        avg_ms = self.total_ms / self.count if self.count else 0.0
+        return {"count": self.count, "avg_ms": round(avg_ms, 3), "max_ms": round(self.max_ms, 3)}
+
+
+class CardStore:
+    """
+    Dashboard card lifecycle on top of Redis. Every transition is a single
+    server-side script call, so it costs one round trip and cannot interleave
+    with another transition on the same card.
+    """
+
+    def __init__(self, redis_client: Redis):
+        self._reply = redis_client.register_script(_REPLY_LUA)
+        self._mute = redis_client.register_script(_MUTE_LUA)
+        self._delete = redis_client.register_script(_DELETE_LUA)
+        self._page = redis_client.register_script(_PAGE_LUA)
+        self._r = redis_client
+        self.latency: dict[str, OperationLatency] = {
+            "reply": OperationLatency(),
+            "mute": OperationLatency(),
+            "delete": OperationLatency(),
+            "page": OperationLatency(),
+        }
+
+    async def _run(self, op: str, script, keys: list[str], args: list):
+        start = time.perf_counter()
+        try:
+            return await script(keys=keys, args=args)
+        finally:
+            # Per-command Redis timings go to /metrics from the client itself
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.latency[op].observe(elapsed_ms)
+            server_logger.debug("card_store.%s took %.2fms", op, elapsed_ms)
+
+    async def consume_for_reply(self, *, card_id: str, chat_id: int, command: str) -> str | None:
+        """
+        Publishes the reply command and removes the card. Returns the raw card
+        JSON if the card still existed.
+        """
+        return await self._run(
+            "reply",
+            self._reply,
+            keys=[ITEMS_KEY, ACTIVE_CHATS_KEY, CARD_CHATS_KEY, *INDEX_KEYS],
+            args=[card_id, str(chat_id), COMMANDS_CHANNEL, command],
+        )
+
+    async def mute(self, *, card_id: str, chat_id: int) -> bool:
+        removed = await self._run(
+            "mute",
+            self._mute,
+            keys=[ITEMS_KEY, ACTIVE_CHATS_KEY, CARD_CHATS_KEY, OMIT_KEY, *INDEX_KEYS],
+            args=[card_id, str(chat_id)],
+        )
+        return removed > 0
+
+    async def delete(self, *, card_id: str) -> bool:
+        removed = await self._run(
+            "delete",
+            self._delete,
+            keys=[ITEMS_KEY, ACTIVE_CHATS_KEY, CARD_CHATS_KEY, *INDEX_KEYS],
+            args=[card_id, ""],
+        )
+        return removed > 0
+
+    async def page(
+        self,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        urgency: str | None = None,
+        suggested_action: str | None = None,
+    ) -> tuple[list[str], str | None]:
+        """
+        Returns up to `limit` raw card JSON strings, newest first, and the cursor
+        for the next page. Cards are never decoded here.
+        """
+        filters = []
+        if urgency:
+            filters.append(urgency_index_key(urgency))
+        if suggested_action:
+            filters.append(action_index_key(suggested_action))
+        walk_key = filters[0] if filters else INDEX_KEY
+
+        cursor_score, cursor_id = decode_cursor(cursor)
+        result = await self._run(
+            "page",
+            self._page,
+            keys=[walk_key, ITEMS_KEY, *filters[1:]],
+            args=[cursor_score, cursor_id, limit, limit * 20],
+        )
+        next_score, next_id, *cards = result
+        next_cursor = f"{next_score}:{next_id}" if next_score else None
+        return cards, next_cursor
+
+    async def all(
+        self,
+        *,
+        urgency: str | None = None,
+        suggested_action: str | None = None,
+    ) -> list[str]:
+        """Every matching card's raw JSON, newest first, walked page by page"""
+        cards = []
+        cursor = None
+        while True:
+            page, cursor = await self.page(
+                limit=FULL_LIST_PAGE_SIZE,
+                cursor=cursor,
+                urgency=urgency,
+                suggested_action=suggested_action,
+            )
+            cards.extend(page)
+            if cursor is None:
+                return cards
+
+    async def ensure_index(self) -> int:
+        """
+        Backfills the sorted-set indexes for cards written before they existed.
+        Runs until INDEX_BACKFILLED_KEY is set; re-running is harmless, as
+        ZADD and HSETNX of the same values are idempotent.
+        """
+        if await self._r.exists(INDEX_BACKFILLED_KEY):
+            return 0
+
+        count = 0
+        async with self._r.pipeline(transaction=False) as pipe:
+            async for card_id, raw_json in self._r.hscan_iter(ITEMS_KEY):
+                card = json.loads(raw_json)
+                score = card_score(card["timestamp"])
+                pipe.zadd(INDEX_KEY, {card_id: score})
+                if card.get("urgency") in URGENCIES:
+                    pipe.zadd(urgency_index_key(card["urgency"]), {card_id: score})
+                if card.get("suggested_action") in SUGGESTED_ACTIONS:
+                    pipe.zadd(action_index_key(card["suggested_action"]), {card_id: score})
+                if card.get("chat_id") is not None:
+                    pipe.hsetnx(CARD_CHATS_KEY, card_id, str(card["chat_id"]))
+                count += 1
+            pipe.set(INDEX_BACKFILLED_KEY, "1")
+            await pipe.execute()
+
+        server_logger.info("Backfilled dashboard index with %s cards", count)
+        return count
+
+    def latency_snapshot(self) -> dict[str, dict]:
+        return {op: stats.snapshot() for op, stats in self.latency.items()}
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, str]:
+    if not cursor:
+        return "", ""
+    score, sep, card_id = cursor.partition(":")
+    try:
+        value = float(score)
+    except ValueError:
+        raise ValueError("malformed cursor")
+    if not math.isfinite(value) or not sep or not card_id:
+        raise ValueError("malformed cursor")
+    return score, card_id
+
+
+card_store = CardStore(r)
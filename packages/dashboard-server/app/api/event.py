@@ -1,14 +1,15 @@
 import os, json, asyncio
 import logging
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi import BackgroundTasks
 from app.utils.log_handlers import session_logger_with_task
 from core.config import config
-from core.redis_db import r
 from core.context import get_request_id
+from .broadcaster import ReplayGap, broadcaster, is_stream_id, sse_events, stream_id_key
+from .card_store import card_store
 from .logger import log_training_data
 
 event_router = APIRouter(prefix="/event", tags=["Event"])
@@ -39,48 +40,62 @@ async def send_reply(req: ReplyRequest, background_tasks: BackgroundTasks):
             "text": req.text,
         }
 
-        raw_json = await r.hget("dashboard:items", req.card_id)
-        
+        raw_json = await card_store.consume_for_reply(
+            card_id=req.card_id,
+            chat_id=req.chat_id,
+            command=json.dumps(command),
+        )
+
         if raw_json:
             card_data = json.loads(raw_json)
-            
+
             history_context = card_data.get("conversation_history", "")
-            
+
             log_training_data(
                 history=history_context, 
                 chosen_reply=req.text,
                 metadata=req.meta.model_dump()
             )
-        
-        await r.publish("userbot:commands", json.dumps(command))
-        
-        await r.hdel("dashboard:items", req.card_id)
 
-        await r.hdel("dashboard:active_chats", req.chat_id)
-        
         return {"status": "sent", "text": req.text}
 
 @event_router.post("/mute")
 async def mute_chat_id(req: MuteRequest, background_tasks: BackgroundTasks):
     with session_logger_with_task(background_tasks) as logger:
-        await r.sadd("userbot:omit", req.chat_id)
+        await card_store.mute(card_id=req.card_id, chat_id=req.chat_id)
 
-        await r.hdel("dashboard:items", req.card_id)
-
-        await r.hdel("dashboard:active_chats", req.chat_id)
-        
         return {"status": "success"}
 
 @event_router.get("/notifications")
-async def get_notifications(background_tasks: BackgroundTasks):
+async def get_notifications(
+    background_tasks: BackgroundTasks,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit with cursor for every card"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    urgency: Optional[Literal["low", "medium", "high"]] = Query(None),
+    suggested_action: Optional[Literal["ignore", "reply", "calendar_event"]] = Query(None),
+):
     with session_logger_with_task(background_tasks) as logger:
-        all_items = await r.hgetall("dashboard:items")
-        
-        parsed_list = [json.loads(val) for val in all_items.values()]
-        
-        parsed_list.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        return parsed_list
+        next_cursor = None
+        try:
+            if limit is None and cursor is None:
+                cards = await card_store.all(urgency=urgency, suggested_action=suggested_action)
+            else:
+                cards, next_cursor = await card_store.page(
+                    limit=limit or 100,
+                    cursor=cursor,
+                    urgency=urgency,
+                    suggested_action=suggested_action,
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Cards are already JSON; splice them into an array instead of re-encoding
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return Response(
+            content=f"[{','.join(cards)}]",
+            media_type="application/json",
+            headers=headers,
+        )
 
 
 @event_router.get("/stream")
@@ -89,24 +104,43 @@ async def stream_events(request: Request):
     req_id = get_request_id()
     server_logger.info("Stream Connected for user %s", request.client.host)
 
+    last_event_id = request.headers.get("last-event-id")
+    if not is_stream_id(last_event_id):
+        last_event_id = None
+
     async def event_generator():
-        # Create a PubSub listener
-        pubsub = r.pubsub()
-        await pubsub.subscribe("dashboard:events")
-        
-        try:
-            async for message in pubsub.listen():
-                # 'listen' gives us subscription messages too, ignore them
-                if message["type"] == "message":
-                    payload = message["data"]
-                    yield f"data: {payload}\n\n"
-                    print('Sent stream')
-        except asyncio.CancelledError:
-            server_logger.info("Stream Disconnected for ID: %s", req_id)
-            await pubsub.unsubscribe("dashboard:events")
-        except Exception as e:
-            server_logger.error("Stream Error for ID %s: %s", req_id, e)
-            raise
+        # Subscribe before replaying so nothing lands between the two; live
+        # entries already covered by the replay are skipped by id.
+        async with broadcaster.listen() as client:
+            server_logger.info("Stream clients connected: %s", broadcaster.client_count)
+            try:
+                last_sent = (0, 0)
+                if last_event_id:
+                    try:
+                        missed = await broadcaster.replay(
+                            after=last_event_id,
+                            limit=config.EVENT_STREAM_REPLAY_LIMIT,
+                        )
+                    except ReplayGap:
+                        yield "event: resync\ndata: {}\n\n"
+                    else:
+                        if missed:
+                            last_sent = stream_id_key(missed[-1][0])
+                            yield "".join(f"id: {entry_id}\ndata: {payload}\n\n" for entry_id, payload in missed)
+
+                async for frame in sse_events(
+                    client,
+                    last_sent=last_sent,
+                    heartbeat_sec=config.EVENT_STREAM_HEARTBEAT_SEC,
+                    batch_window_ms=config.EVENT_STREAM_BATCH_WINDOW_MS,
+                    batch_max=config.EVENT_STREAM_BATCH_MAX,
+                ):
+                    yield frame
+            except asyncio.CancelledError:
+                server_logger.info("Stream Disconnected for ID: %s", req_id)
+            except Exception as e:
+                server_logger.error("Stream Error for ID %s: %s", req_id, e)
+                raise
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -114,16 +148,6 @@ async def stream_events(request: Request):
 async def delete_notification(card_id: str, background_tasks: BackgroundTasks):
 
     with session_logger_with_task(background_tasks) as logger:
-        raw_json = await r.hget("dashboard:items", card_id)
-        
-        if raw_json:
-            data = json.loads(raw_json)
-            chat_id = data.get('chat_id')
-            
-            if chat_id:
-                await r.hdel("dashboard:active_chats", str(chat_id))
-
-        deleted_count = await r.hdel("dashboard:items", card_id)
-
-        return {"deleted": deleted_count > 0}
+        deleted = await card_store.delete(card_id=card_id)
 
+        return {"deleted": deleted}
@@ -1,12 +1,260 @@
 import os
+import json
+import time
+import asyncio
+import logging
+import threading
 from typing import List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 from core.config import config
+from core.helpers.metrics import registry
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+MONGO_LATENCY = registry.histogram("mongo_insert_duration_seconds", "Training log insert_many latency")
+
+# Per-document write error codes worth retrying: the server was stepping down,
+# shutting down or timed out, not objecting to the document itself
+RETRYABLE_WRITE_CODES = frozenset({
+    6, 7, 89, 91, 112, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436,
+})
+
+
+class TrainingLogWriter:
+    """
+    Buffers training log entries in memory and writes them to Mongo with
+    insert_many on a dedicated thread, so request handlers never wait on Mongo.
+    Entries that do not fit in the queue, or that Mongo fails to take, are
+    spilled to a JSONL file and re-sent once Mongo accepts writes again.
+    Entries Mongo rejects for good (validation, duplicate key, ...) go to a
+    dead-letter file instead, so the spill file does not grow with entries
+    that can never be written.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        spill_path: str,
+    ):
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_queue = max_queue
+        self._spill_path = spill_path
+        self._queue: asyncio.Queue | None = None
+        self._batch: list[dict] = []
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-writer")
+        # Overflow from log() is written by its own thread, never on the event loop
+        self._spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-spill")
+        self._overflow: list[dict] = []
+        self._overflow_pending = False
+        self._overflow_lock = threading.Lock()
+        # Held for every append to the spill and dead-letter files and for replay claiming the spill
+        self._spill_lock = threading.Lock()
+        self._client: MongoClient | None = None
+        self.written = 0
+        self.spilled = 0
+        self.dead_lettered = 0
+
+    def _collection(self):
+        if self._client is None:
+            self._client = MongoClient(config.MONGODB_URL)
+        return self._client[config.MONGODB_AGENT][config.MONGODB_LOGS]
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Entries already taken off the queue by the cancelled flush loop
+        batch, self._batch = self._batch, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._write(batch)
+        await asyncio.get_running_loop().run_in_executor(self._spill_executor, self._spill_overflow)
+
+    def log(self, entry: dict) -> None:
+        # Normally started by the app lifespan; covers apps run without it
+        self.start()
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            with self._overflow_lock:
+                self._overflow.append(entry)
+                if self._overflow_pending:
+                    return
+                self._overflow_pending = True
+            self._spill_executor.submit(self._spill_overflow)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self._flush_interval
+            while len(self._batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shielded so stop() cannot abandon a batch halfway through a write
+            await asyncio.shield(self._write(batch))
+
+    async def _write(self, batch: list[dict]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            failed = await loop.run_in_executor(self._executor, self._insert, batch)
+        except Exception as e:
+            server_logger.error("Training log insert failed, spilling %s entries: %s", len(batch), e)
+            await loop.run_in_executor(self._executor, self._spill, batch)
+            return
+
+        if failed:
+            server_logger.error("Training log insert failed for %s of %s entries, spilling them", len(failed), len(batch))
+            await loop.run_in_executor(self._executor, self._spill, failed)
+        elif os.path.exists(self._spill_path) or os.path.exists(self._replay_path):
+            await loop.run_in_executor(self._executor, self._replay_spill)
+
+    def _insert(self, batch: list[dict]) -> list[dict]:
+        """
+        Inserts `batch` and returns the entries worth retrying. Entries Mongo
+        rejected for good are dead-lettered here.
+        """
+        start = time.perf_counter()
+        errors = []
+        try:
+            self._collection().insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything but the reported documents was inserted
+            errors = e.details["writeErrors"]
+        finally:
+            MONGO_LATENCY.observe(time.perf_counter() - start)
+        self.written += len(batch) - len(errors)
+        server_logger.debug(
+            "Inserted %s training logs in %.2fms", len(batch) - len(errors), (time.perf_counter() - start) * 1000
+        )
+
+        failed = [batch[error["index"]] for error in errors if error.get("code") in RETRYABLE_WRITE_CODES]
+        rejected = [error for error in errors if error.get("code") not in RETRYABLE_WRITE_CODES]
+        if rejected:
+            server_logger.error(
+                "Training log insert rejected %s entries for good (%s), dead-lettering them",
+                len(rejected), rejected[0].get("errmsg"),
+            )
+            self._dead_letter([(batch[error["index"]], error) for error in rejected])
+        return failed
+
+    @property
+    def _dead_letter_path(self) -> str:
+        return f"{self._spill_path}.dead"
+
+    def _dead_letter(self, rejected: list[tuple[dict, dict]]) -> None:
+        """Keeps entries Mongo will never accept, with the reason, for inspection"""
+        try:
+            os.makedirs(os.path.dirname(self._spill_path) or ".", exist_ok=True)
+            with self._spill_lock, open(self._dead_letter_path, "a", encoding="utf-8") as f:
+                for entry, error in rejected:
+                    entry = {**entry, "timestamp": entry["timestamp"].isoformat()}
+                    entry.pop("_id", None)
+                    error = {"code": error.get("code"), "errmsg": error.get("errmsg")}
+                    f.write(json.dumps({"entry": entry, "error": error}) + "\n")
+        except OSError as e:
+            server_logger.error("Training log dead-letter failed, dropping %s entries: %s", len(rejected), e)
+        self.dead_lettered += len(rejected)
+
+    def _spill(self, entries: list[dict], *, count: bool = True) -> None:
+        """Appends entries to the spill file; `count` is False for entries counted when first spilled"""
+        os.makedirs(os.path.dirname(self._spill_path) or ".", exist_ok=True)
+        with self._spill_lock, open(self._spill_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                entry = {**entry, "timestamp": entry["timestamp"].isoformat()}
+                entry.pop("_id", None)
+                f.write(json.dumps(entry) + "\n")
+        if count:
+            self.spilled += len(entries)
+
+    def _spill_overflow(self) -> None:
+        while True:
+            with self._overflow_lock:
+                entries, self._overflow = self._overflow, []
+                if not entries:
+                    self._overflow_pending = False
+                    return
+            try:
+                self._spill(entries)
+            except OSError as e:
+                server_logger.error("Training log spill failed, dropping %s entries: %s", len(entries), e)
+
+    @property
+    def _replay_path(self) -> str:
+        return f"{self._spill_path}.replay"
+
+    def _replay_spill(self) -> None:
+        # Claim the file first so entries spilled meanwhile land in a fresh one.
+        # A claimed file left by an interrupted replay is finished first.
+        with self._spill_lock:
+            if not os.path.exists(self._replay_path):
+                if not os.path.exists(self._spill_path):
+                    return
+                os.replace(self._spill_path, self._replay_path)
+        with open(self._replay_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        for entry in entries:
+            entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+
+        for i in range(0, len(entries), self._batch_size):
+            try:
+                failed = self._insert(entries[i:i + self._batch_size])
+            except Exception as e:
+                server_logger.error("Training log spill replay failed: %s", e)
+                self._spill(entries[i:], count=False)
+                break
+            if failed:
+                self._spill(failed, count=False)
+        os.remove(self._replay_path)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "written": self.written,
+            "spilled": self.spilled,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+training_log_writer = TrainingLogWriter(
+    batch_size=config.MONGODB_BATCH_SIZE,
+    flush_interval=config.MONGODB_FLUSH_INTERVAL_SEC,
+    max_queue=config.MONGODB_QUEUE_SIZE,
+    spill_path=config.MONGODB_SPILL_PATH,
+)
+registry.gauge(
+    "training_log_writer",
+    "Training log writer queue depth and written/spilled/dead-lettered totals",
+    ("stat",),
+    callback=lambda: {(k,): v for k, v in training_log_writer.stats().items()},
+)
 
-client = MongoClient(config.MONGODB_URL)
-db = client[config.MONGODB_AGENT]
-collection = db[config.MONGODB_LOGS]
 
 def log_training_data(history: List[str], chosen_reply: List[str], metadata):
     entry = {
@@ -15,5 +263,5 @@ def log_training_data(history: List[str], chosen_reply: List[str], metadata):
         "chosen_reply": chosen_reply,
         "metadata": metadata,
     }
-    
-    collection.insert_one(entry)
\ No newline at end of file
+
+    training_log_writer.log(entry)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from core.fastapi.dependencies.permission import IsAdmin, PermissionDependency
+from core.helpers.metrics import registry
+
+metrics_router = APIRouter(include_in_schema=False)
+
+
+@metrics_router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(PermissionDependency([IsAdmin]))],
+)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
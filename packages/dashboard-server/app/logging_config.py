@@ -1,8 +1,11 @@
 import logging
 import logging.config
+import logging.handlers
+import queue
 import re
 from core.config import config
 from core.context import get_request_id
+from core.helpers.metrics import registry
 
 class RequestIDFilter(logging.Filter):
     def filter(self, record):
@@ -42,6 +45,83 @@ class SensitiveDataFilter(logging.Filter):
             message = re.sub(self.TOKEN_PATTERN, replace, message)
         return message
 
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking front half of the central logger: the request path only puts
+    the record on a bounded queue, and counts it as dropped when the queue is full.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Formatting and masking are left to the listener's handlers
+        return record
+
+
+_queue_handler: DroppingQueueHandler | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+def start_log_listener() -> None:
+    """
+    Moves the central logger's handlers behind a DroppingQueueHandler, served by
+    a QueueListener thread. Call after dictConfig(LOGGING_CONFIG).
+    """
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+
+    logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+    handlers = logger.handlers[:]
+    _queue_handler = DroppingQueueHandler(config.LOG_QUEUE_SIZE)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_log_listener() -> None:
+    """Flushes queued records and hands the handlers back to the logger"""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+
+    logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+    logger.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        logger.addHandler(handler)
+    _queue_handler, _listener = None, None
+
+
+def log_queue_stats() -> dict:
+    if _queue_handler is None:
+        return {"queued": 0, "capacity": config.LOG_QUEUE_SIZE, "dropped": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+registry.gauge(
+    "log_queue",
+    "Central logger queue depth, capacity and dropped records",
+    ("stat",),
+    callback=lambda: {(k,): v for k, v in log_queue_stats().items()},
+)
+
+
 active_handlers = ["console"]
 # Replace 'ENVIRONMENT' with whatever attribute your config uses (e.g., 'ENV')
 if config.ENV.lower() in ["dev", "development"]:
@@ -71,7 +151,7 @@ LOGGING_CONFIG = {
             "formatter": "default",
             "level": "DEBUG",
             "stream": "ext://sys.stdout",
-            "filters": ["request_id","sensitive_data_filter"],
+            "filters": ["sensitive_data_filter"],
         },
         "file": {
             "formatter": "standard",
@@ -80,12 +160,15 @@ LOGGING_CONFIG = {
             "maxBytes": 10 * 1024 * 1024,
             "backupCount": 5,            
             "level": "INFO",
-            "filters": ["request_id", "sensitive_data_filter"],
+            "filters": ["sensitive_data_filter"],
         },
     },
     "loggers": {
         config.CENTRAL_LOGGER_NAME: {
             "handlers": active_handlers,
+            # Logger-level so the request_id is captured on the request path,
+            # not on the queue listener thread
+            "filters": ["request_id"],
             "level": "DEBUG",
             "propagate": False,
         }
@@ -18,10 +18,19 @@ from core.fastapi.middlewares import (
     RequestIDMiddleware,
     AccessLogMiddleware
 )
-# from core.helpers.cache import Cache, CustomKeyMaker
+from core.helpers.cache import Cache, CustomKeyMaker, RedisBackend, TieredBackend
 from app.api.event import event_router
+from app.api.card_store import card_store
+from app.api.broadcaster import broadcaster
+from app.api.logger import training_log_writer
+from app.utils.log_shipper import session_log_shipper
 from app.api.calendar import calendar_router
-from app.logging_config import LOGGING_CONFIG
+from app.api.metrics import metrics_router
+from core.helpers.password import password_hasher
+from core.helpers.permission_cache import permission_cache
+from app.user.adapter.output.persistence.sqlalchemy.user import user_cache
+from core.db.session import replicas, warm_up_pools
+from app.logging_config import LOGGING_CONFIG, start_log_listener, stop_log_listener
 
 import sentry_sdk
 from sentry_sdk.integrations.logging import LoggingIntegration
@@ -34,6 +43,7 @@ def init_routers(app_: FastAPI) -> None:
     app_.include_router(auth_router)
     app_.include_router(event_router)
     app_.include_router(calendar_router)
+    app_.include_router(metrics_router)
 
 
 def init_listeners(app_: FastAPI) -> None:
@@ -67,6 +77,7 @@ def make_middleware() -> list[Middleware]:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["X-Next-Cursor"],
         ),
         Middleware(RequestIDMiddleware),
         Middleware(AccessLogMiddleware),
@@ -80,8 +91,15 @@ def make_middleware() -> list[Middleware]:
     return middleware
 
 
-# def init_cache() -> None:
-#     Cache.init(backend=RedisBackend(), key_maker=CustomKeyMaker())
+def init_cache() -> None:
+    Cache.init(
+        backend=TieredBackend(
+            l2=RedisBackend(),
+            maxsize=config.CACHE_L1_SIZE,
+            l1_ttl=config.CACHE_L1_TTL_SEC,
+        ),
+        key_maker=CustomKeyMaker(),
+    )
 
 
 def create_app() -> FastAPI:
@@ -91,6 +109,7 @@ def create_app() -> FastAPI:
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir, exist_ok=True)
     logging.config.dictConfig(LOGGING_CONFIG)
+    start_log_listener()
 
     # Init Sentry
     sentry_logging = LoggingIntegration(
@@ -114,13 +133,36 @@ def create_app() -> FastAPI:
     )
     init_routers(app_=app_)
     init_listeners(app_=app_)
-    # init_cache()
+    init_cache()
 
     @app_.on_event("startup")
     async def startup_msg():
         logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+        try:
+            await card_store.ensure_index()
+        except Exception as e:
+            logger.warning("Dashboard index backfill skipped: %s", e)
+        await warm_up_pools()
+        await replicas.start(config.READER_HEALTH_CHECK_SEC)
+        await broadcaster.start()
+        training_log_writer.start()
+        session_log_shipper.start()
+        await permission_cache.start()
+        await user_cache.start()
+        password_hasher.start()
         logger.info("Application startup complete")
 
+    @app_.on_event("shutdown")
+    async def shutdown_background_workers():
+        await broadcaster.stop()
+        await replicas.stop()
+        await permission_cache.stop()
+        await user_cache.stop()
+        password_hasher.stop()
+        await training_log_writer.stop()
+        await session_log_shipper.stop()
+        stop_log_listener()
+
     return app_
 
 
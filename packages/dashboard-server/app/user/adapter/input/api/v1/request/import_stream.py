@@ -0,0 +1,101 @@
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator
+
+from core.config import config
+
+CSV_CONTENT_TYPES = ("text/csv",)
+JSONL_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _decode(line: bytes, max_bytes: int) -> str | ValueError:
+    if len(line) > max_bytes:
+        return ValueError(f"line longer than {max_bytes} bytes")
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError as e:
+        return ValueError(f"invalid UTF-8 at byte {e.start}")
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_bytes: int | None = None,
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """
+    (line number, line) pairs from a byte stream, without buffering the body.
+    A line that is not valid UTF-8 or longer than `max_bytes` comes back as a
+    ValueError, so it is reported as that line's error and the rest of the
+    stream still imports. An overlong line is discarded as it arrives rather
+    than buffered.
+    """
+    max_bytes = max_bytes or config.USER_IMPORT_MAX_LINE_BYTES
+    buffer = b""
+    number = 0
+    overlong = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            if overlong:
+                overlong = False
+                yield number, ValueError(f"line longer than {max_bytes} bytes")
+            else:
+                yield number, _decode(line, max_bytes)
+        if len(buffer) > max_bytes:
+            overlong = True
+            buffer = b""
+    if overlong:
+        yield number + 1, ValueError(f"line longer than {max_bytes} bytes")
+    elif buffer:
+        yield number + 1, _decode(buffer, max_bytes)
+
+
+async def iter_jsonl_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict | ValueError]]:
+    async for number, line in iter_lines(chunks):
+        if isinstance(line, ValueError):
+            yield number, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"invalid JSON: {e}")
+            continue
+        yield number, row if isinstance(row, dict) else ValueError("expected a JSON object")
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict | ValueError]]:
+    """One record per line: quoted fields may not contain newlines"""
+    header = None
+    async for number, line in iter_lines(chunks):
+        if isinstance(line, ValueError):
+            yield number, line
+            if header is None:
+                # Without a header no later line can be mapped to fields
+                return
+            continue
+        if not line.strip():
+            continue
+        fields = next(csv.reader([line]))
+        if header is None:
+            header = [field.strip() for field in fields]
+            continue
+        if len(fields) != len(header):
+            yield number, ValueError(f"expected {len(header)} fields, got {len(fields)}")
+            continue
+        yield number, dict(zip(header, fields))
+
+
+def iter_rows(
+    chunks: AsyncIterable[bytes],
+    content_type: str,
+) -> AsyncIterator[tuple[int, dict | ValueError]] | None:
+    """Row parser for the body's content type, or None if it is not supported"""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return iter_csv_rows(chunks)
+    if media_type in JSONL_CONTENT_TYPES:
+        return iter_jsonl_rows(chunks)
+    return None
@@ -8,8 +8,10 @@ from fastapi.responses import StreamingResponse
 import redis.asyncio as redis
 from app.container import Container
 from app.user.adapter.input.api.v1.request import CreateUserRequest, LoginRequest
+from app.user.adapter.input.api.v1.request.import_stream import iter_rows
 from app.user.adapter.input.api.v1.response import LoginResponse
-from app.user.application.dto import CreateUserResponseDTO, GetUserListResponseDTO
+from app.user.application.dto import CreateUserResponseDTO, GetUserListResponseDTO, ImportUsersResponseDTO
+from app.user.application.exception import UnsupportedImportFormatException
 from app.user.domain.command import CreateUserCommand
 from app.user.domain.usecase.user import UserUseCase
 from core.fastapi.dependencies import IsAdmin, PermissionDependency
@@ -57,3 +59,23 @@ user_router = APIRouter()
 # ):
 #     token = await usecase.login(email=request.email, password=request.password)
 #     return {"token": token.token, "refresh_token": token.refresh_token}
+
+
+@user_router.post(
+    "/import",
+    response_model=ImportUsersResponseDTO,
+    dependencies=[Depends(PermissionDependency([IsAdmin]))],
+)
+@inject
+async def import_users(
+    request: Request,
+    usecase: UserUseCase = Depends(Provide[Container.user_service]),
+):
+    """
+    Streams a text/csv (header: email,password,nickname,lat,lng) or
+    application/x-ndjson body into users; returns the rejected lines.
+    """
+    rows = iter_rows(request.stream(), request.headers.get("content-type", ""))
+    if rows is None:
+        raise UnsupportedImportFormatException
+    return await usecase.import_users(rows=rows)
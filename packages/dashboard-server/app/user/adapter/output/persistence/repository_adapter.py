@@ -1,4 +1,4 @@
-from app.user.domain.entity.user import User, UserRead
+from app.user.domain.entity.user import NearbyUser, User, UserRead, UserSnapshot
 from app.user.domain.repository.user import UserRepo
 
 
@@ -20,25 +20,47 @@ class UserRepositoryAdapter:
         *,
         email: str,
         nickname: str,
-    ) -> User | None:
+    ) -> UserSnapshot | None:
         return await self.user_repo.get_user_by_email_or_nickname(
             email=email,
             nickname=nickname,
         )
 
-    async def get_user_by_id(self, *, user_id: int) -> User | None:
+    async def get_user_by_id(self, *, user_id: int) -> UserSnapshot | None:
         return await self.user_repo.get_user_by_id(user_id=user_id)
 
-    async def get_user_by_email_and_password(
+    async def get_users_by_ids(self, *, user_ids: list[int]) -> list[User]:
+        return await self.user_repo.get_users_by_ids(user_ids=user_ids)
+
+    async def get_user_by_email(self, *, email: str) -> UserSnapshot | None:
+        return await self.user_repo.get_user_by_email(email=email)
+
+    async def update_password(self, *, user_id: int, password: str) -> None:
+        await self.user_repo.update_password(user_id=user_id, password=password)
+
+    async def get_users_near(
         self,
         *,
-        email: str,
-        password: str,
-    ) -> User | None:
-        return await self.user_repo.get_user_by_email_and_password(
-            email=email,
-            password=password,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 50,
+    ) -> list[NearbyUser]:
+        return await self.user_repo.get_users_near(lat=lat, lng=lng, radius_m=radius_m, limit=limit)
+
+    async def get_taken_emails_and_nicknames(
+        self,
+        *,
+        emails: list[str],
+        nicknames: list[str],
+    ) -> tuple[set[str], set[str]]:
+        return await self.user_repo.get_taken_emails_and_nicknames(
+            emails=emails,
+            nicknames=nicknames,
         )
 
+    async def bulk_create(self, *, users: list[dict]) -> None:
+        await self.user_repo.bulk_create(users=users)
+
     async def save(self, *, user: User) -> None:
         await self.user_repo.save(user=user)
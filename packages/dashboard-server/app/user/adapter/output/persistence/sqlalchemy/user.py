@@ -1,28 +1,76 @@
-from sqlalchemy import and_, or_, select
+from sqlalchemy import lambda_stmt, or_, select, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from app.user.domain.entity.user import User
+from app.user.domain.entity.user import NearbyUser, User, UserSnapshot
 from app.user.domain.repository.user import UserRepo
-from core.db.session import session, session_factory
+from core.config import config
+from core.db.session import read_session, session
+from core.helpers import geohash
+from core.helpers.identity_cache import IdentityCache, track_entity_changes
+from core.helpers.permission_cache import track_permission_changes
+from core.repository.base import BaseRepo
+from core.redis_db import r
+
+user_cache = IdentityCache(
+    r,
+    name="user",
+    maxsize=config.USER_CACHE_SIZE,
+    ttl=config.USER_CACHE_TTL_SEC,
+    indexes=("email", "nickname"),
+    quarantine_sec=config.READER_MAX_LAG_SEC,
+)
+
+track_permission_changes(User.is_admin)
+track_entity_changes(User, user_cache)
+
+
+# Hot lookups as lambda statements: SQLAlchemy builds and cache-keys each one
+# once per code location, and later calls only extract the bound values.
+
+def _user_by_id(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def _user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
+def _user_by_email_or_nickname(email: str, nickname: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(or_(User.email == email, User.nickname == nickname)))
+
+
+def _users_page(limit: int, prev: int | None) -> StatementLambdaElement:
+    stmt = lambda_stmt(lambda: select(User))
+    if prev:
+        stmt += lambda s: s.where(User.id < prev)
+    stmt += lambda s: s.limit(limit)
+    return stmt
 
 
 class UserSQLAlchemyRepo(UserRepo):
+    def __init__(self, cache: IdentityCache | None = user_cache):
+        self.cache = cache
+        self._base = BaseRepo(User)
+
+    def _remember(self, user: User | None) -> UserSnapshot | None:
+        if user is None:
+            return None
+        snapshot = UserSnapshot.from_user(user)
+        if self.cache is not None:
+            self.cache.put(snapshot)
+        return snapshot
+
     async def get_users(
         self,
         *,
         limit: int = 12,
         prev: int | None = None,
     ) -> list[User]:
-        query = select(User)
-
-        if prev:
-            query = query.where(User.id < prev)
-
         if limit > 12:
             limit = 12
 
-        query = query.limit(limit)
-        async with session_factory() as read_session:
-            result = await read_session.execute(query)
+        async with read_session() as db:
+            result = await db.execute(_users_page(limit, prev))
 
         return result.scalars().all()
 
@@ -31,29 +79,95 @@ class UserSQLAlchemyRepo(UserRepo):
         *,
         email: str,
         nickname: str,
-    ) -> User | None:
-        async with session_factory() as read_session:
-            stmt = await read_session.execute(
-                select(User).where(or_(User.email == email, User.nickname == nickname)),
-            )
-            return stmt.scalars().first()
+    ) -> UserSnapshot | None:
+        if self.cache is not None:
+            cached = self.cache.get_by("email", email) or self.cache.get_by("nickname", nickname)
+            if cached is not None:
+                return cached
+
+        async with read_session() as db:
+            stmt = await db.execute(_user_by_email_or_nickname(email, nickname))
+            return self._remember(stmt.scalars().first())
+
+    async def get_user_by_id(self, *, user_id: int) -> UserSnapshot | None:
+        if self.cache is not None:
+            cached = self.cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        async with read_session() as db:
+            stmt = await db.execute(_user_by_id(user_id))
+            return self._remember(stmt.scalars().first())
+
+    async def get_users_by_ids(self, *, user_ids: list[int]) -> list[User]:
+        if not user_ids:
+            return []
+        async with read_session() as db:
+            result = await db.execute(select(User).where(User.id.in_(set(user_ids))))
+            return result.scalars().all()
+
+    async def get_user_by_email(self, *, email: str) -> UserSnapshot | None:
+        if self.cache is not None:
+            cached = self.cache.get_by("email", email)
+            if cached is not None:
+                return cached
+
+        async with read_session() as db:
+            stmt = await db.execute(_user_by_email(email))
+            return self._remember(stmt.scalars().first())
 
-    async def get_user_by_id(self, *, user_id: int) -> User | None:
-        async with session_factory() as read_session:
-            stmt = await read_session.execute(select(User).where(User.id == user_id))
-            return stmt.scalars().first()
+    async def update_password(self, *, user_id: int, password: str) -> None:
+        await session.execute(update(User).where(User.id == user_id).values(password=password))
+        if self.cache is not None:
+            self.cache.invalidate_after_commit(session.info, {user_id})
 
-    async def get_user_by_email_and_password(
+    async def get_users_near(
         self,
         *,
-        email: str,
-        password: str,
-    ) -> User | None:
-        async with session_factory() as read_session:
-            stmt = await read_session.execute(
-                select(User).where(and_(User.email == email, password == password))
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 50,
+    ) -> list[NearbyUser]:
+        """
+        Prefilters on the indexed geohash column (one prefix range per covering
+        cell), then keeps candidates whose great-circle distance is within
+        `radius_m`, nearest first. Only the columns needed are loaded.
+        """
+        query = select(User.id, User.nickname, User.lat, User.lng).where(User.lat.is_not(None))
+        cells = geohash.covering_cells(lat, lng, radius_m)
+        if cells:
+            query = query.where(or_(*(User.geohash.like(f"{cell}%") for cell in cells)))
+
+        async with read_session() as db:
+            rows = (await db.execute(query)).all()
+
+        distance = geohash.haversine_m
+        hits = [
+            (d, id, nickname)
+            for id, nickname, row_lat, row_lng in rows
+            if (d := distance(lat, lng, row_lat, row_lng)) <= radius_m
+        ]
+        hits.sort()
+        return [NearbyUser(id=id, nickname=nickname, distance_m=d) for d, id, nickname in hits[:limit]]
+
+    async def get_taken_emails_and_nicknames(
+        self,
+        *,
+        emails: list[str],
+        nicknames: list[str],
+    ) -> tuple[set[str], set[str]]:
+        async with read_session() as db:
+            result = await db.execute(
+                select(User.email, User.nickname).where(
+                    or_(User.email.in_(emails), User.nickname.in_(nicknames))
+                )
             )
-            return stmt.scalars().first()
+        rows = result.all()
+        return {email for email, _ in rows}, {nickname for _, nickname in rows}
+
+    async def bulk_create(self, *, users: list[dict]) -> None:
+        await self._base.bulk_insert(users)
 
     async def save(self, *, user: User) -> None:
         session.add(user)
@@ -22,3 +22,14 @@ class CreateUserResponseDTO(BaseModel):
 class LoginResponseDTO(BaseModel):
     token: str = Field(..., description="Token")
     refresh_token: str = Field(..., description="Refresh token")
+
+
+class ImportUserErrorDTO(BaseModel):
+    line: int = Field(..., description="Line number in the uploaded file")
+    message: str = Field(..., description="Why the row was rejected")
+
+
+class ImportUsersResponseDTO(BaseModel):
+    created: int = Field(0, description="Users created")
+    failed: int = Field(0, description="Rows rejected")
+    errors: list[ImportUserErrorDTO] = Field(default_factory=list, description="Rejected rows")
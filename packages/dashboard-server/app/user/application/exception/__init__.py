@@ -17,3 +17,9 @@ class UserNotFoundException(CustomException):
     code = 404
     error_code = "USER__NOT_FOUND"
     message = "user not found"
+
+
+class UnsupportedImportFormatException(CustomException):
+    code = 415
+    error_code = "USER__UNSUPPORTED_IMPORT_FORMAT"
+    message = "import body must be text/csv or application/x-ndjson"
@@ -1,15 +1,23 @@
+import asyncio
+from typing import AsyncIterable
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
 from app.user.adapter.output.persistence.repository_adapter import UserRepositoryAdapter
-from app.user.application.dto import LoginResponseDTO
+from app.user.application.dto import ImportUserErrorDTO, ImportUsersResponseDTO, LoginResponseDTO
 from app.user.application.exception import (
     DuplicateEmailOrNicknameException,
     PasswordDoesNotMatchException,
     UserNotFoundException,
 )
-from app.user.domain.command import CreateUserCommand
-from app.user.domain.entity.user import User, UserRead
+from app.user.domain.command import CreateUserCommand, ImportUserCommand
+from app.user.domain.entity.user import NearbyUser, User, UserRead
 from app.user.domain.usecase.user import UserUseCase
 from app.user.domain.vo.location import Location
+from core.config import config
 from core.db import Transactional
+from core.helpers.password import password_hasher
 from core.helpers.token import TokenHelper
 
 
@@ -25,11 +33,23 @@ class UserService(UserUseCase):
     ) -> list[UserRead]:
         return await self.repository.get_users(limit=limit, prev=prev)
 
+    async def get_users_near(
+        self,
+        *,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 50,
+    ) -> list[NearbyUser]:
+        return await self.repository.get_users_near(lat=lat, lng=lng, radius_m=radius_m, limit=limit)
+
     @Transactional()
     async def create_user(self, *, command: CreateUserCommand) -> None:
         if command.password1 != command.password2:
             raise PasswordDoesNotMatchException
 
+        # Hashed before the lookup so no connection is held while it runs
+        password = await password_hasher.hash(command.password1)
         is_exist = await self.repository.get_user_by_email_or_nickname(
             email=command.email,
             nickname=command.nickname,
@@ -39,12 +59,121 @@ class UserService(UserUseCase):
 
         user = User.create(
             email=command.email,
-            password=command.password1,
+            password=password,
             nickname=command.nickname,
             location=Location(lat=command.lat, lng=command.lng),
         )
         await self.repository.save(user=user)
 
+    async def import_users(
+        self,
+        *,
+        rows: AsyncIterable[tuple[int, dict | ValueError]],
+        chunk_size: int | None = None,
+    ) -> ImportUsersResponseDTO:
+        """
+        Creates users from (line number, row) pairs, `chunk_size` rows at a
+        time: one duplicate query and one transaction per chunk. Rows that fail
+        validation or collide with an existing or earlier user are reported
+        by line; the others are created.
+        """
+        chunk_size = chunk_size or config.USER_IMPORT_CHUNK_SIZE
+        report = ImportUsersResponseDTO()
+        seen_emails: set[str] = set()
+        seen_nicknames: set[str] = set()
+
+        chunk = []
+        async for line, row in rows:
+            chunk.append((line, row))
+            if len(chunk) >= chunk_size:
+                await self._import_chunk(chunk, seen_emails, seen_nicknames, report)
+                chunk = []
+        if chunk:
+            await self._import_chunk(chunk, seen_emails, seen_nicknames, report)
+
+        report.failed = len(report.errors)
+        return report
+
+    async def _import_chunk(
+        self,
+        chunk: list[tuple[int, dict | ValueError]],
+        seen_emails: set[str],
+        seen_nicknames: set[str],
+        report: ImportUsersResponseDTO,
+    ) -> None:
+        def reject(line: int, message: str) -> None:
+            report.errors.append(ImportUserErrorDTO(line=line, message=message))
+
+        # Names claimed within this chunk only join the import-wide sets once
+        # the chunk commits, so a rolled-back chunk does not block later rows
+        chunk_emails: set[str] = set()
+        chunk_nicknames: set[str] = set()
+        valid: list[tuple[int, ImportUserCommand]] = []
+        for line, row in chunk:
+            if isinstance(row, ValueError):
+                reject(line, str(row))
+                continue
+            try:
+                command = ImportUserCommand.model_validate(row)
+            except ValidationError as e:
+                reject(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+            if (
+                command.email in seen_emails
+                or command.nickname in seen_nicknames
+                or command.email in chunk_emails
+                or command.nickname in chunk_nicknames
+            ):
+                reject(line, "duplicate email or nickname earlier in the import")
+                continue
+            chunk_emails.add(command.email)
+            chunk_nicknames.add(command.nickname)
+            valid.append((line, command))
+        if not valid:
+            return
+
+        # Hashed before the lookup, as in create_user, so the chunk's hashing
+        # never runs while the duplicate check or the insert holds a connection
+        passwords = await asyncio.gather(*(password_hasher.hash(command.password) for _, command in valid))
+        taken_emails, taken_nicknames = await self.repository.get_taken_emails_and_nicknames(
+            emails=[command.email for _, command in valid],
+            nicknames=[command.nickname for _, command in valid],
+        )
+        fresh = []
+        users = []
+        for (line, command), password in zip(valid, passwords):
+            if command.email in taken_emails or command.nickname in taken_nicknames:
+                reject(line, DuplicateEmailOrNicknameException.message)
+                continue
+            fresh.append((line, command))
+            users.append(
+                {
+                    "email": command.email,
+                    "password": password,
+                    "nickname": command.nickname,
+                    "is_admin": False,
+                    "lat": command.lat,
+                    "lng": command.lng,
+                }
+            )
+        if not users:
+            return
+
+        try:
+            await self._bulk_create(users=users)
+        except IntegrityError:
+            # A concurrent signup took one of the names after the duplicate check
+            for line, _ in fresh:
+                reject(line, "conflicted with a concurrent insert, retry this row")
+            return
+        seen_emails.update(command.email for _, command in fresh)
+        seen_nicknames.update(command.nickname for _, command in fresh)
+        report.created += len(users)
+
+    @Transactional()
+    async def _bulk_create(self, *, users: list[dict]) -> None:
+        await self.repository.bulk_create(users=users)
+
     async def is_admin(self, *, user_id: int) -> bool:
         user = await self.repository.get_user_by_id(user_id=user_id)
         if not user:
@@ -53,15 +182,27 @@ class UserService(UserUseCase):
         return user.is_admin
 
     async def login(self, *, email: str, password: str) -> LoginResponseDTO:
-        user = await self.repository.get_user_by_email_and_password(
-            email=email,
-            password=password,
-        )
-        if not user:
+        user = await self.repository.get_user_by_email(email=email)
+        # The lookup has returned its connection (see read_session), and only
+        # these values are used from here on, so none is held while the slow
+        # verify runs: login throughput is bound by the hasher, not the pool
+        user_id, stored = (user.id, user.password) if user else (None, None)
+        # Verified even for unknown emails, so response time does not reveal them
+        if not await password_hasher.verify(password, stored):
             raise UserNotFoundException
 
+        if password_hasher.needs_rehash(stored):
+            await self._rehash_password(user_id=user_id, password=password)
+
         response = LoginResponseDTO(
-            token=TokenHelper.encode(payload={"user_id": user.id}),
+            token=TokenHelper.encode(payload={"user_id": user_id}),
             refresh_token=TokenHelper.encode(payload={"sub": "refresh"}),
         )
         return response
+
+    @Transactional()
+    async def _rehash_password(self, *, user_id: int, password: str) -> None:
+        await self.repository.update_password(
+            user_id=user_id,
+            password=await password_hasher.hash(password),
+        )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CreateUserCommand(BaseModel):
@@ -8,3 +8,11 @@ class CreateUserCommand(BaseModel):
     nickname: str
     lat: float
     lng: float
+
+
+class ImportUserCommand(BaseModel):
+    email: str = Field(..., min_length=1, max_length=255)
+    password: str = Field(..., min_length=1)
+    nickname: str = Field(..., min_length=1, max_length=255)
+    lat: float
+    lng: float
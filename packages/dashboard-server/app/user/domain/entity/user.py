@@ -1,10 +1,19 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import String
+from sqlalchemy import String, event
 from sqlalchemy.orm import Mapped, mapped_column, composite
 
 from app.user.domain.vo.location import Location
 from core.db import Base
 from core.db.mixins import TimestampMixin
+from core.helpers import geohash
+
+
+def _location_geohash(context) -> str | None:
+    params = context.get_current_parameters()
+    lat, lng = params.get("lat"), params.get("lng")
+    return None if lat is None or lng is None else geohash.encode(lat, lng)
 
 
 class User(Base, TimestampMixin):
@@ -16,6 +25,13 @@ class User(Base, TimestampMixin):
     nickname: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     is_admin: Mapped[bool] = mapped_column(default=False)
     location: Mapped[Location] = composite(mapped_column("lat"), mapped_column("lng"))
+    # Filled from lat/lng on insert (ORM or Core) and on ORM location changes;
+    # bulk UPDATEs of lat/lng must set it themselves
+    geohash: Mapped[str | None] = mapped_column(
+        String(geohash.PRECISION),
+        index=True,
+        default=_location_geohash,
+    )
 
     @classmethod
     def create(
@@ -30,6 +46,50 @@ class User(Base, TimestampMixin):
         )
 
 
+@event.listens_for(User, "before_update")
+def _refresh_geohash(mapper, connection, target: User) -> None:
+    location = target.location
+    if location is None or location.lat is None or location.lng is None:
+        target.geohash = None
+    else:
+        target.geohash = geohash.encode(location.lat, location.lng)
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Detached, immutable copy of a User row, safe to share across requests"""
+
+    id: int
+    password: str
+    email: str
+    nickname: str
+    is_admin: bool
+    lat: float
+    lng: float
+
+    @property
+    def location(self) -> Location:
+        return Location(lat=self.lat, lng=self.lng)
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            password=user.password,
+            email=user.email,
+            nickname=user.nickname,
+            is_admin=user.is_admin,
+            lat=user.location.lat,
+            lng=user.location.lng,
+        )
+
+
+class NearbyUser(BaseModel):
+    id: int = Field(..., title="USER ID")
+    nickname: str = Field(..., title="Nickname")
+    distance_m: float = Field(..., title="Distance in meters")
+
+
 class UserRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from app.user.domain.entity.user import User
+from app.user.domain.entity.user import NearbyUser, User, UserSnapshot
 
 
 class UserRepo(ABC):
@@ -18,21 +18,48 @@ class UserRepo(ABC):
         *,
         email: str,
         nickname: str,
-    ) -> User | None:
+    ) -> UserSnapshot | None:
         """Get user by email or nickname"""
 
     @abstractmethod
-    async def get_user_by_id(self, *, user_id: int) -> User | None:
+    async def get_user_by_id(self, *, user_id: int) -> UserSnapshot | None:
         """Get user by id"""
 
     @abstractmethod
-    async def get_user_by_email_and_password(
+    async def get_users_by_ids(self, *, user_ids: list[int]) -> list[User]:
+        """Get users by ids in one query"""
+
+    @abstractmethod
+    async def get_user_by_email(self, *, email: str) -> UserSnapshot | None:
+        """Get user by email"""
+
+    @abstractmethod
+    async def update_password(self, *, user_id: int, password: str) -> None:
+        """Replace the stored password hash"""
+
+    @abstractmethod
+    async def get_users_near(
         self,
         *,
-        email: str,
-        password: str,
-    ) -> User | None:
-        """Get user by email and password"""
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 50,
+    ) -> list[NearbyUser]:
+        """Get users within radius_m meters, nearest first"""
+
+    @abstractmethod
+    async def get_taken_emails_and_nicknames(
+        self,
+        *,
+        emails: list[str],
+        nicknames: list[str],
+    ) -> tuple[set[str], set[str]]:
+        """Which of the emails and nicknames already belong to a user, in one query"""
+
+    @abstractmethod
+    async def bulk_create(self, *, users: list[dict]) -> None:
+        """Insert users (column dicts with the same keys) with multi-row statements"""
 
     @abstractmethod
     async def save(self, *, user: User) -> None:
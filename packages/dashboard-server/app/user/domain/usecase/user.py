@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from app.user.application.dto import LoginResponseDTO
-from app.user.domain.entity.user import User
+from typing import AsyncIterable
+
+from app.user.application.dto import ImportUsersResponseDTO, LoginResponseDTO
+from app.user.domain.entity.user import NearbyUser, User
 from app.user.domain.command import CreateUserCommand
 
 
@@ -14,10 +16,30 @@ class UserUseCase(ABC):
     ) -> list[User]:
         """Get user list"""
 
+    @abstractmethod
+    async def get_users_near(
+        self,
+        *,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: int = 50,
+    ) -> list[NearbyUser]:
+        """Get users near a location"""
+
     @abstractmethod
     async def create_user(self, *, command: CreateUserCommand) -> None:
         """Create User"""
 
+    @abstractmethod
+    async def import_users(
+        self,
+        *,
+        rows: AsyncIterable[tuple[int, dict | ValueError]],
+        chunk_size: int | None = None,
+    ) -> ImportUsersResponseDTO:
+        """Bulk-create users from parsed import rows"""
+
     @abstractmethod
     async def is_admin(self, *, user_id: int) -> bool:
         """Is admin"""
@@ -1,49 +1,106 @@
-import io, os, logging
+import time, random, logging
+from collections import deque
 from contextlib import contextmanager
 from fastapi import BackgroundTasks
 from core.context import get_request_id
 from core.config import config
-from app.logging_config import SensitiveDataFilter, RequestIDFilter
-from lib.s3_client import s3_client
+from app.logging_config import SensitiveDataFilter
+from app.utils.log_shipper import session_log_shipper
+from core.helpers.metrics import registry
 
 central_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
 
-def _send_log_task(sess_id: str, content: str):
+_sess_formatter = logging.Formatter(config.SESS_LOG_FORMAT)
+_sensitive_filter = SensitiveDataFilter()
+
+
+class SessionRecorder(logging.Logger):
     """
-    Receives the in-memory log content and processes/sends it to S3.
+    Logger that only collects raw LogRecords. Nothing is filtered or formatted
+    until the session is known to be kept, so discarded sessions cost only the
+    record creation.
     """
-    try:
-        s3_client.put_object(
-            Bucket=config.S3_BUCKET_NAME,
-            Key=f"session_logs/{sess_id}.log",
-            Body=content
+
+    def __init__(self):
+        super().__init__(name="session", level=logging.DEBUG)
+        self.propagate = False
+        self.records: list[logging.LogRecord] = []
+
+    def handle(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class SessionSampler:
+    """
+    Tail-based sampling: decides whether to keep a session's logs once the
+    request is over. Sessions that errored or ran slower than `slow_ms` are
+    always kept, the rest with probability `sample_rate`.
+    """
+
+    def __init__(self, *, sample_rate: float, slow_ms: float, pool_size: int):
+        self._sample_rate = sample_rate
+        self._slow_ms = slow_ms
+        self._pool: deque[SessionRecorder] = deque(maxlen=pool_size)
+        self.kept = 0
+        self.discarded = 0
+
+    def acquire(self) -> SessionRecorder:
+        try:
+            return self._pool.pop()
+        except IndexError:
+            return SessionRecorder()
+
+    def release(self, recorder: SessionRecorder) -> None:
+        recorder.records = []
+        self._pool.append(recorder)
+
+    def should_keep(self, records: list[logging.LogRecord], elapsed_ms: float) -> bool:
+        keep = (
+            any(record.levelno >= logging.ERROR for record in records)
+            or elapsed_ms >= self._slow_ms
+            or random.random() < self._sample_rate
         )
-    except Exception as ex:
-        central_logger.error("Failed to send log for %s: %s", sess_id, ex)
+        if keep:
+            self.kept += 1
+        else:
+            self.discarded += 1
+        return keep
+
+    def stats(self) -> dict:
+        return {"kept": self.kept, "discarded": self.discarded, "pooled": len(self._pool)}
+
+
+session_sampler = SessionSampler(
+    sample_rate=config.SESSION_LOG_SAMPLE_RATE,
+    slow_ms=config.SESSION_LOG_SLOW_MS,
+    pool_size=config.SESSION_LOG_POOL_SIZE,
+)
+registry.gauge(
+    "session_log_sampling",
+    "Session log sampling decisions",
+    ("decision",),
+    callback=lambda: {("kept",): session_sampler.kept, ("discarded",): session_sampler.discarded},
+)
+
+
+def _ship_session(req_id: str, records: list[logging.LogRecord]) -> None:
+    lines = []
+    for record in records:
+        record.request_id = req_id
+        _sensitive_filter.filter(record)
+        lines.append(_sess_formatter.format(record))
+    session_log_shipper.append(req_id, "\n".join(lines) + "\n")
 
 
 @contextmanager
 def session_logger_with_task(background_tasks: BackgroundTasks):
     """
     Context manager to handle session-specific in-memory logging setup/teardown.
+    Kept sessions are formatted and shipped from a background task.
     """
     req_id = get_request_id()
-    sess_id = f"session_{req_id}"
-
-    log_buffer = io.StringIO()
-
-    handler = logging.StreamHandler(log_buffer)
-    sess_formatter = logging.Formatter(config.SESS_LOG_FORMAT)
-    handler.setFormatter(sess_formatter)
-    handler.setLevel(logging.DEBUG)
-    
-    handler.addFilter(SensitiveDataFilter())
-    handler.addFilter(RequestIDFilter(req_id))
-
-    sess_logger = logging.Logger(name=sess_id)
-    sess_logger.setLevel(logging.DEBUG)
-    sess_logger.addHandler(handler)
-    sess_logger.propagate = False
+    sess_logger = session_sampler.acquire()
+    start = time.perf_counter()
 
     try:
         yield sess_logger
@@ -51,11 +108,9 @@ def session_logger_with_task(background_tasks: BackgroundTasks):
         sess_logger.exception("Session failed with an unhandled exception")
         raise
     finally:
-        log_content = log_buffer.getvalue()
-
-        sess_logger.removeHandler(handler)
-        handler.close()
-        log_buffer.close()
+        records = sess_logger.records
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        session_sampler.release(sess_logger)
 
-        if log_content:
-            background_tasks.add_task(_send_log_task, sess_id, log_content)
\ No newline at end of file
+        if records and session_sampler.should_keep(records, elapsed_ms):
+            background_tasks.add_task(_ship_session, req_id, records)
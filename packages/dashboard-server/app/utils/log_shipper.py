@@ -0,0 +1,222 @@
+import io, os, gzip, json, time, socket, asyncio, logging, threading, itertools
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from core.config import config
+from core.helpers.metrics import registry
+from lib.s3_client import s3_client
+
+central_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+S3_LATENCY = registry.histogram("s3_upload_duration_seconds", "Session log segment upload latency (object + manifest)")
+
+
+class _Segment:
+    """
+    One rolling object: session logs appended back to back into a single gzip
+    stream. `records` maps request_id -> [offset, length] in the uncompressed
+    stream.
+    """
+
+    def __init__(self, opened_at: datetime):
+        self.opened_at = opened_at
+        self.started = time.monotonic()
+        self.size = 0
+        self.records: dict[str, list[int]] = {}
+        self._buffer = io.BytesIO()
+        self._gzip = gzip.GzipFile(fileobj=self._buffer, mode="wb", mtime=0)
+
+    def append(self, request_id: str, content: str) -> None:
+        data = content.encode("utf-8")
+        self.records[request_id] = [self.size, len(data)]
+        self._gzip.write(data)
+        self.size += len(data)
+
+    def seal(self) -> bytes:
+        self._gzip.close()
+        return self._buffer.getvalue()
+
+
+class SessionLogShipper:
+    """
+    Collects session logs into compressed, time-partitioned S3 objects, each
+    with a `.manifest.json` that locates every request inside it. Uploads run
+    on a small dedicated executor; when too many are in flight or S3 fails, the
+    object is spooled to local disk and retried after the next good upload.
+    """
+
+    def __init__(
+        self,
+        *,
+        s3_client,
+        bucket: str,
+        prefix: str,
+        max_bytes: int,
+        max_age_sec: float,
+        spool_dir: str,
+        max_pending_uploads: int = 4,
+        upload_workers: int = 2,
+    ):
+        self._s3 = s3_client
+        self._bucket = bucket
+        self._prefix = prefix
+        self._max_bytes = max_bytes
+        self._max_age_sec = max_age_sec
+        self._spool_dir = spool_dir
+        self._max_pending = max_pending_uploads
+        self._executor = ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix="s3-shipper")
+        self._lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._segment: _Segment | None = None
+        self._pending = 0
+        self._seq = itertools.count()
+        self._origin = f"{socket.gethostname()}-{os.getpid()}"
+        self._task: asyncio.Task | None = None
+        self.uploaded = 0
+        self.spooled = 0
+        self.failed = 0
+
+    def append(self, request_id: str, content: str) -> None:
+        sealed = None
+        with self._lock:
+            if self._segment is None:
+                self._segment = _Segment(datetime.now(timezone.utc))
+            self._segment.append(request_id, content)
+            if self._segment.size >= self._max_bytes:
+                sealed = self._take()
+        if sealed:
+            self._dispatch(*sealed)
+
+    def roll(self, *, force: bool = False) -> None:
+        sealed = None
+        with self._lock:
+            segment = self._segment
+            if segment and (force or time.monotonic() - segment.started >= self._max_age_sec):
+                sealed = self._take()
+        if sealed:
+            self._dispatch(*sealed)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._roll_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.roll(force=True)
+        # Let in-flight uploads finish; anything that fails ends up in the spool
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+    async def _roll_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._max_age_sec)
+            await asyncio.to_thread(self.roll)
+
+    def _take(self) -> tuple[str, bytes, bytes]:
+        segment, self._segment = self._segment, None
+        opened = segment.opened_at
+        key = (
+            f"{self._prefix}/dt={opened:%Y-%m-%d}/hour={opened:%H}/"
+            f"{opened:%H%M%S}-{self._origin}-{next(self._seq):06d}.log.gz"
+        )
+        manifest = json.dumps({"object": key, "records": segment.records}).encode("utf-8")
+        return key, segment.seal(), manifest
+
+    def _dispatch(self, key: str, body: bytes, manifest: bytes) -> None:
+        with self._lock:
+            backed_up = self._pending >= self._max_pending
+            if not backed_up:
+                self._pending += 1
+        if backed_up:
+            self._spool(key, body, manifest)
+            return
+        self._executor.submit(self._upload, key, body, manifest)
+
+    def _put(self, key: str, body: bytes, manifest: bytes) -> None:
+        start = time.perf_counter()
+        try:
+            self._s3.put_object(Bucket=self._bucket, Key=key, Body=body, ContentEncoding="gzip")
+            self._s3.put_object(Bucket=self._bucket, Key=_manifest_key(key), Body=manifest)
+        finally:
+            S3_LATENCY.observe(time.perf_counter() - start)
+        self.uploaded += 1
+        central_logger.debug("Shipped %s (%s bytes) in %.2fms", key, len(body), (time.perf_counter() - start) * 1000)
+
+    def _upload(self, key: str, body: bytes, manifest: bytes) -> None:
+        try:
+            self._put(key, body, manifest)
+        except Exception as ex:
+            self.failed += 1
+            central_logger.error("Failed to ship session logs %s: %s", key, ex)
+            self._spool(key, body, manifest)
+        else:
+            self._drain_spool()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _spool(self, key: str, body: bytes, manifest: bytes) -> None:
+        path = os.path.join(self._spool_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Manifest last: a spooled object only counts as complete once it exists
+        with open(path, "wb") as f:
+            f.write(body)
+        with open(_manifest_key(path), "wb") as f:
+            f.write(manifest)
+        self.spooled += 1
+
+    def _drain_spool(self) -> None:
+        if not os.path.isdir(self._spool_dir) or not self._spool_lock.acquire(blocking=False):
+            return
+        try:
+            for root, _, files in os.walk(self._spool_dir):
+                for name in files:
+                    if not name.endswith(".manifest.json"):
+                        continue
+                    manifest_path = os.path.join(root, name)
+                    path = manifest_path[: -len(".manifest.json")] + ".log.gz"
+                    key = os.path.relpath(path, self._spool_dir).replace(os.sep, "/")
+                    with open(path, "rb") as f:
+                        body = f.read()
+                    with open(manifest_path, "rb") as f:
+                        manifest = f.read()
+                    self._put(key, body, manifest)
+                    os.remove(manifest_path)
+                    os.remove(path)
+        except Exception as ex:
+            central_logger.error("Failed to ship spooled session logs: %s", ex)
+        finally:
+            self._spool_lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "pending_uploads": self._pending,
+            "uploaded": self.uploaded,
+            "spooled": self.spooled,
+            "failed": self.failed,
+        }
+
+
+def _manifest_key(key: str) -> str:
+    return key[: -len(".log.gz")] + ".manifest.json"
+
+
+session_log_shipper = SessionLogShipper(
+    s3_client=s3_client,
+    bucket=config.S3_BUCKET_NAME,
+    prefix="session_logs",
+    max_bytes=config.SESSION_LOG_SEGMENT_BYTES,
+    max_age_sec=config.SESSION_LOG_SEGMENT_AGE_SEC,
+    spool_dir=config.SESSION_LOG_SPOOL_DIR,
+    max_pending_uploads=config.SESSION_LOG_MAX_PENDING_UPLOADS,
+)
+registry.gauge(
+    "session_log_shipper",
+    "Session log shipper pending uploads and uploaded/spooled/failed segment totals",
+    ("stat",),
+    callback=lambda: {(k,): v for k, v in session_log_shipper.stats().items()},
+)
@@ -0,0 +1,82 @@
+"""
+Rows per second of BaseRepo's single-row helpers against the bulk variants.
+
+    PYTHONPATH=. python -m benchmarks.bulk_repo
+
+Runs against WRITER_DB_URL/READER_DB_URL, so point both at a scratch MySQL
+(or, with aiosqlite installed, `sqlite+aiosqlite:///bench.db`). Creates and
+drops its own `bench_row` table.
+"""
+import asyncio
+import time
+
+from sqlalchemy import String, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.db.session import Base, reset_session_context, session, set_session_context, writer_engine
+from core.repository.base import BaseRepo
+
+ROWS = 5_000
+
+
+class BenchRow(Base):
+    __tablename__ = "bench_row"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(64))
+    score: Mapped[int] = mapped_column(default=0)
+
+
+repo = BaseRepo(BenchRow)
+
+
+async def timed(label: str, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    await session.commit()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {ROWS / elapsed:>10,.0f} rows/s")
+
+
+async def insert_each(rows: list[dict]) -> None:
+    for row in rows:
+        await session.execute(insert(BenchRow).values(**row))
+
+
+async def update_each(rows: list[dict]) -> None:
+    for row in rows:
+        await repo.update_by_id(row["id"], {"score": row["score"] + 1})
+
+
+async def get_each(ids: list[int]) -> None:
+    for id in ids:
+        await repo.get_by_id(id)
+
+
+async def main() -> None:
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(BenchRow.__table__.drop, checkfirst=True)
+        await conn.run_sync(BenchRow.__table__.create)
+
+    context = set_session_context(session_id="benchmark")
+    try:
+        first = [{"id": i, "name": f"row-{i}", "score": i} for i in range(ROWS)]
+        second = [{"id": ROWS + i, "name": f"row-{i}", "score": i} for i in range(ROWS)]
+        ids = [row["id"] for row in first]
+
+        await timed("insert, one per row", insert_each(first))
+        await timed("bulk_insert", repo.bulk_insert(second))
+        await timed("update_by_id, one per row", update_each(first))
+        await timed("bulk_update_by_ids", repo.bulk_update_by_ids({id: {"score": 0} for id in ids}))
+        await timed("bulk_upsert", repo.bulk_upsert(second))
+        await timed("get_by_id, one per row", get_each(ids))
+        await timed("get_by_ids", repo.get_by_ids(ids))
+    finally:
+        await session.remove()
+        reset_session_context(context)
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(BenchRow.__table__.drop)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Per-request cost of the central access-log line on the request path.
+
+    PYTHONPATH=. python -m benchmarks.logging_overhead
+
+"sync" is the pre-queue setup (handlers, masking and formatting inline, message
+built with an f-string); "queued" enqueues a lazy %-args record for the
+listener thread. stdout is sent to /dev/null so terminal speed does not count.
+"""
+import logging
+import logging.config
+import os
+import sys
+import time
+
+from app.logging_config import LOGGING_CONFIG, log_queue_stats, start_log_listener, stop_log_listener
+from core.config import config
+
+CALLS = 50_000
+ARGS = ("GET", "/event/notifications", 200, "10.0.0.1", "Mozilla/5.0", 0.0123)
+
+
+def sync_call(logger: logging.Logger) -> None:
+    method, path, status_code, client_ip, user_agent, process_time = ARGS
+    logger.info(
+        f"{method} {path} | Status: {status_code} | IP: {client_ip} | Device: {user_agent} | Time: {process_time:.3f}s"
+    )
+
+
+def queued_call(logger: logging.Logger) -> None:
+    logger.info("%s %s | Status: %s | IP: %s | Device: %s | Time: %.3fs", *ARGS)
+
+
+def run(call, logger: logging.Logger) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        call(logger)
+    return (time.perf_counter() - start) / CALLS * 1_000_000
+
+
+def main() -> None:
+    sys.stdout = open(os.devnull, "w")
+    logging.config.dictConfig(LOGGING_CONFIG)
+    logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+    sync_us = run(sync_call, logger)
+
+    start_log_listener()
+    queued_us = run(queued_call, logger)
+    stats = log_queue_stats()
+    drain_start = time.perf_counter()
+    stop_log_listener()
+    drain_sec = time.perf_counter() - drain_start
+
+    sys.stdout = sys.__stdout__
+    print(f"sync:   {sync_us:7.2f} us/call on the request path")
+    print(f"queued: {queued_us:7.2f} us/call on the request path")
+    print(f"        listener drained the backlog in {drain_sec:.2f}s, dropped {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
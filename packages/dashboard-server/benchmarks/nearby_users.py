@@ -0,0 +1,87 @@
+"""
+Nearby-user lookups over a million synthetic users: a full scan computing
+every distance against the geohash prefilter used by get_users_near.
+
+    PYTHONPATH=. python -m benchmarks.nearby_users
+
+Runs in memory: the `user.geohash` B-tree index is modelled as a sorted
+array searched with bisect (one range per covering cell, as MySQL does for
+each `geohash LIKE 'prefix%'`), so the numbers compare candidate counts and
+filtering cost rather than I/O.
+"""
+import random
+import time
+from bisect import bisect_left
+
+from core.helpers import geohash
+
+USERS = 1_000_000
+QUERIES = 50
+RADII_M = (500, 2_000, 10_000)
+# Users cluster in a metro area, with a sparse tail over the rest of the country
+METRO = ((37.40, 37.70), (126.80, 127.20))
+COUNTRY = ((34.5, 38.5), (126.0, 129.5))
+
+
+def synthetic_users(rng: random.Random) -> list[tuple[float, float]]:
+    users = []
+    for _ in range(USERS):
+        (lat_lo, lat_hi), (lng_lo, lng_hi) = METRO if rng.random() < 0.8 else COUNTRY
+        users.append((rng.uniform(lat_lo, lat_hi), rng.uniform(lng_lo, lng_hi)))
+    return users
+
+
+def full_scan(users, lat, lng, radius_m) -> int:
+    distance = geohash.haversine_m
+    return sum(1 for u_lat, u_lng in users if distance(lat, lng, u_lat, u_lng) <= radius_m)
+
+
+def prefiltered(index, hashes, users, lat, lng, radius_m) -> tuple[int, int]:
+    distance = geohash.haversine_m
+    candidates = 0
+    hits = 0
+    for cell in geohash.covering_cells(lat, lng, radius_m):
+        start = bisect_left(hashes, cell)
+        end = bisect_left(hashes, cell + "~")
+        candidates += end - start
+        for position in range(start, end):
+            u_lat, u_lng = users[index[position]]
+            if distance(lat, lng, u_lat, u_lng) <= radius_m:
+                hits += 1
+    return hits, candidates
+
+
+def main() -> None:
+    rng = random.Random(42)
+    users = synthetic_users(rng)
+
+    start = time.perf_counter()
+    encoded = sorted((geohash.encode(lat, lng), i) for i, (lat, lng) in enumerate(users))
+    hashes = [h for h, _ in encoded]
+    index = [i for _, i in encoded]
+    print(f"built index over {USERS:,} users in {time.perf_counter() - start:.1f}s")
+
+    queries = [(rng.uniform(*METRO[0]), rng.uniform(*METRO[1])) for _ in range(QUERIES)]
+    for radius_m in RADII_M:
+        start = time.perf_counter()
+        results = [prefiltered(index, hashes, users, lat, lng, radius_m) for lat, lng in queries]
+        indexed_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        # The full scan is slow; a handful of queries is enough for its average
+        sample = queries[:5]
+        start = time.perf_counter()
+        expected = [full_scan(users, lat, lng, radius_m) for lat, lng in sample]
+        scan_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+        assert expected == [hits for hits, _ in results[:len(sample)]]
+        candidates = sum(c for _, c in results) / QUERIES
+        hits = sum(h for h, _ in results) / QUERIES
+        print(
+            f"radius {radius_m:>6,}m: full scan {scan_ms:8.1f} ms/query, "
+            f"geohash {indexed_ms:7.2f} ms/query "
+            f"({candidates:,.0f} candidates, {hits:,.0f} within radius)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-request overhead of SQLAlchemyMiddleware on a route that never touches
+the database.
+
+    PYTHONPATH=. python -m benchmarks.sqlalchemy_middleware
+
+"eager" is the previous middleware (uuid4 session id, unconditional
+session.remove()); "lazy" is the current one. Needs no database: neither
+creates a connection on this path.
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+from core.db.session import reset_session_context, session, set_session_context
+from core.fastapi.middlewares import SQLAlchemyMiddleware
+
+REQUESTS = 100_000
+SCOPE = {"type": "http", "method": "GET", "path": "/event/notifications"}
+
+
+class EagerSQLAlchemyMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        context = set_session_context(session_id=str(uuid4()))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await session.remove()
+            reset_session_context(context=context)
+
+
+async def endpoint(scope, receive, send) -> None:
+    return None
+
+
+async def run(middleware) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await middleware(SCOPE, None, None)
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+async def main() -> None:
+    baseline = await run(endpoint)
+    eager = await run(EagerSQLAlchemyMiddleware(endpoint))
+    lazy = await run(SQLAlchemyMiddleware(endpoint))
+    print(f"eager: {eager - baseline:6.2f} us/request over the bare endpoint")
+    print(f"lazy:  {lazy - baseline:6.2f} us/request over the bare endpoint")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
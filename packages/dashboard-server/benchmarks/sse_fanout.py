@@ -0,0 +1,105 @@
+"""
+Redis connections held for N simulated SSE clients.
+
+    PYTHONPATH=. python -m benchmarks.sse_fanout            # shared broadcaster
+    PYTHONPATH=. python -m benchmarks.sse_fanout --legacy   # one pubsub per client (pre-broadcaster)
+
+Needs the Redis configured in core.config. Writes to a scratch stream/channel,
+so it does not disturb live dashboards.
+"""
+import argparse
+import asyncio
+import time
+
+from app.api.broadcaster import EventBroadcaster
+from core.redis_db import r
+
+STREAM = "benchmark:sse_fanout"
+CHANNEL = "benchmark:sse_fanout:pubsub"
+CLIENT_COUNTS = (10, 100, 1000, 5000)
+MESSAGES = 20
+
+
+async def connected_clients() -> int:
+    info = await r.info("clients")
+    return info["connected_clients"]
+
+
+async def wait_for_subscribers(count: int) -> None:
+    while True:
+        (_, subscribers), = await r.pubsub_numsub(CHANNEL)
+        if subscribers >= count:
+            return
+        await asyncio.sleep(0.05)
+
+
+async def run_shared(clients: int) -> tuple[int, float]:
+    broadcaster = EventBroadcaster(r, stream=STREAM, queue_size=MESSAGES)
+    connected = asyncio.Event()
+
+    async def client():
+        async with broadcaster.listen() as stream:
+            if broadcaster.client_count == clients:
+                connected.set()
+            received = 0
+            while received < MESSAGES:
+                await stream.wait(timeout=30)
+                received += len(stream.drain(MESSAGES))
+
+    tasks = [asyncio.create_task(client()) for _ in range(clients)]
+    await connected.wait()
+    await broadcaster.ready.wait()
+    connections = await connected_clients()
+
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await r.xadd(STREAM, {"data": str(i)}, maxlen=1000, approximate=True)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    await broadcaster.stop()
+    return connections, elapsed
+
+
+async def run_legacy(clients: int) -> tuple[int, float]:
+    async def client():
+        pubsub = r.pubsub()
+        await pubsub.subscribe(CHANNEL)
+        received = 0
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    received += 1
+                    if received == MESSAGES:
+                        return
+        finally:
+            await pubsub.aclose()
+
+    tasks = [asyncio.create_task(client()) for _ in range(clients)]
+    await wait_for_subscribers(clients)
+    connections = await connected_clients()
+
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await r.publish(CHANNEL, str(i))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return connections, elapsed
+
+
+async def main(legacy: bool) -> None:
+    run = run_legacy if legacy else run_shared
+    baseline = await connected_clients()
+    print(f"mode={'legacy' if legacy else 'shared'} messages={MESSAGES} baseline_connections={baseline}")
+    print(f"{'clients':>8} {'redis_conns':>12} {'delivery_ms':>12}")
+    for clients in CLIENT_COUNTS:
+        connections, elapsed = await run(clients)
+        print(f"{clients:>8} {connections - baseline:>12} {elapsed * 1000:>12.1f}")
+    await r.delete(STREAM)
+    await r.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--legacy", action="store_true", help="one Redis subscription per client")
+    asyncio.run(main(parser.parse_args().legacy))
@@ -0,0 +1,82 @@
+"""
+Repeated user lookups through UserSQLAlchemyRepo with and without the
+identity cache.
+
+    PYTHONPATH=. python -m benchmarks.user_cache
+
+Needs the database at WRITER_DB_URL/READER_DB_URL with migrations applied;
+inserts USERS rows with a `bench-` email prefix and deletes them afterwards.
+"""
+import asyncio
+import random
+import time
+
+from sqlalchemy import delete
+
+from app.user.adapter.output.persistence.sqlalchemy.user import UserSQLAlchemyRepo
+from app.user.domain.entity.user import User
+from app.user.domain.vo.location import Location
+from core.config import config
+from core.db.session import reset_session_context, session, set_session_context
+from core.helpers.identity_cache import IdentityCache
+from core.redis_db import r
+
+USERS = 100
+LOOKUPS = 10_000
+
+
+async def run(label: str, repo: UserSQLAlchemyRepo, users: list[User]) -> None:
+    picks = [random.choice(users) for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for i, user in enumerate(picks):
+        context = set_session_context(session_id=f"{label}-{i}")
+        try:
+            if i % 2:
+                await repo.get_user_by_id(user_id=user.id)
+            else:
+                await repo.get_user_by_email_or_nickname(email=user.email, nickname=user.nickname)
+        finally:
+            await session.remove()
+            reset_session_context(context)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {LOOKUPS / elapsed:>10,.0f} lookups/s")
+
+
+async def main() -> None:
+    context = set_session_context(session_id="seed")
+    users = [
+        User.create(
+            email=f"bench-{i}@example.com",
+            password="password",
+            nickname=f"bench-{i}",
+            location=Location(lat=37.5, lng=127.0),
+        )
+        for i in range(USERS)
+    ]
+    session.add_all(users)
+    await session.commit()
+    await session.remove()
+    reset_session_context(context)
+
+    cache = IdentityCache(
+        r,
+        name="bench_user",
+        maxsize=config.USER_CACHE_SIZE,
+        ttl=config.USER_CACHE_TTL_SEC,
+        indexes=("email", "nickname"),
+        quarantine_sec=0,
+    )
+    try:
+        await run("uncached", UserSQLAlchemyRepo(cache=None), users)
+        await run("cached", UserSQLAlchemyRepo(cache=cache), users)
+        print(f"cache: {cache.stats()}")
+    finally:
+        context = set_session_context(session_id="cleanup")
+        await session.execute(delete(User).where(User.email.startswith("bench-")))
+        await session.commit()
+        await session.remove()
+        reset_session_context(context)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
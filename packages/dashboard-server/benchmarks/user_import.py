@@ -0,0 +1,86 @@
+"""
+Users created per second by one-at-a-time UserService.create_user against the
+bulk UserService.import_users path.
+
+    PASSWORD_HASH_ITERATIONS=1000 PYTHONPATH=. python -m benchmarks.user_import
+
+Needs the database at WRITER_DB_URL/READER_DB_URL with migrations applied.
+Lowering PASSWORD_HASH_ITERATIONS keeps hashing from dominating, so the
+numbers show the database round trips; with the production setting both
+paths are bound by the hashing pool. Rows use a `bench-import-` email prefix
+and are deleted afterwards.
+"""
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from app.user.adapter.input.api.v1.request.import_stream import iter_rows
+from app.user.adapter.output.persistence.repository_adapter import UserRepositoryAdapter
+from app.user.adapter.output.persistence.sqlalchemy.user import UserSQLAlchemyRepo
+from app.user.application.service.user import UserService
+from app.user.domain.command import CreateUserCommand
+from app.user.domain.entity.user import User
+from core.db.session import reset_session_context, session, set_session_context
+from core.helpers.password import password_hasher
+
+USERS = 2_000
+
+
+async def one_by_one(service: UserService) -> None:
+    for i in range(USERS):
+        context = set_session_context(session_id=f"single-{i}")
+        try:
+            await service.create_user(command=CreateUserCommand(
+                email=f"bench-import-single-{i}@example.com",
+                password1="password",
+                password2="password",
+                nickname=f"bench-import-single-{i}",
+                lat=37.5,
+                lng=127.0,
+            ))
+        finally:
+            await session.remove()
+            reset_session_context(context)
+
+
+async def body():
+    yield b"email,password,nickname,lat,lng\n"
+    for i in range(USERS):
+        yield f"bench-import-bulk-{i}@example.com,password,bench-import-bulk-{i},37.5,127.0\n".encode()
+
+
+async def bulk(service: UserService) -> None:
+    context = set_session_context(session_id="bulk")
+    try:
+        report = await service.import_users(rows=iter_rows(body(), "text/csv"))
+        assert report.created == USERS, report.errors[:5]
+    finally:
+        await session.remove()
+        reset_session_context(context)
+
+
+async def timed(label: str, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {USERS / elapsed:>10,.0f} users/s")
+
+
+async def main() -> None:
+    service = UserService(repository=UserRepositoryAdapter(user_repo=UserSQLAlchemyRepo()))
+    password_hasher.start()
+    try:
+        await timed("create_user", one_by_one(service))
+        await timed("import_users", bulk(service))
+    finally:
+        password_hasher.stop()
+        context = set_session_context(session_id="cleanup")
+        await session.execute(delete(User).where(User.email.startswith("bench-import-")))
+        await session.commit()
+        await session.remove()
+        reset_session_context(context)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
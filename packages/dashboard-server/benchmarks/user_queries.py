@@ -0,0 +1,78 @@
+"""
+Per-call Python overhead of the login (by email) and admin-check (by id)
+user lookups: statements rebuilt with select() on every call against the
+repository's lambda statements.
+
+    PYTHONPATH=. python -m benchmarks.user_queries
+
+Runs against in-memory SQLite so the database round trip is negligible and
+the timings are dominated by statement construction, cache-key generation
+and ORM result handling. "build" times the statement plus its cache key
+alone; "execute" is a full Session.execute(...).scalars().first().
+"""
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.user.adapter.output.persistence.sqlalchemy.user import _user_by_email, _user_by_id
+from app.user.domain.entity.user import User
+from core.db import Base
+from core.db.session import COMPILED_CACHE, track_compiled_cache
+from tests.support.user_fixture import make_user
+
+USERS = 1_000
+CALLS = 5_000
+# Best of REPEATS runs, as timeit reports, to keep scheduler noise out
+REPEATS = 5
+
+PATHS = {
+    "login": (
+        lambda i: select(User).where(User.email == f"{i % USERS}@bench"),
+        lambda i: _user_by_email(f"{i % USERS}@bench"),
+    ),
+    "admin-check": (
+        lambda i: select(User).where(User.id == i % USERS + 1),
+        lambda i: _user_by_id(i % USERS + 1),
+    ),
+}
+
+
+def per_call_us(fn) -> float:
+    for i in range(200):
+        fn(i)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            fn(i)
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS * 1e6
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    track_compiled_cache(engine, "bench")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        db.add_all(make_user(email=f"{i}@bench", nickname=f"bench-{i}") for i in range(USERS))
+        db.commit()
+
+        for path, (plain, cached) in PATHS.items():
+            build_plain = per_call_us(lambda i: plain(i)._generate_cache_key())
+            build_lambda = per_call_us(lambda i: cached(i)._generate_cache_key())
+            exec_plain = per_call_us(lambda i: db.execute(plain(i)).scalars().first())
+            exec_lambda = per_call_us(lambda i: db.execute(cached(i)).scalars().first())
+            print(
+                f"{path:<12} build: select() {build_plain:6.1f} us, lambda {build_lambda:6.1f} us | "
+                f"execute: select() {exec_plain:6.1f} us, lambda {exec_lambda:6.1f} us "
+                f"({exec_plain - exec_lambda:+.1f} us/call saved)"
+            )
+
+    hits = COMPILED_CACHE.value("bench", "hit")
+    misses = COMPILED_CACHE.value("bench", "miss")
+    print(f"compiled cache: {hits:,.0f} hits, {misses:,.0f} misses ({hits / (hits + misses):.2%} hit rate)")
+
+
+if __name__ == "__main__":
+    main()
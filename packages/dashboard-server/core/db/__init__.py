@@ -1,4 +1,4 @@
-from .session import Base, session, session_factory
+from .session import Base, read_session, session, session_factory
 from .transactional import Transactional
 
 __all__ = [
@@ -6,4 +6,5 @@ __all__ = [
     "session",
     "Transactional",
     "session_factory",
+    "read_session",
 ]
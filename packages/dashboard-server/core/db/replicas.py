@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Literal
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import config
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+SelectionPolicy = Literal["weighted", "least_loaded"]
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine, *, label: str, weight: float = 1.0):
+        self.engine = engine
+        self.label = label
+        self.weight = weight
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.lag_sec: float | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    @property
+    def load(self) -> float:
+        return self.engine.pool.checkedout() / self.weight
+
+
+class ReplicaSet:
+    """
+    Read replicas behind RoutingSession. A replica is ejected for `eject_sec`
+    after `eject_after` consecutive connection errors, or while a health check
+    finds it lagging more than `max_lag_sec` or not replicating at all.
+    `choose` returns None when no replica is healthy, so the caller falls
+    back to the writer.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        *,
+        policy: SelectionPolicy,
+        eject_after: int,
+        eject_sec: float,
+        max_lag_sec: float,
+    ):
+        self.replicas = replicas
+        self.policy = policy
+        self.eject_after = eject_after
+        self.eject_sec = eject_sec
+        self.max_lag_sec = max_lag_sec
+        self._task: asyncio.Task | None = None
+        for replica in replicas:
+            self._watch(replica)
+
+    def choose(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if len(healthy) == 1:
+            return healthy[0]
+        if self.policy == "weighted":
+            return random.choices(healthy, weights=[r.weight for r in healthy])[0]
+        lowest = min(replica.load for replica in healthy)
+        return random.choice([replica for replica in healthy if replica.load == lowest])
+
+    def eject(self, replica: Replica, reason: str) -> None:
+        if replica.healthy:
+            server_logger.warning("Ejecting read replica %s for %ss: %s", replica.label, self.eject_sec, reason)
+        replica.ejected_until = time.monotonic() + self.eject_sec
+
+    def record_failure(self, replica: Replica, error: BaseException) -> None:
+        replica.failures += 1
+        if replica.failures >= self.eject_after:
+            self.eject(replica, str(error))
+
+    def record_success(self, replica: Replica) -> None:
+        replica.failures = 0
+
+    def _watch(self, replica: Replica) -> None:
+        sync_engine = replica.engine.sync_engine
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.record_failure(replica, context.original_exception)
+
+        @event.listens_for(sync_engine.pool, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            self.record_success(replica)
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                replica.lag_sec = await self._lag(conn)
+        except Exception as e:
+            self.record_failure(replica, e)
+            return
+
+        self.record_success(replica)
+        if replica.lag_sec == math.inf:
+            self.eject(replica, "replication stopped")
+        elif replica.lag_sec is not None and replica.lag_sec > self.max_lag_sec:
+            self.eject(replica, f"replication lag {replica.lag_sec}s")
+        elif not replica.healthy and replica.failures == 0:
+            replica.ejected_until = 0.0
+            server_logger.info("Read replica %s is back in rotation", replica.label)
+
+    @staticmethod
+    async def _lag(conn) -> float | None:
+        """
+        Seconds behind the source; None when unknown (no REPLICATION CLIENT
+        grant, or a host with no replica status row, such as a primary).
+        A status row with a NULL lag means the replication threads are
+        stopped, so the replica only gets staler: that is infinite lag.
+        """
+        try:
+            row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+        except Exception:
+            return None
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float(lag) if lag is not None else math.inf
+
+    async def start(self, interval: float) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._check_periodically(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _check_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            replica.label: {
+                "healthy": replica.healthy,
+                "failures": replica.failures,
+                "lag_sec": replica.lag_sec,
+                "checked_out": replica.engine.pool.checkedout(),
+            }
+            for replica in self.replicas
+        }
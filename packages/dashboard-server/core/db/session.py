@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import time
 from contextlib import asynccontextmanager
 from contextvars import ContextVar, Token
 from enum import Enum
@@ -9,10 +12,28 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy import event, text
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
 from core.config import config
+from core.db.replicas import Replica, ReplicaSet
+from core.helpers.metrics import registry
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+POOL_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to check a connection out of the pool (includes connecting and pre-ping)",
+    ("engine",),
+)
+
+COMPILED_CACHE = registry.counter(
+    "db_compiled_cache_total",
+    "Statement executions by compiled-cache outcome (hit, miss, no_cache_key, ...)",
+    ("engine", "result"),
+)
 
 session_context: ContextVar[str] = ContextVar("session_context")
 
@@ -34,18 +55,145 @@ class EngineType(Enum):
     READER = "reader"
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait per engine"""
+
+    def __init__(self, *args, label: str = "default", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label = label
+
+    def recreate(self) -> "TimedQueuePool":
+        # engine.dispose() and invalidation swap in a recreated pool; keep its label
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start, self.label)
+
+
+def track_compiled_cache(sync_engine, label: str) -> None:
+    """Counts each execution on `sync_engine` by whether its compiled form was cached"""
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        COMPILED_CACHE.inc(label, context.cache_hit.name.lower().removeprefix("cache_"))
+
+
+def make_engine(url: str, label: str):
+    engine = create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    engine.pool.label = label
+    track_compiled_cache(engine.sync_engine, label)
+    return engine
+
+
+def make_replicas() -> ReplicaSet:
+    urls = config.READER_DB_URLS or [config.READER_DB_URL]
+    weights = config.READER_DB_WEIGHTS + [1.0] * (len(urls) - len(config.READER_DB_WEIGHTS))
+    replicas = []
+    for index, (url, weight) in enumerate(zip(urls, weights)):
+        label = EngineType.READER.value if len(urls) == 1 else f"{EngineType.READER.value}-{index}"
+        replicas.append(Replica(make_engine(url, label), label=label, weight=weight))
+    return ReplicaSet(
+        replicas,
+        policy=config.READER_SELECTION,
+        eject_after=config.READER_EJECT_AFTER_FAILURES,
+        eject_sec=config.READER_EJECT_SEC,
+        max_lag_sec=config.READER_MAX_LAG_SEC,
+    )
+
+
+writer_engine = make_engine(config.WRITER_DB_URL, EngineType.WRITER.value)
+replicas = make_replicas()
 engines = {
-    EngineType.WRITER: create_async_engine(config.WRITER_DB_URL, pool_recycle=3600),
-    EngineType.READER: create_async_engine(config.READER_DB_URL, pool_recycle=3600),
+    EngineType.WRITER.value: writer_engine,
+    **{replica.label: replica.engine for replica in replicas.replicas},
 }
 
 
+def pool_stats() -> dict[str, dict[str, int]]:
+    stats = {}
+    for label, engine in engines.items():
+        pool = engine.pool
+        stats[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return stats
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Connection pool state per engine",
+    ("engine", "state"),
+    callback=lambda: {
+        (engine, state): value
+        for engine, stats in pool_stats().items()
+        for state, value in stats.items()
+    },
+)
+
+
+async def warm_up_pools() -> None:
+    """
+    Opens DB_POOL_WARMUP connections per engine at startup, so the first
+    requests find them in the pool instead of paying the connect latency.
+    """
+
+    async def ping(engine) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    for label, engine in engines.items():
+        count = min(config.DB_POOL_WARMUP, config.DB_POOL_SIZE)
+        results = await asyncio.gather(*(ping(engine) for _ in range(count)), return_exceptions=True)
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            server_logger.warning("Warming %s pool: %s of %s connections failed: %s",
+                                  label, len(failed), count, failed[0])
+
+
+_WROTE_AT = "routing_wrote_at"
+_REPLICA = "routing_replica"
+
+
 class RoutingSession(Session):
+    """
+    Writes, and any read within READ_YOUR_WRITES_SEC of this session's last
+    write, go to the writer so a request sees its own changes. Other reads
+    stick to one replica per session, picked again only if it gets ejected;
+    with every replica ejected they fall back to the writer.
+    """
+
     def get_bind(self, mapper=None, clause=None, **kw):
         if self._flushing or isinstance(clause, (Update, Delete, Insert)):
-            return engines[EngineType.WRITER].sync_engine
-        else:
-            return engines[EngineType.READER].sync_engine
+            self.info[_WROTE_AT] = time.monotonic()
+            return writer_engine.sync_engine
+
+        wrote_at = self.info.get(_WROTE_AT)
+        if wrote_at is not None and time.monotonic() - wrote_at < config.READ_YOUR_WRITES_SEC:
+            return writer_engine.sync_engine
+
+        replica = self.info.get(_REPLICA)
+        if replica is None or not replica.healthy:
+            replica = self.info[_REPLICA] = replicas.choose()
+            if replica is None:
+                return writer_engine.sync_engine
+        return replica.engine.sync_engine
 
 
 _async_session_factory = async_sessionmaker(
@@ -65,12 +213,43 @@ class Base(DeclarativeBase):
 
 @asynccontextmanager
 async def session_factory() -> AsyncGenerator[AsyncSession, None]:
-    _session = async_sessionmaker(
-        class_=AsyncSession,
-        sync_session_class=RoutingSession,
-        expire_on_commit=False,
-    )()
+    _session = _async_session_factory()
     try:
         yield _session
     finally:
         await _session.close()
+
+
+def _has_changes(_session: AsyncSession) -> bool:
+    return bool(_session.new or _session.dirty or _session.deleted)
+
+
+@asynccontextmanager
+async def read_session() -> AsyncGenerator[AsyncSession | async_scoped_session, None]:
+    """
+    Inside a request, the request's scoped session, so consecutive lookups and
+    the final write share one session (identity map and replica choice). A
+    read that opened the session's transaction ends it on exit, returning the
+    connection to the pool before whatever slow work the caller does next; a
+    session that already has writes in flight is left to its Transactional.
+    Outside a request (workers, scripts), a short-lived session that is
+    closed on exit.
+    """
+    if session_context.get(None) is None:
+        async with session_factory() as _session:
+            yield _session
+        return
+
+    current = session()
+    owns_transaction = not (current.in_transaction() or _has_changes(current))
+    wrote_at = current.info.get(_WROTE_AT)
+    yield session
+    if (
+        owns_transaction
+        and current.in_transaction()
+        and not _has_changes(current)
+        and current.info.get(_WROTE_AT) == wrote_at
+    ):
+        # Nothing to flush, so this only ends the read transaction; with
+        # expire_on_commit=False the loaded objects stay usable
+        await current.commit()
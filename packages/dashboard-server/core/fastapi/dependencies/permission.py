@@ -10,6 +10,7 @@ from starlette import status
 from app.container import Container
 from app.user.domain.usecase.user import UserUseCase
 from core.exceptions import CustomException
+from core.helpers.permission_cache import permission_cache
 
 
 class UnauthorizedException(CustomException):
@@ -46,7 +47,11 @@ class IsAdmin(BasePermission):
         if not user_id:
             return False
 
-        return await usecase.is_admin(user_id=user_id)
+        is_admin = await permission_cache.get(user_id, "is_admin")
+        if is_admin is None:
+            is_admin = await usecase.is_admin(user_id=user_id)
+            await permission_cache.put(user_id, "is_admin", is_admin)
+        return is_admin
 
 
 class AllowAll(BasePermission):
@@ -3,9 +3,24 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 from starlette.datastructures import Headers
 from core.config import config
 from core.context import get_request_id
+from core.helpers.metrics import registry
 
 logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
 
+REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+)
+IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+
+def route_template(scope: Scope) -> str:
+    # Set by the router on match; raw paths would make label cardinality unbounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
 class AccessLogMiddleware:
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -15,7 +30,7 @@ class AccessLogMiddleware:
             await self.app(scope, receive, send)
             return
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         client_ip = scope.get("client", ("0.0.0.0", 0))[0]
         headers = Headers(scope=scope)
@@ -37,13 +52,19 @@ class AccessLogMiddleware:
                 status_code = message["status"]
             await send(message)
 
+        IN_FLIGHT.inc()
         try:
             await self.app(scope, receive, send_wrapper)
         except Exception as e:
             raise e
         finally:
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
+            IN_FLIGHT.dec()
+            route = route_template(scope)
+            REQUESTS.inc(method, route, status_code)
+            LATENCY.observe(process_time, method, route)
             
             logger.info(
-                f"{method} {path} | Status: {status_code} | IP: {client_ip} | Device: {user_agent} | Time: {process_time:.3f}s"
+                "%s %s | Status: %s | IP: %s | Device: %s | Time: %.3fs",
+                method, path, status_code, client_ip, user_agent, process_time,
             )
\ No newline at end of file
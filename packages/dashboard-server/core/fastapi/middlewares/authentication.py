@@ -1,3 +1,6 @@
+import time
+import hashlib
+
 import jwt
 from pydantic import BaseModel, Field
 from starlette.authentication import AuthenticationBackend
@@ -7,6 +10,11 @@ from starlette.middleware.authentication import (
 from starlette.requests import HTTPConnection
 
 from core.config import config
+from core.helpers.lru import MISSING, TTLCache
+from core.helpers.metrics import registry
+
+JWT_CACHE = registry.counter("jwt_cache_requests_total", "Verified-JWT cache lookups", ("result",))
+_REJECTED = object()
 
 
 class CurrentUser(BaseModel):
@@ -14,6 +22,17 @@ class CurrentUser(BaseModel):
 
 
 class AuthBackend(AuthenticationBackend):
+    """
+    Bearer JWT authentication. Verification results are cached per token
+    digest: valid tokens until their `exp` (capped at JWT_CACHE_MAX_TTL_SEC),
+    rejected ones for JWT_CACHE_NEGATIVE_TTL_SEC.
+    """
+
+    def __init__(self, cache: TTLCache | None = None):
+        if cache is None:
+            cache = TTLCache(maxsize=config.JWT_CACHE_SIZE, ttl=config.JWT_CACHE_MAX_TTL_SEC)
+        self.cache = cache
+
     async def authenticate(
         self, conn: HTTPConnection
     ) -> tuple[bool, CurrentUser | None]:
@@ -32,18 +51,37 @@ class AuthBackend(AuthenticationBackend):
         if not credentials:
             return False, current_user
 
+        digest = hashlib.blake2b(credentials.encode(), digest_size=16).digest()
+        user_id = self.cache.get(digest)
+        if user_id is not MISSING:
+            JWT_CACHE.inc("hit")
+        else:
+            JWT_CACHE.inc("miss")
+            user_id = self._verify(digest, credentials)
+
+        if user_id is _REJECTED:
+            return False, current_user
+
+        current_user.id = user_id
+        return True, current_user
+
+    def _verify(self, digest: bytes, credentials: str):
         try:
             payload = jwt.decode(
                 credentials,
                 config.JWT_SECRET_KEY,
                 algorithms=[config.JWT_ALGORITHM],
             )
-            user_id = payload.get("user_id")
         except jwt.exceptions.PyJWTError:
-            return False, current_user
+            self.cache.set(digest, _REJECTED, ttl=config.JWT_CACHE_NEGATIVE_TTL_SEC)
+            return _REJECTED
 
-        current_user.id = user_id
-        return True, current_user
+        user_id = payload.get("user_id")
+        ttl = config.JWT_CACHE_MAX_TTL_SEC
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        self.cache.set(digest, user_id, ttl=ttl)
+        return user_id
 
 
 class AuthenticationMiddleware(BaseAuthenticationMiddleware):
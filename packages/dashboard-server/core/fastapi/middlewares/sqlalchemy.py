@@ -1,22 +1,33 @@
-from uuid import uuid4
+from itertools import count
 
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from core.db.session import set_session_context, reset_session_context, session
 
+# Only needs to be unique among concurrent requests of this process
+_session_ids = count()
+
 
 class SQLAlchemyMiddleware:
+    """
+    Scopes the async_scoped_session to the request. The session itself is
+    created by the scoped registry on first use, so requests that never touch
+    the database (SSE, Redis-only /event routes) only pay for the context var.
+    """
+
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        session_id = str(uuid4())
-        context = set_session_context(session_id=session_id)
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        context = set_session_context(session_id=str(next(_session_ids)))
 
         try:
             await self.app(scope, receive, send)
-        except Exception as e:
-            raise e
         finally:
-            await session.remove()
+            if session.registry.has():
+                await session.remove()
             reset_session_context(context=context)
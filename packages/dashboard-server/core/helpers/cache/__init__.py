@@ -1,11 +1,13 @@
 from .cache_manager import Cache
 from .cache_tag import CacheTag
 from .custom_key_maker import CustomKeyMaker
-# from .redis_backend import RedisBackend
+from .redis_backend import RedisBackend
+from .tiered_backend import TieredBackend
 
 __all__ = [
     "Cache",
-    # "RedisBackend",
+    "RedisBackend",
+    "TieredBackend",
     "CustomKeyMaker",
     "CacheTag",
 ]
@@ -12,5 +12,5 @@ class BaseBackend(ABC):
         """Set"""
 
     @abstractmethod
-    async def delete_startswith(self, *, value: str) -> None:
-        """Delete starts with"""
+    async def invalidate_namespace(self, *, namespace: str) -> None:
+        """Drop every key made with `namespace` as its prefix (tag value or prefix)"""
@@ -1,13 +1,26 @@
+import asyncio
+from collections import Counter
 from functools import wraps
 
+from core.helpers.metrics import registry
+
 from .base import BaseBackend, BaseKeyMaker
 from .cache_tag import CacheTag
+from .serialization import dumps, loads
+
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total", "Cache.cached lookups by tag (or prefix) and result", ("tag", "result")
+)
 
 
 class CacheManager:
     def __init__(self):
         self.backend = None
         self.key_maker = None
+        # key -> future of the one in-flight call filling it, resolved with
+        # the serialized response
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.requests: Counter[tuple[str, str]] = Counter()
 
     def init(self, *, backend: BaseBackend, key_maker: BaseKeyMaker) -> None:
         self.backend = backend
@@ -19,7 +32,10 @@ class CacheManager:
         prefix: str | None = None,
         tag: CacheTag | None = None,
         ttl: int = 60,
+        exclude: tuple[str, ...] = (),
     ):
+        label = prefix if prefix else tag.value
+
         def _cached(function):
             @wraps(function)
             async def __cached(*args, **kwargs):
@@ -28,25 +44,75 @@ class CacheManager:
 
                 key = await self.key_maker.make(
                     function=function,
-                    prefix=prefix if prefix else tag.value,
+                    prefix=label,
+                    args=args,
+                    kwargs=kwargs,
+                    exclude=exclude,
                 )
-                cached_response = await self.backend.get(key=key)
-                if cached_response:
-                    return cached_response
+                coalesced = False
+                while True:
+                    cached_response = await self.backend.get(key=key)
+                    if cached_response is not None:
+                        self._record(label, "hit")
+                        return cached_response
 
-                response = await function(*args, **kwargs)
-                await self.backend.set(response=response, key=key, ttl=ttl)
-                return response
+                    # Single flight: concurrent misses for one key share one call
+                    inflight = self._inflight.get(key)
+                    if inflight is None:
+                        break
+                    if not coalesced:
+                        self._record(label, "coalesced")
+                        coalesced = True
+                    try:
+                        # Each waiter gets its own copy, as a backend hit would
+                        return loads(await asyncio.shield(inflight))
+                    except asyncio.CancelledError:
+                        # The leader's cancellation is not ours: look again,
+                        # and make the call ourselves if nobody else has
+                        if not inflight.cancelled() or asyncio.current_task().cancelling():
+                            raise
+
+                self._record(label, "miss")
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                try:
+                    response = await function(*args, **kwargs)
+                    future.set_result(dumps(response))
+                    await self.backend.set(response=response, key=key, ttl=ttl)
+                    return response
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except BaseException as e:
+                    if not future.done():
+                        future.set_exception(e)
+                        # Waiters re-raise it; don't warn when there were none
+                        future.exception()
+                    raise
+                finally:
+                    if self._inflight.get(key) is future:
+                        del self._inflight[key]
 
             return __cached
 
         return _cached
 
     async def remove_by_tag(self, *, tag: CacheTag) -> None:
-        await self.backend.delete_startswith(value=tag.value)
+        await self.backend.invalidate_namespace(namespace=tag.value)
 
     async def remove_by_prefix(self, *, prefix: str) -> None:
-        await self.backend.delete_startswith(value=prefix)
+        await self.backend.invalidate_namespace(namespace=prefix)
+
+    def _record(self, label: str, result: str) -> None:
+        self.requests[label, result] += 1
+        CACHE_REQUESTS.inc(label, result)
+
+    def hit_ratios(self) -> dict[str, float]:
+        """Share of lookups per tag (or prefix) answered from the backend"""
+        totals: Counter[str] = Counter()
+        for (label, _), count in self.requests.items():
+            totals[label] += count
+        return {label: self.requests[label, "hit"] / total for label, total in totals.items()}
 
 
 Cache = CacheManager()
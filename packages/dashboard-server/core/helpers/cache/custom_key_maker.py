@@ -1,18 +1,100 @@
+import dataclasses
+import hashlib
 import inspect
-from typing import Callable
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable
+
+from pydantic import BaseModel
 
 from core.helpers.cache.base import BaseKeyMaker
 
 
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _canonical(value: Any) -> Any:
+    """
+    A JSON-serializable form of `value` that is equal for equal values across
+    instances and processes. Anything without such a form raises TypeError
+    rather than falling back to repr(), whose default includes the object's
+    address and would give every call its own key.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        # Keys become their JSON text, so mixed key types sort and 1 != "1"
+        return {_dumps(_canonical(key)): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=_dumps)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonical(dataclasses.asdict(value))
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"unsupported type {type(value).__name__}")
+
+
 class CustomKeyMaker(BaseKeyMaker):
-    async def make(self, *, function: Callable, prefix: str) -> str:
-        path = f"{prefix}::{inspect.getmodule(function).__name__}.{function.__name__}"  # type: ignore
-        args = ""
+    """
+    Keys are `{prefix}::{module}.{function}` followed, when the call has
+    arguments, by a short hash of the bound argument values. Values are bound
+    against the signature with defaults applied, so f(1), f(a=1) and f() with
+    a=1 as default all map to the same key. Arguments whose values have no
+    stable form (plain objects, sessions, clients) must be excluded; they
+    raise TypeError instead of producing a key that never hits.
+    """
+
+    def __init__(self, exclude: tuple[str, ...] = ("self", "cls")):
+        self.exclude = exclude
+        self._signatures: dict[Callable, tuple[str, inspect.Signature]] = {}
+
+    def _describe(self, function: Callable) -> tuple[str, inspect.Signature]:
+        described = self._signatures.get(function)
+        if described is None:
+            path = f"{inspect.getmodule(function).__name__}.{function.__name__}"  # type: ignore
+            described = self._signatures[function] = (path, inspect.signature(function))
+        return described
 
-        for arg in inspect.signature(function).parameters.values():
-            args += arg.name
+    async def make(
+        self,
+        *,
+        function: Callable,
+        prefix: str,
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+        exclude: tuple[str, ...] = (),
+    ) -> str:
+        path, signature = self._describe(function)
+        path = f"{prefix}::{path}"
 
-        if args:
-            return f"{path}.{args}"
+        bound = signature.bind_partial(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        values = {
+            name: value
+            for name, value in bound.arguments.items()
+            if name not in self.exclude and name not in exclude
+        }
+        if not values:
+            return path
 
-        return path
+        canonical = {}
+        for name, value in values.items():
+            try:
+                canonical[name] = _canonical(value)
+            except TypeError as e:
+                raise TypeError(
+                    f"Cannot build a cache key for {path} from argument {name!r}: {e}. "
+                    "Pass it in `exclude` or use a value with a stable form."
+                ) from None
+        digest = hashlib.blake2b(_dumps(canonical).encode(), digest_size=12).hexdigest()
+        return f"{path}:{digest}"
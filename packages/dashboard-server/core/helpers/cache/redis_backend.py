@@ -1,28 +1,76 @@
-# import pickle
-# from typing import Any
+import logging
+from typing import Any
 
-# import ujson
+from redis.asyncio import Redis
 
-# from core.helpers.cache.base import BaseBackend
-# from core.helpers.redis import redis_client
+from core.config import config
+from core.helpers.cache.base import BaseBackend
+from core.helpers.cache.serialization import dumps, loads
+from core.helpers.redis import redis_client
 
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
 
-# class RedisBackend(BaseBackend):
-#     async def get(self, *, key: str) -> Any:
-#         result = await redis_client.get(key)
-#         if not result:
-#             return
+# Holds the current version of a namespace. Has no TTL, so volatile-* eviction
+# policies never drop it (which would resurrect entries of an older version).
+NAMESPACE_KEY = "cache:ns:{}"
 
-#         return ujson.loads(result)
+# Stored keys are "{namespace}@{version}::{rest}"; bumping the version orphans
+# every key of the old one, which then just expire.
+# KEYS[1]: namespace version key, ARGV[1]: namespace, ARGV[2]: "::{rest}"
+_GET_LUA = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return redis.call('GET', ARGV[1] .. '@' .. version .. ARGV[2])
+"""
 
-#     async def set(self, *, response: Any, key: str, ttl: int = 60) -> None:
-#         if isinstance(response, dict):
-#             response = ujson.dumps(response)
-#         else:
-#             response = pickle.dumps(response)
+# ARGV[3]: value, ARGV[4]: ttl
+_SET_LUA = """
+local version = redis.call('GET', KEYS[1]) or '0'
+redis.call('SET', ARGV[1] .. '@' .. version .. ARGV[2], ARGV[3], 'EX', ARGV[4])
+"""
 
-#         await redis_client.set(name=key, value=response, ex=ttl)
 
-#     async def delete_startswith(self, *, value: str) -> None:
-#         async for key in redis_client.scan_iter(f"{value}*"):
-#             await redis_client.delete(key)
+def split_key(key: str) -> tuple[str, str]:
+    namespace, sep, rest = key.partition("::")
+    return namespace, sep + rest
+
+
+class RedisBackend(BaseBackend):
+    """
+    Cache keys are grouped by namespace (the part before "::", i.e. the tag
+    value or prefix). Invalidating a namespace is a single INCR of its version
+    regardless of how many keys it holds; reads and writes resolve the
+    version server-side, so they still take one round trip.
+    """
+
+    def __init__(self, client: Redis = redis_client):
+        self.client = client
+        self._get = client.register_script(_GET_LUA)
+        self._set = client.register_script(_SET_LUA)
+
+    async def get_raw(self, *, key: str) -> bytes | None:
+        namespace, rest = split_key(key)
+        try:
+            return await self._get(keys=[NAMESPACE_KEY.format(namespace)], args=[namespace, rest])
+        except Exception as e:
+            server_logger.warning("Cache read failed for %s: %s", key, e)
+            return None
+
+    async def set_raw(self, *, data: bytes, key: str, ttl: int = 60) -> None:
+        namespace, rest = split_key(key)
+        try:
+            await self._set(keys=[NAMESPACE_KEY.format(namespace)], args=[namespace, rest, data, ttl])
+        except Exception as e:
+            server_logger.warning("Cache write failed for %s: %s", key, e)
+
+    async def get(self, *, key: str) -> Any:
+        result = await self.get_raw(key=key)
+        if result is None:
+            return None
+
+        return loads(result)
+
+    async def set(self, *, response: Any, key: str, ttl: int = 60) -> None:
+        await self.set_raw(data=dumps(response), key=key, ttl=ttl)
+
+    async def invalidate_namespace(self, *, namespace: str) -> None:
+        await self.client.incr(NAMESPACE_KEY.format(namespace))
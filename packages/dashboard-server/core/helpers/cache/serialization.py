@@ -0,0 +1,25 @@
+import pickle
+import zlib
+from typing import Any
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+COMPRESS_MIN_BYTES = 1024
+
+
+def dumps(value: Any) -> bytes:
+    """
+    One binary format for every cached value: pickle protocol 5, zlib-compressed
+    when large enough to be worth it. The first byte records which.
+    """
+    data = pickle.dumps(value, protocol=5)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(data, 1)
+    return _RAW + data
+
+
+def loads(data: bytes) -> Any:
+    header, body = data[:1], data[1:]
+    if header == _ZLIB:
+        body = zlib.decompress(body)
+    return pickle.loads(body)
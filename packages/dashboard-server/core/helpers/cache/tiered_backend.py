@@ -0,0 +1,38 @@
+from typing import Any
+
+from core.helpers.cache.base import BaseBackend
+from core.helpers.cache.redis_backend import RedisBackend
+from core.helpers.cache.serialization import dumps, loads
+from core.helpers.lru import MISSING, TTLCache
+
+
+class TieredBackend(BaseBackend):
+    """
+    In-process LRU (L1) in front of Redis (L2). L1 holds the serialized bytes,
+    so every hit returns a fresh copy that callers are free to mutate. L1 is
+    local to the worker; its short TTL bounds how long another worker's
+    invalidation can go unseen.
+    """
+
+    def __init__(self, *, l2: RedisBackend, maxsize: int, l1_ttl: float):
+        self.l1 = TTLCache(maxsize=maxsize, ttl=l1_ttl)
+        self.l2 = l2
+
+    async def get(self, *, key: str) -> Any:
+        data = self.l1.get(key)
+        if data is MISSING:
+            data = await self.l2.get_raw(key=key)
+            if data is None:
+                return None
+            self.l1.set(key, data)
+
+        return loads(data)
+
+    async def set(self, *, response: Any, key: str, ttl: int = 60) -> None:
+        data = dumps(response)
+        self.l1.set(key, data, ttl=min(ttl, self.l1.ttl))
+        await self.l2.set_raw(data=data, key=key, ttl=ttl)
+
+    async def invalidate_namespace(self, *, namespace: str) -> None:
+        self.l1.delete_startswith(f"{namespace}::")
+        await self.l2.invalidate_namespace(namespace=namespace)
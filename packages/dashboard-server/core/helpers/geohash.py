@@ -0,0 +1,84 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_M = 6_371_000.0
+# Along a meridian of the same sphere haversine_m measures on
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+# Stored precision: ~4.8m x 4.8m cells, finer than any radius we query
+PRECISION = 9
+# Upper bound on prefix ranges (OR'd LIKE clauses) per nearby query
+MAX_CELLS = 64
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(lat, lng) span in degrees of a cell at `precision`"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def covering_cells(lat: float, lng: float, radius_m: float, max_cells: int = MAX_CELLS) -> list[str]:
+    """
+    Geohash prefixes whose cells together contain every point within
+    `radius_m` of (lat, lng): the cells overlapping the circle's bounding
+    box, at the finest precision that needs no more than `max_cells` of
+    them. Empty when even coarse cells cannot narrow the search.
+    """
+    lat_lo = max(lat - radius_m / METERS_PER_DEGREE, -90.0)
+    lat_hi = min(lat + radius_m / METERS_PER_DEGREE, 90.0)
+    # Degrees of longitude shrink towards the poles; size for the poleward edge
+    lng_scale = math.cos(math.radians(max(abs(lat_lo), abs(lat_hi))))
+    lng_radius = radius_m / (METERS_PER_DEGREE * lng_scale) if lng_scale > 1e-9 else 360.0
+    lng_lo, lng_hi = (-180.0, 180.0) if lng_radius >= 180.0 else (lng - lng_radius, lng + lng_radius)
+
+    for precision in range(PRECISION, 1, -1):
+        lat_span, lng_span = cell_size(precision)
+        first_row = math.floor((lat_lo + 90.0) / lat_span)
+        rows = min(math.floor((lat_hi + 90.0) / lat_span), round(180.0 / lat_span) - 1) - first_row + 1
+        first_col = math.floor((lng_lo + 180.0) / lng_span)
+        cols = min(math.floor((lng_hi + 180.0) / lng_span) - first_col + 1, round(360.0 / lng_span))
+        if rows * cols > max_cells:
+            continue
+        cells = set()
+        for row in range(first_row, first_row + rows):
+            cell_lat = (row + 0.5) * lat_span - 90.0
+            for col in range(first_col, first_col + cols):
+                # Columns past either edge wrap around the antimeridian
+                cell_lng = ((col + 0.5) * lng_span) % 360.0 - 180.0
+                cells.add(encode(cell_lat, cell_lng, precision))
+        return sorted(cells)
+    return []
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
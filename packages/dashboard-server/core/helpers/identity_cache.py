@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from typing import Any, Hashable
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from core.helpers.lru import MISSING, TTLCache
+from core.helpers.metrics import registry
+from core.config import config
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+IDENTITY_CACHE = registry.counter(
+    "identity_cache_requests_total", "Identity cache lookups", ("cache", "result")
+)
+
+
+class IdentityCache:
+    """
+    Per-worker read-through cache of immutable entity snapshots, keyed by id
+    and looked up by id or by any of the `indexes` attributes (secondary
+    lookups go through an attribute -> id index and are checked against the
+    snapshot, so a stale index entry is just a miss).
+
+    Invalidations are local plus a pub/sub broadcast to the other workers.
+    An id stays uncacheable for `quarantine_sec` after an invalidation, so a
+    lookup served by a lagging replica cannot put the old row back.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        *,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        indexes: tuple[str, ...],
+        quarantine_sec: float,
+    ):
+        self.name = name
+        self._r = redis_client
+        self._snapshots = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._index = TTLCache(maxsize=maxsize * len(indexes), ttl=ttl)
+        self._invalidated = TTLCache(maxsize=maxsize, ttl=quarantine_sec)
+        self._indexes = indexes
+        self._channel = f"{name}:invalidate"
+        self._pending_key = f"{name}_invalidations"
+        self._task: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def get(self, id: int) -> Any | None:
+        snapshot = self._snapshots.get(id)
+        if snapshot is MISSING:
+            IDENTITY_CACHE.inc(self.name, "miss")
+            return None
+        IDENTITY_CACHE.inc(self.name, "hit")
+        return snapshot
+
+    def get_by(self, attribute: str, value: Hashable) -> Any | None:
+        id = self._index.get((attribute, value))
+        snapshot = MISSING if id is MISSING else self._snapshots.get(id)
+        if snapshot is MISSING or getattr(snapshot, attribute) != value:
+            IDENTITY_CACHE.inc(self.name, "miss")
+            return None
+        IDENTITY_CACHE.inc(self.name, "hit")
+        return snapshot
+
+    def put(self, snapshot: Any) -> None:
+        if self._invalidated.get(snapshot.id) is not MISSING:
+            return
+        self._snapshots.set(snapshot.id, snapshot)
+        for attribute in self._indexes:
+            self._index.set((attribute, getattr(snapshot, attribute)), snapshot.id)
+
+    def invalidate_local(self, id: int) -> None:
+        self._snapshots.delete(id)
+        self._invalidated.set(id, True)
+
+    async def invalidate(self, ids: set[int]) -> None:
+        for id in ids:
+            self.invalidate_local(id)
+        try:
+            async with self._r.pipeline(transaction=False) as pipe:
+                for id in ids:
+                    pipe.publish(self._channel, str(id))
+                await pipe.execute()
+        except Exception as e:
+            server_logger.error("%s cache invalidation broadcast failed for %s: %s", self.name, ids, e)
+
+    def invalidate_soon(self, ids: set[int]) -> None:
+        """Sync entry point (SQLAlchemy events); the broadcast runs as a task"""
+        for id in ids:
+            self.invalidate_local(id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            server_logger.warning("No event loop, %s cache for %s only invalidated locally", self.name, ids)
+            return
+        task = loop.create_task(self.invalidate(ids))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def invalidate_after_commit(self, session_info: dict, ids: set[int]) -> None:
+        """Queues ids on the session; they are invalidated if it commits"""
+        session_info.setdefault(self._pending_key, set()).update(ids)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._index.clear()
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._r.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    # Invalidations may have been missed while unsubscribed
+                    self.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate_local(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                server_logger.error("%s cache invalidation listener failed: %s", self.name, e)
+                await asyncio.sleep(1)
+
+    def stats(self) -> dict:
+        return self._snapshots.stats()
+
+
+def track_entity_changes(model, cache: IdentityCache) -> None:
+    """
+    Invalidates `cache` for every `model` row the ORM inserts, updates or
+    deletes, once the transaction commits. Bulk UPDATE/DELETE statements
+    bypass mapper events and must call cache.invalidate_after_commit.
+    """
+
+    def _on_change(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            cache.invalidate_after_commit(session.info, {mapper.primary_key_from_instance(target)[0]})
+
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, name, _on_change)
+
+    @event.listens_for(Session, "after_commit")
+    def _invalidate_committed(session: Session) -> None:
+        ids = session.info.pop(cache._pending_key, None)
+        if ids:
+            cache.invalidate_soon(ids)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard_rolled_back(session: Session) -> None:
+        session.info.pop(cache._pending_key, None)
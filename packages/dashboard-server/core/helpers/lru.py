@@ -0,0 +1,65 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU map whose entries also expire after a per-entry TTL. `get`
+    returns MISSING (not None) on a miss, so None can be cached as a value.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_startswith(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
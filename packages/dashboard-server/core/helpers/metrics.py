@@ -0,0 +1,193 @@
+import threading
+from bisect import bisect_left
+from typing import Callable
+
+# Seconds; covers sub-millisecond Redis calls up to slow S3 uploads
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Metric):
+    """
+    Either set directly, or backed by a `callback` evaluated at scrape time that
+    returns a number, or a {label values tuple: number} dict for labelled gauges.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[tuple, float]] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, *labels) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        values = self._values
+        if self._callback is not None:
+            result = self._callback()
+            values = result if isinstance(result, dict) else {(): result}
+        lines = super().render()
+        for labels, value in list(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, hits in zip((*self.buckets, float("inf")), series[:-1]):
+                cumulative += hits
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process metric registry rendered in the Prometheus text exposition
+    format. Metric constructors are get-or-create, so modules can declare the
+    metrics they use at import time.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[tuple, float]] | None = None,
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames, callback)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.config import config
+from core.helpers.metrics import registry
+
+ALGORITHM = "pbkdf2_sha256"
+
+PASSWORD_QUEUE = registry.histogram(
+    "password_hash_queue_seconds",
+    "Time a hash/verify job waits for a slot and a pool worker",
+    ("operation",),
+)
+PASSWORD_WORK = registry.histogram(
+    "password_hash_seconds",
+    "Time a pool worker spends hashing",
+    ("operation",),
+)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(value: str) -> bytes:
+    return base64.b64decode(value + "=" * (-len(value) % 4), validate=True)
+
+
+def _parse(encoded: str) -> tuple[int, bytes, bytes] | None:
+    """(iterations, salt, digest) of a stored hash, or None if it is not a well-formed one"""
+    parts = encoded.split("$")
+    if len(parts) != 4 or parts[0] != ALGORITHM or not (parts[1].isascii() and parts[1].isdigit()):
+        return None
+    try:
+        salt, digest = _unb64(parts[2]), _unb64(parts[3])
+    except (binascii.Error, ValueError):
+        return None
+    iterations = int(parts[1])
+    if iterations == 0 or not salt or not digest:
+        return None
+    return iterations, salt, digest
+
+
+# Module-level so they pickle into pool workers. Each returns its own
+# wall-clock start and duration, so the parent can split queue and work time.
+
+def _hash_job(password: str, salt: bytes, iterations: int) -> tuple[str, float, float]:
+    started = time.time()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    encoded = f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+    return encoded, started, time.time() - started
+
+
+def _verify_job(password: str, iterations: int, salt: bytes, expected: bytes) -> tuple[bool, float, float]:
+    started = time.time()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return hmac.compare_digest(digest, expected), started, time.time() - started
+
+
+class PasswordHasher:
+    """
+    PBKDF2-SHA256 hashing in a process pool, off the event loop. At most
+    `max_pending` jobs per server process are submitted at a time; the rest
+    wait on a semaphore, and that wait is part of the queue time metric.
+
+    Hashes are stored as `pbkdf2_sha256$<iterations>$<salt>$<digest>`; a
+    value with that prefix that does not parse never verifies. Anything else
+    is treated as a legacy plain-text password: it still verifies, and
+    `needs_rehash` reports it so it can be upgraded on login. Every path
+    costs one hash, so timing does not tell them apart.
+    """
+
+    def __init__(self, *, iterations: int, max_workers: int, max_pending: int):
+        self.iterations = iterations
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        # Verified when the user does not exist, so both paths cost one hash
+        self._dummy: str | None = None
+
+    def start(self) -> None:
+        if self._pool is None:
+            # spawn: forking would copy the server's threads and event loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._slots = None
+
+    async def _run(self, operation: str, job, *args):
+        self.start()
+        submitted = time.time()
+        self.in_flight += 1
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                result, started, elapsed = await loop.run_in_executor(self._pool, job, *args)
+        finally:
+            self.in_flight -= 1
+        PASSWORD_QUEUE.observe(max(started - submitted, 0.0), operation)
+        PASSWORD_WORK.observe(elapsed, operation)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash_job, password, os.urandom(16), self.iterations)
+
+    async def _verify_dummy(self, password: str) -> None:
+        if self._dummy is None:
+            self._dummy = await self.hash(secrets.token_hex(8))
+        await self._run("verify", _verify_job, password, *_parse(self._dummy))
+
+    async def verify(self, password: str, encoded: str | None) -> bool:
+        if encoded is None:
+            await self._verify_dummy(password)
+            return False
+        if not encoded.startswith(f"{ALGORITHM}$"):
+            await self._verify_dummy(password)
+            return hmac.compare_digest(password.encode(), encoded.encode())
+        parsed = _parse(encoded)
+        if parsed is None:
+            await self._verify_dummy(password)
+            return False
+        return await self._run("verify", _verify_job, password, *parsed)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parsed = _parse(encoded)
+        return parsed is None or parsed[0] != self.iterations
+
+
+password_hasher = PasswordHasher(
+    iterations=config.PASSWORD_HASH_ITERATIONS,
+    max_workers=config.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=config.PASSWORD_HASH_MAX_PENDING,
+)
+
+registry.gauge(
+    "password_hash_in_flight",
+    "Hash/verify jobs submitted or waiting for a slot",
+    callback=lambda: password_hasher.in_flight,
+)
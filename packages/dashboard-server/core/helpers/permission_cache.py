@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from redis.asyncio import Redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from core.config import config
+from core.helpers.lru import MISSING, TTLCache
+from core.helpers.metrics import registry
+from core.redis_db import r
+
+server_logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+
+INVALIDATION_CHANNEL = "permission:invalidate"
+PERMISSION_CACHE = registry.counter("permission_cache_requests_total", "Permission cache lookups", ("result",))
+
+_PENDING_KEY = "permission_invalidations"
+
+
+class PermissionCache:
+    """
+    Per-user permission results: a local TTLCache (L1) in front of Redis (L2),
+    shared by all workers. Invalidations drop the local entry and the Redis key,
+    and are pushed to the other workers over pub/sub. Redis failures degrade
+    to cache misses.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        *,
+        maxsize: int,
+        l1_ttl: float,
+        l2_ttl: int,
+        permissions: tuple[str, ...],
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        self._r = redis_client
+        self._l1 = TTLCache(maxsize=maxsize, ttl=l1_ttl)
+        self._l2_ttl = l2_ttl
+        self._channel = channel
+        self._permissions = permissions
+        self._task: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(user_id: int, permission: str) -> str:
+        return f"permission:{user_id}:{permission}"
+
+    async def get(self, user_id: int, permission: str) -> bool | None:
+        key = self._key(user_id, permission)
+        value = self._l1.get(key)
+        if value is not MISSING:
+            PERMISSION_CACHE.inc("l1_hit")
+            return value
+
+        try:
+            raw = await self._r.get(key)
+        except Exception as e:
+            server_logger.warning("Permission cache read failed: %s", e)
+            raw = None
+        if raw is None:
+            PERMISSION_CACHE.inc("miss")
+            return None
+
+        PERMISSION_CACHE.inc("l2_hit")
+        value = raw == "1"
+        self._l1.set(key, value)
+        return value
+
+    async def put(self, user_id: int, permission: str, value: bool) -> None:
+        key = self._key(user_id, permission)
+        self._l1.set(key, value)
+        try:
+            await self._r.set(key, "1" if value else "0", ex=self._l2_ttl)
+        except Exception as e:
+            server_logger.warning("Permission cache write failed: %s", e)
+
+    def invalidate_local(self, user_id: int) -> None:
+        for permission in self._permissions:
+            self._l1.delete(self._key(user_id, permission))
+
+    async def invalidate(self, user_ids: set[int]) -> None:
+        for user_id in user_ids:
+            self.invalidate_local(user_id)
+        try:
+            keys = [self._key(u, p) for u in user_ids for p in self._permissions]
+            async with self._r.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                for user_id in user_ids:
+                    pipe.publish(self._channel, str(user_id))
+                await pipe.execute()
+        except Exception as e:
+            server_logger.error("Permission cache invalidation failed for %s: %s", user_ids, e)
+
+    def invalidate_soon(self, user_ids: set[int]) -> None:
+        """Sync entry point (SQLAlchemy events); the Redis part runs as a task"""
+        for user_id in user_ids:
+            self.invalidate_local(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            server_logger.warning("No event loop, permission cache for %s only invalidated locally", user_ids)
+            return
+        task = loop.create_task(self.invalidate(user_ids))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._r.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    # Invalidations may have been missed while unsubscribed
+                    self._l1.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate_local(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                server_logger.error("Permission invalidation listener failed: %s", e)
+                await asyncio.sleep(1)
+
+    def stats(self) -> dict:
+        return self._l1.stats()
+
+
+permission_cache = PermissionCache(
+    r,
+    maxsize=config.PERMISSION_CACHE_SIZE,
+    l1_ttl=config.PERMISSION_CACHE_L1_TTL_SEC,
+    l2_ttl=config.PERMISSION_CACHE_L2_TTL_SEC,
+    permissions=("is_admin",),
+)
+
+
+def track_permission_changes(attribute) -> None:
+    """
+    Invalidates the cached permissions of any row whose `attribute` is changed
+    through the ORM, once the change is committed. Bulk UPDATE statements
+    bypass attribute events and must call permission_cache.invalidate directly.
+    """
+
+    @event.listens_for(attribute, "set")
+    def _on_set(target, value, oldvalue, initiator):
+        # Identity rather than target.id: reading an expired id would emit a load
+        identity = inspect(target).identity
+        if value == oldvalue or identity is None:
+            return
+        user_id = identity[0]
+        session = object_session(target)
+        if session is None:
+            permission_cache.invalidate_soon({user_id})
+            return
+        session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids:
+        permission_cache.invalidate_soon(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
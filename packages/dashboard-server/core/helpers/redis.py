@@ -1,5 +1,59 @@
-# from redis import asyncio as redis
+import time
 
-# from core.config import config
+from redis import asyncio as redis
+from redis.asyncio.client import Pipeline
 
-# redis_client = redis.from_url(url=f"redis://{config.REDIS_HOST}", decode_responses=True)
+from core.config import config
+from core.helpers.metrics import registry
+
+REDIS_LATENCY = registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis round-trip latency by client and command (blocking reads include their wait)",
+    ("client", "command"),
+)
+
+
+class TimedPipeline(Pipeline):
+    label = "default"
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            command = "MULTI" if self.is_transaction else "PIPELINE"
+            REDIS_LATENCY.observe(time.perf_counter() - start, self.label, command)
+
+
+class TimedRedis(redis.Redis):
+    """
+    Records the round trip of every command it sends, including script calls
+    (EVALSHA) and pipelines, so Redis timings are taken here once rather
+    than around individual call sites.
+    """
+
+    def __init__(self, *args, label: str = "default", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label = label
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_LATENCY.observe(time.perf_counter() - start, self.label, str(args[0]).upper())
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> TimedPipeline:
+        pipe = TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+        pipe.label = self.label
+        return pipe
+
+
+# Binary-safe client for cached values; core.redis_db.r decodes responses to str
+redis_client = TimedRedis(
+    host=config.REDIS_URL,
+    port=config.REDIS_PORT,
+    username="default",
+    password=config.REDIS_PASSWORD,
+    label="cache",
+)
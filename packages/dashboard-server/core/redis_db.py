@@ -1,4 +1,11 @@
-import redis.asyncio as redis
 from core.config import config
+from core.helpers.redis import TimedRedis
 
-r = redis.Redis(host=config.REDIS_URL, port=config.REDIS_PORT ,decode_responses=True, username="default", password=config.REDIS_PASSWORD)
\ No newline at end of file
+r = TimedRedis(
+    host=config.REDIS_URL,
+    port=config.REDIS_PORT,
+    decode_responses=True,
+    username="default",
+    password=config.REDIS_PASSWORD,
+    label="app",
+)
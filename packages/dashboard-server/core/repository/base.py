@@ -1,20 +1,52 @@
-from typing import TypeVar, Type, Generic
+from typing import Any, Iterable, Sequence, TypeVar, Type, Generic
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import bindparam, case, select, tuple_, update, delete, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 
+from core.config import config
 from core.db.session import Base, session
 from core.repository.enum import SynchronizeSessionEnum
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+_UPSERT_DIALECTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def chunked(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class BaseRepo(Generic[ModelType]):
+    """
+    Single-row helpers plus bulk variants that emit one multi-row statement
+    per `chunk_size` rows (default DB_BULK_CHUNK_SIZE), which keeps statements
+    under the server's placeholder and packet limits. Rows passed to
+    bulk_insert/bulk_upsert are keyed by column name and must all have the
+    same keys: the column list of a multi-row VALUES comes from the first row.
+    They are table-level inserts, because ORM-enabled multi-row inserts do not
+    support context-sensitive column defaults.
+    """
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
     async def get_by_id(self, id: int) -> ModelType | None:
         query = select(self.model).where(self.model.id == id)
-        return await session.execute(query).scalars().first()
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    async def get_by_ids(self, ids: Iterable[int], chunk_size: int | None = None) -> list[ModelType]:
+        """Rows for the given ids in no particular order; missing ids are skipped"""
+        rows = []
+        for chunk in chunked(list(dict.fromkeys(ids)), chunk_size or config.DB_BULK_CHUNK_SIZE):
+            result = await session.execute(select(self.model).where(self.model.id.in_(chunk)))
+            rows.extend(result.scalars().all())
+        return rows
 
     async def update_by_id(
         self,
@@ -30,6 +62,36 @@ class BaseRepo(Generic[ModelType]):
         )
         await session.execute(query)
 
+    async def bulk_update_by_ids(
+        self,
+        params_by_id: dict[int, dict[str, Any]],
+        chunk_size: int | None = None,
+        synchronize_session: SynchronizeSessionEnum = False,
+    ) -> None:
+        """
+        Per-row values in one UPDATE per chunk: each column is set from a
+        CASE on id, falling back to its current value for rows that do not
+        change it.
+        """
+        ids = list(params_by_id)
+        for chunk in chunked(ids, chunk_size or config.DB_BULK_CHUNK_SIZE):
+            columns = dict.fromkeys(key for id in chunk for key in params_by_id[id])
+            values = {
+                column: case(
+                    {id: params_by_id[id][column] for id in chunk if column in params_by_id[id]},
+                    value=self.model.id,
+                    else_=getattr(self.model, column),
+                )
+                for column in columns
+            }
+            query = (
+                update(self.model)
+                .where(self.model.id.in_(chunk))
+                .values(values)
+                .execution_options(synchronize_session=synchronize_session)
+            )
+            await session.execute(query)
+
     async def delete(self, model: ModelType) -> None:
         await session.delete(model)
 
@@ -46,5 +108,99 @@ class BaseRepo(Generic[ModelType]):
         await session.execute(query)
 
     async def save(self, model: ModelType) -> ModelType:
-        saved = await session.add(model)
-        return saved
+        session.add(model)
+        return model
+
+    async def bulk_insert(self, rows: Sequence[dict[str, Any]], chunk_size: int | None = None) -> None:
+        for chunk in chunked(rows, chunk_size or config.DB_BULK_CHUNK_SIZE):
+            await session.execute(insert(self.model.__table__).values(list(chunk)))
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[dict[str, Any]],
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> None:
+        """
+        Inserts rows, updating `update_columns` (default: every non primary
+        key column in the rows) when one collides on the primary key, or on
+        MySQL on any unique key. With no columns to update, collisions are
+        skipped. Dialects without a native upsert get a select-then-write
+        fallback (see _upsert_by_lookup).
+        """
+        if not rows:
+            return
+        dialect = session.get_bind(clause=insert(self.model)).dialect.name
+        primary_key = [column.name for column in self.model.__table__.primary_key]
+        if update_columns is None:
+            update_columns = [key for key in rows[0] if key not in primary_key]
+
+        dialect_insert = _UPSERT_DIALECTS.get(dialect)
+        if dialect_insert is None:
+            await self._upsert_by_lookup(rows, primary_key, update_columns, chunk_size)
+            return
+
+        for chunk in chunked(rows, chunk_size or config.DB_BULK_CHUNK_SIZE):
+            stmt = dialect_insert(self.model.__table__).values(list(chunk))
+            if not update_columns:
+                stmt = stmt.prefix_with("IGNORE") if dialect == "mysql" else stmt.on_conflict_do_nothing()
+            elif dialect == "mysql":
+                stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+            else:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=primary_key,
+                    set_={c: stmt.excluded[c] for c in update_columns},
+                )
+            await session.execute(stmt)
+
+    async def _upsert_by_lookup(
+        self,
+        rows: Sequence[dict[str, Any]],
+        primary_key: list[str],
+        update_columns: Sequence[str],
+        chunk_size: int | None,
+    ) -> None:
+        """
+        Portable upsert, per chunk: one SELECT for the keys that already exist,
+        one multi-row INSERT for the rest and one executemany UPDATE for the
+        existing ones. Collisions are matched on the primary key only, and a
+        row inserted concurrently between the SELECT and the INSERT still
+        raises IntegrityError.
+        """
+        table = self.model.__table__
+        key_columns = [table.c[name] for name in primary_key]
+        for chunk in chunked(rows, chunk_size or config.DB_BULK_CHUNK_SIZE):
+            # Rows without a full key are new; for repeated keys the last row wins
+            keyed = {}
+            unkeyed = []
+            for row in chunk:
+                if all(row.get(name) is not None for name in primary_key):
+                    keyed[tuple(row[name] for name in primary_key)] = row
+                else:
+                    unkeyed.append(row)
+
+            existing = set()
+            if keyed:
+                if len(key_columns) == 1:
+                    condition = key_columns[0].in_([key[0] for key in keyed])
+                else:
+                    condition = tuple_(*key_columns).in_(list(keyed))
+                result = await session.execute(select(*key_columns).where(condition))
+                existing = {tuple(row) for row in result.all()}
+
+            # Separate statements: a multi-row VALUES takes its columns from the first row
+            for new_rows in (unkeyed, [row for key, row in keyed.items() if key not in existing]):
+                if new_rows:
+                    await session.execute(insert(table).values(new_rows))
+
+            changed = [row for key, row in keyed.items() if key in existing]
+            if changed and update_columns:
+                # SET comes from the parameter names, so keys bind under another name
+                stmt = update(table).where(*(column == bindparam(f"_key_{column.name}") for column in key_columns))
+                await session.execute(
+                    stmt,
+                    [
+                        {**{f"_key_{name}": row[name] for name in primary_key}, **{c: row[c] for c in update_columns}}
+                        for row in changed
+                    ],
+                )
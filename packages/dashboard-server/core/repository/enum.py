@@ -1,7 +1,4 @@
-from pydantic import BaseModel
+from typing import Literal
 
-
-class SynchronizeSessionEnum(BaseModel):
-    FETCH = "fetch"
-    EVALUATE = "evaluate"
-    FALSE = False
+# Values accepted by the synchronize_session execution option
+SynchronizeSessionEnum = Literal["fetch", "evaluate", False]
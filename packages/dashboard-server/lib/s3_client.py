@@ -1,8 +1,15 @@
 import boto3
+from botocore.config import Config
 from core.config import config
 
 s3_client = boto3.client(
     "s3",
+    endpoint_url=config.S3_ENDPOINT_URL,
     aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-)
\ No newline at end of file
+    aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+    config=Config(
+        connect_timeout=config.S3_TIMEOUT_SEC,
+        read_timeout=config.S3_TIMEOUT_SEC,
+        retries={"max_attempts": 2},
+    ),
+)
@@ -0,0 +1,55 @@
+"""user geohash
+
+Revision ID: 3b7e1c9d2f40
+Revises: 59628dea39ff
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from core.helpers import geohash
+
+
+# revision identifiers, used by Alembic.
+revision = "3b7e1c9d2f40"
+down_revision = "59628dea39ff"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+def upgrade():
+    op.add_column("user", sa.Column("geohash", sa.String(length=geohash.PRECISION), nullable=True))
+
+    user = sa.table(
+        "user",
+        sa.column("id", sa.BigInteger),
+        sa.column("lat", sa.Float),
+        sa.column("lng", sa.Float),
+        sa.column("geohash", sa.String),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(user.c.id, user.c.lat, user.c.lng)
+            .where(user.c.id > last_id, user.c.lat.is_not(None), user.c.lng.is_not(None))
+            .order_by(user.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.update(user).where(user.c.id == sa.bindparam("row_id")).values(geohash=sa.bindparam("hash")),
+            [{"row_id": id, "hash": geohash.encode(lat, lng)} for id, lat, lng in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index("ix_user_geohash", "user", ["geohash"])
+
+
+def downgrade():
+    op.drop_index("ix_user_geohash", table_name="user")
+    op.drop_column("user", "geohash")
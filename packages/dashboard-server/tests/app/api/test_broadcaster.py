@@ -0,0 +1,268 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.broadcaster import (
+    ClientStream,
+    EventBroadcaster,
+    OverflowPolicy,
+    SSE_DROPPED,
+    ReplayGap,
+    is_stream_id,
+    sse_events,
+    stream_id_key,
+)
+
+
+def make_broadcaster(entries: list | None = None, queue_size: int = 2, listeners: int = 0) -> EventBroadcaster:
+    """`entries` are appended once `listeners` clients are connected"""
+    reads = [[("dashboard:stream", entries)]] if entries else []
+
+    async def xread(*args, **kwargs):
+        while broadcaster.client_count < listeners:
+            await asyncio.sleep(0.01)
+        if reads:
+            return reads.pop(0)
+        await asyncio.Event().wait()
+
+    redis_mock = MagicMock()
+    redis_mock.xrevrange = AsyncMock(return_value=[])
+    redis_mock.xread = xread
+    redis_mock.xrange = AsyncMock()
+    broadcaster = EventBroadcaster(redis_mock, queue_size=queue_size)
+    return broadcaster
+
+
+@pytest.mark.asyncio
+async def test_listen_tracks_client_count():
+    # Given
+    broadcaster = make_broadcaster()
+
+    # When
+    async with broadcaster.listen():
+        async with broadcaster.listen():
+            sut = broadcaster.client_count
+
+    # Then
+    assert sut == 2
+    assert broadcaster.client_count == 0
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_single_reader_fans_out():
+    # Given
+    broadcaster = make_broadcaster(entries=[("1-0", {"data": "card"})], listeners=2)
+
+    # When
+    async with broadcaster.listen() as client_1, broadcaster.listen() as client_2:
+        await asyncio.wait_for(asyncio.gather(client_1.wait(1), client_2.wait(1)), 1)
+        sut = client_1.drain(10) + client_2.drain(10)
+
+    # Then
+    assert sut == [("1-0", "card"), ("1-0", "card")]
+    broadcaster._r.xrevrange.assert_awaited_once()
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_entry_appended_after_replay_reaches_a_new_client():
+    # Given
+    stream = [("1-0", {"data": "old"})]
+
+    async def xrevrange(*args, count):
+        # The reader is slow to fix its starting id
+        await asyncio.sleep(0.05)
+        return stream[-1:]
+
+    async def xrange(*args, min="-", count):
+        after = stream_id_key(min.lstrip("(")) if min != "-" else (-1, -1)
+        return [entry for entry in stream if stream_id_key(entry[0]) > after][:count]
+
+    async def xread(streams, **kwargs):
+        (last_id,) = streams.values()
+        while True:
+            entries = [entry for entry in stream if stream_id_key(entry[0]) > stream_id_key(last_id)]
+            if entries:
+                return [("dashboard:stream", entries)]
+            await asyncio.sleep(0.01)
+
+    redis_mock = MagicMock()
+    redis_mock.xrevrange = xrevrange
+    redis_mock.xrange = xrange
+    redis_mock.xread = xread
+    broadcaster = EventBroadcaster(redis_mock)
+
+    # When
+    async with broadcaster.listen() as client:
+        replayed = await broadcaster.replay(after="1-0", limit=10)
+        stream.append(("2-0", {"data": "new"}))
+        delivered = await client.wait(1)
+        sut = client.drain(10)
+
+    # Then
+    assert replayed == []
+    assert delivered
+    assert sut == [("2-0", "new")]
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_drops_oldest_when_full():
+    # Given
+    broadcaster = make_broadcaster(queue_size=2)
+
+    async with broadcaster.listen() as client:
+        # When
+        for entry_id in ("1-0", "2-0", "3-0"):
+            broadcaster.dispatch(entry_id, "card")
+
+        # Then
+        assert [entry_id for entry_id, _ in client.drain(10)] == ["2-0", "3-0"]
+        assert client.dropped == 1
+    assert broadcaster.dropped == 1
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_backlog_and_drops_are_reported_while_clients_are_connected():
+    # Given
+    broadcaster = make_broadcaster(queue_size=2)
+    dropped_before = SSE_DROPPED.value()
+
+    async with broadcaster.listen() as slow, broadcaster.listen():
+        # When
+        for entry_id in ("1-0", "2-0", "3-0"):
+            broadcaster.dispatch(entry_id, "card")
+        slow.drain(1)
+        sut = broadcaster.stats()
+        dropped = SSE_DROPPED.value() - dropped_before
+
+    # Then
+    assert sut["backlog"] == 3
+    assert sut["max_lag"] == 2
+    assert dropped == 2
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_client_stream_resync_policy():
+    # Given
+    client = ClientStream(maxsize=2, policy=OverflowPolicy.RESYNC)
+
+    # When
+    for entry_id in ("1-0", "2-0", "3-0"):
+        client.offer(entry_id, "card")
+
+    # Then
+    assert client.take_resync() is True
+    assert client.take_resync() is False
+    assert client.drain(10) == [("3-0", "card")]
+    assert client.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_sse_events_heartbeat_when_idle():
+    # Given
+    client = ClientStream(maxsize=10)
+    events = sse_events(client, heartbeat_sec=0.01)
+
+    # When
+    sut = await asyncio.wait_for(events.__anext__(), 1)
+
+    # Then
+    assert sut == ": ping\n\n"
+
+
+@pytest.mark.asyncio
+async def test_sse_events_batches_within_window():
+    # Given
+    client = ClientStream(maxsize=10)
+    for entry_id in ("1-0", "2-0", "3-0"):
+        client.offer(entry_id, "card")
+    events = sse_events(client, last_sent=(1, 0), heartbeat_sec=1, batch_window_ms=1)
+
+    # When
+    sut = await asyncio.wait_for(events.__anext__(), 1)
+
+    # Then
+    assert sut == "id: 2-0\ndata: card\n\nid: 3-0\ndata: card\n\n"
+
+
+@pytest.mark.asyncio
+async def test_sse_events_sends_resync_first():
+    # Given
+    client = ClientStream(maxsize=1, policy=OverflowPolicy.RESYNC)
+    client.offer("1-0", "a")
+    client.offer("2-0", "b")
+    events = sse_events(client, heartbeat_sec=1)
+
+    # When
+    sut = await asyncio.wait_for(events.__anext__(), 1)
+
+    # Then
+    assert sut == "event: resync\ndata: {}\n\nid: 2-0\ndata: b\n\n"
+
+
+@pytest.mark.asyncio
+async def test_replay():
+    # Given
+    broadcaster = make_broadcaster()
+    broadcaster._r.xrange.side_effect = [
+        [("5-0", {"data": "a"})],
+        [("6-0", {"data": "b"}), ("7-0", {"data": "c"})],
+    ]
+
+    # When
+    sut = await broadcaster.replay(after="5-0", limit=2)
+
+    # Then
+    assert sut == [("6-0", "b"), ("7-0", "c")]
+    broadcaster._r.xrange.assert_awaited_with("dashboard:stream", min="(5-0", count=3)
+
+
+@pytest.mark.asyncio
+async def test_replay_trimmed():
+    # Given
+    broadcaster = make_broadcaster()
+    broadcaster._r.xrange.return_value = [("9-0", {"data": "a"})]
+
+    # When, Then
+    with pytest.raises(ReplayGap):
+        await broadcaster.replay(after="5-0", limit=10)
+
+
+@pytest.mark.asyncio
+async def test_replay_too_far_behind():
+    # Given
+    broadcaster = make_broadcaster()
+    broadcaster._r.xrange.side_effect = [
+        [("5-0", {"data": "a"})],
+        [("6-0", {"data": "b"}), ("7-0", {"data": "c"})],
+    ]
+
+    # When, Then
+    with pytest.raises(ReplayGap):
+        await broadcaster.replay(after="5-0", limit=1)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1700000000000-0", True),
+        ("1700000000000", True),
+        (f"1-{2**64 - 1}", True),
+        ("abc", False),
+        (None, False),
+        ("1--5", False),
+        (" 5", False),
+        ("5\n", False),
+        ("１２", False),
+        (f"1-{2**64}", False),
+        (f"{2**64}", False),
+        (f"{2**64 - 1}-{2**64 - 1}", False),
+    ],
+)
+def test_is_stream_id(value, expected):
+    assert is_stream_id(value) is expected
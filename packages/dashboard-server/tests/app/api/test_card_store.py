@@ -0,0 +1,215 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from app.api.card_store import (
+    ACTIVE_CHATS_KEY,
+    CARD_CHATS_KEY,
+    COMMANDS_CHANNEL,
+    INDEX_BACKFILLED_KEY,
+    INDEX_KEY,
+    INDEX_KEYS,
+    ITEMS_KEY,
+    OMIT_KEY,
+    CardStore,
+    action_index_key,
+    card_score,
+    decode_cursor,
+    urgency_index_key,
+)
+
+
+def make_card_store() -> CardStore:
+    redis_mock = Mock()
+    redis_mock.register_script.side_effect = lambda _: AsyncMock()
+    return CardStore(redis_mock)
+
+
+@pytest.mark.asyncio
+async def test_consume_for_reply():
+    # Given
+    card_store = make_card_store()
+    card_store._reply.return_value = '{"id": "card"}'
+
+    # When
+    sut = await card_store.consume_for_reply(card_id="card", chat_id=1, command="{}")
+
+    # Then
+    assert sut == '{"id": "card"}'
+    card_store._reply.assert_awaited_once_with(
+        keys=[ITEMS_KEY, ACTIVE_CHATS_KEY, CARD_CHATS_KEY, *INDEX_KEYS],
+        args=["card", "1", COMMANDS_CHANNEL, "{}"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_mute():
+    # Given
+    card_store = make_card_store()
+    card_store._mute.return_value = 1
+
+    # When
+    sut = await card_store.mute(card_id="card", chat_id=1)
+
+    # Then
+    assert sut is True
+    card_store._mute.assert_awaited_once_with(
+        keys=[ITEMS_KEY, ACTIVE_CHATS_KEY, CARD_CHATS_KEY, OMIT_KEY, *INDEX_KEYS],
+        args=["card", "1"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_card():
+    # Given
+    card_store = make_card_store()
+    card_store._delete.return_value = 0
+
+    # When
+    sut = await card_store.delete(card_id="card")
+
+    # Then
+    assert sut is False
+
+
+@pytest.mark.asyncio
+async def test_latency_recorded_on_error():
+    # Given
+    card_store = make_card_store()
+    card_store._delete.side_effect = ConnectionError
+
+    # When
+    with pytest.raises(ConnectionError):
+        await card_store.delete(card_id="card")
+
+    # Then
+    snapshot = card_store.latency_snapshot()
+    assert snapshot["delete"]["count"] == 1
+    assert snapshot["reply"]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_page_first_page():
+    # Given
+    card_store = make_card_store()
+    card_store._page.return_value = ["1700000000.5", "b", '{"id": "a"}', '{"id": "b"}']
+
+    # When
+    cards, next_cursor = await card_store.page(limit=2)
+
+    # Then
+    assert cards == ['{"id": "a"}', '{"id": "b"}']
+    assert next_cursor == "1700000000.5:b"
+    card_store._page.assert_awaited_once_with(
+        keys=[INDEX_KEY, ITEMS_KEY],
+        args=["", "", 2, 40],
+    )
+
+
+@pytest.mark.asyncio
+async def test_page_with_filters_and_cursor():
+    # Given
+    card_store = make_card_store()
+    card_store._page.return_value = [None, None]
+
+    # When
+    cards, next_cursor = await card_store.page(
+        limit=10,
+        cursor="1700000000.5:b",
+        urgency="high",
+        suggested_action="reply",
+    )
+
+    # Then
+    assert cards == []
+    assert next_cursor is None
+    card_store._page.assert_awaited_once_with(
+        keys=[urgency_index_key("high"), ITEMS_KEY, action_index_key("reply")],
+        args=["1700000000.5", "b", 10, 200],
+    )
+
+
+@pytest.mark.asyncio
+async def test_all_walks_every_page():
+    # Given
+    card_store = make_card_store()
+    card_store._page.side_effect = [
+        ["1700000000.5", "b", '{"id": "a"}', '{"id": "b"}'],
+        [None, None, '{"id": "c"}'],
+    ]
+
+    # When
+    sut = await card_store.all(urgency="high")
+
+    # Then
+    assert sut == ['{"id": "a"}', '{"id": "b"}', '{"id": "c"}']
+    assert card_store._page.await_args_list[1].kwargs["args"][:2] == ["1700000000.5", "b"]
+
+
+def make_backfill_store(*, backfilled: bool) -> tuple[CardStore, Mock]:
+    card = {"timestamp": "2024-01-01T00:00:00+00:00", "urgency": "high", "chat_id": 7}
+
+    async def hscan_iter(key):
+        yield "card", json.dumps(card)
+
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    pipeline = MagicMock()
+    pipeline.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline.__aexit__ = AsyncMock(return_value=False)
+
+    redis_mock = Mock()
+    redis_mock.register_script.side_effect = lambda _: AsyncMock()
+    redis_mock.exists = AsyncMock(side_effect=lambda key: int(backfilled and key == INDEX_BACKFILLED_KEY))
+    redis_mock.hscan_iter = hscan_iter
+    redis_mock.pipeline.return_value = pipeline
+    return CardStore(redis_mock), pipe
+
+
+@pytest.mark.asyncio
+async def test_ensure_index_backfills_until_marked():
+    # Given
+    # The tele-bot may already have created INDEX_KEY
+    card_store, pipe = make_backfill_store(backfilled=False)
+
+    # When
+    sut = await card_store.ensure_index()
+
+    # Then
+    assert sut == 1
+    pipe.zadd.assert_any_call(INDEX_KEY, {"card": 1704067200.0})
+    pipe.zadd.assert_any_call(urgency_index_key("high"), {"card": 1704067200.0})
+    pipe.set.assert_called_once_with(INDEX_BACKFILLED_KEY, "1")
+
+
+@pytest.mark.asyncio
+async def test_ensure_index_skips_once_marked():
+    # Given
+    card_store, pipe = make_backfill_store(backfilled=True)
+
+    # When
+    sut = await card_store.ensure_index()
+
+    # Then
+    assert sut == 0
+    pipe.zadd.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    ["2024-01-01T09:00:00+09:00", "2024-01-01T00:00:00+00:00", "2024-01-01T00:00:00"],
+)
+def test_card_score_is_utc_epoch_seconds(timestamp):
+    # When
+    sut = card_score(timestamp)
+
+    # Then
+    assert sut == 1704067200.0
+
+
+@pytest.mark.parametrize("cursor", ["abc", "123", "abc:def", "123:", "nan:a", "inf:a", "-inf:a"])
+def test_decode_cursor_malformed(cursor):
+    # When, Then
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
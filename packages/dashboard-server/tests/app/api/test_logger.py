@@ -0,0 +1,223 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.api.logger import TrainingLogWriter
+
+
+def make_writer(tmp_path, collection: Mock, **kwargs) -> TrainingLogWriter:
+    options = {
+        "batch_size": 2,
+        "flush_interval": 0.01,
+        "max_queue": 10,
+        "spill_path": str(tmp_path / "spill.jsonl"),
+    }
+    options.update(kwargs)
+    writer = TrainingLogWriter(**options)
+    writer._collection = lambda: collection
+    return writer
+
+
+async def wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def drain(executor: ThreadPoolExecutor) -> None:
+    """Waits for the jobs already queued on a single-thread executor"""
+    await asyncio.get_running_loop().run_in_executor(executor, lambda: None)
+
+
+def make_entry(reply: str = "ok") -> dict:
+    return {
+        "timestamp": datetime(2026, 1, 1),
+        "chat_history": [],
+        "chosen_reply": [reply],
+        "metadata": {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_log_flushes_in_batches(tmp_path):
+    # Given
+    collection = Mock()
+    writer = make_writer(tmp_path, collection)
+
+    # When
+    for _ in range(3):
+        writer.log(make_entry())
+    await wait_until(lambda: collection.insert_many.call_count == 2)
+
+    # Then
+    assert [len(c.args[0]) for c in collection.insert_many.call_args_list] == [2, 1]
+    assert writer.written == 3
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending(tmp_path):
+    # Given
+    collection = Mock()
+    writer = make_writer(tmp_path, collection, batch_size=100, flush_interval=60)
+    writer.log(make_entry())
+    await asyncio.sleep(0)
+
+    # When
+    await writer.stop()
+
+    # Then
+    collection.insert_many.assert_called_once()
+    assert writer.written == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_full_spills_to_disk(tmp_path):
+    # Given
+    collection = Mock()
+    writer = make_writer(tmp_path, collection, max_queue=1, flush_interval=60, batch_size=100)
+
+    # When
+    writer.log(make_entry("a"))
+    writer.log(make_entry("b"))
+    # The overflow is written by the spill thread, off the event loop
+    await drain(writer._spill_executor)
+
+    # Then
+    assert writer.spilled == 1
+    assert '"chosen_reply": ["b"]' in (tmp_path / "spill.jsonl").read_text()
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_is_spilled_then_replayed(tmp_path):
+    # Given
+    collection = Mock()
+    collection.insert_many.side_effect = [ConnectionError, None, None]
+    writer = make_writer(tmp_path, collection, batch_size=1)
+
+    # When
+    writer.log(make_entry("a"))
+    await wait_until(lambda: (tmp_path / "spill.jsonl").exists())
+    writer.log(make_entry("b"))
+    await wait_until(lambda: collection.insert_many.call_count == 3)
+    await drain(writer._executor)
+
+    # Then
+    replayed = collection.insert_many.call_args_list[2].args[0]
+    assert replayed[0]["chosen_reply"] == ["a"]
+    assert replayed[0]["timestamp"] == datetime(2026, 1, 1)
+    assert not (tmp_path / "spill.jsonl").exists()
+    assert writer.written == 2
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_partial_insert_spills_only_rejected_entries(tmp_path):
+    # Given
+    collection = Mock()
+    # 11602: interrupted by a replica set state change, worth retrying
+    collection.insert_many.side_effect = BulkWriteError({"writeErrors": [{"index": 1, "code": 11602}]})
+    writer = make_writer(tmp_path, collection, batch_size=3, flush_interval=60)
+    for reply in ("a", "b", "c"):
+        writer.log(make_entry(reply))
+
+    # When
+    await writer.stop()
+
+    # Then
+    spilled = (tmp_path / "spill.jsonl").read_text().splitlines()
+    assert len(spilled) == 1
+    assert '"chosen_reply": ["b"]' in spilled[0]
+    assert writer.written == 2
+    assert writer.spilled == 1
+
+
+@pytest.mark.asyncio
+async def test_permanently_rejected_entries_are_dead_lettered(tmp_path):
+    # Given
+    collection = Mock()
+    collection.insert_many.side_effect = BulkWriteError({
+        "writeErrors": [{"index": 0, "code": 121, "errmsg": "Document failed validation"}],
+    })
+    writer = make_writer(tmp_path, collection, batch_size=2, flush_interval=60)
+    for reply in ("a", "b"):
+        writer.log(make_entry(reply))
+
+    # When
+    await writer.stop()
+
+    # Then
+    dead = [json.loads(line) for line in (tmp_path / "spill.jsonl.dead").read_text().splitlines()]
+    assert [entry["entry"]["chosen_reply"] for entry in dead] == [["a"]]
+    assert dead[0]["error"] == {"code": 121, "errmsg": "Document failed validation"}
+    assert not (tmp_path / "spill.jsonl").exists()
+    assert writer.written == 1
+    assert writer.dead_lettered == 1
+    assert writer.spilled == 0
+
+
+def test_replay_does_not_respill_permanent_rejections(tmp_path):
+    # Given
+    collection = Mock()
+    collection.insert_many.side_effect = BulkWriteError({
+        "writeErrors": [{"index": 0, "code": 11000}, {"index": 1, "code": 91}],
+    })
+    writer = make_writer(tmp_path, collection, batch_size=10)
+    writer._spill([make_entry("duplicate"), make_entry("shutdown"), make_entry("ok")])
+
+    # When
+    writer._replay_spill()
+
+    # Then
+    spilled = (tmp_path / "spill.jsonl").read_text().splitlines()
+    assert len(spilled) == 1
+    assert '"chosen_reply": ["shutdown"]' in spilled[0]
+    assert '"chosen_reply": ["duplicate"]' in (tmp_path / "spill.jsonl.dead").read_text()
+    assert writer.written == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_replay_counts_entries_once(tmp_path):
+    # Given
+    collection = Mock()
+    collection.insert_many.side_effect = [ConnectionError, None, ConnectionError]
+    writer = make_writer(tmp_path, collection, batch_size=1)
+
+    # When
+    writer.log(make_entry("a"))
+    await wait_until(lambda: (tmp_path / "spill.jsonl").exists())
+    writer.log(make_entry("b"))
+    await wait_until(lambda: collection.insert_many.call_count == 3)
+    await drain(writer._executor)
+
+    # Then
+    assert writer.spilled == 1
+    assert writer.written == 1
+    assert '"chosen_reply": ["a"]' in (tmp_path / "spill.jsonl").read_text()
+    assert not (tmp_path / "spill.jsonl.replay").exists()
+    await writer.stop()
+
+
+def test_replay_waits_for_a_spill_in_progress(tmp_path):
+    # Given
+    collection = Mock()
+    writer = make_writer(tmp_path, collection)
+    writer._spill([make_entry("a")])
+    writer._spill_lock.acquire()
+
+    # When
+    replay = ThreadPoolExecutor(max_workers=1).submit(writer._replay_spill)
+    claimed_while_locked = (tmp_path / "spill.jsonl.replay").exists()
+    writer._spill_lock.release()
+    replay.result(timeout=1)
+
+    # Then
+    assert not claimed_while_locked
+    assert collection.insert_many.call_args.args[0][0]["chosen_reply"] == ["a"]
+    assert not (tmp_path / "spill.jsonl").exists()
@@ -0,0 +1,14 @@
+import pytest
+from httpx import AsyncClient
+
+from app.server import app
+
+
+@pytest.mark.asyncio
+async def test_metrics_requires_admin():
+    # When
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    # Then
+    assert response.status_code == 401
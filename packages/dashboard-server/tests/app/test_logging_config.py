@@ -0,0 +1,60 @@
+import logging
+
+from app import logging_config
+from app.logging_config import (
+    DroppingQueueHandler,
+    log_queue_stats,
+    start_log_listener,
+    stop_log_listener,
+)
+from core.config import config
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_queue_handler_counts_drops_when_full():
+    # Given
+    handler = DroppingQueueHandler(maxsize=1)
+    record = logging.makeLogRecord({"msg": "hello"})
+
+    # When
+    handler.handle(record)
+    handler.handle(record)
+
+    # Then
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_listener_delivers_records_and_restores_handlers():
+    # Given
+    was_running = logging_config._listener is not None
+    stop_log_listener()
+    logger = logging.getLogger(config.CENTRAL_LOGGER_NAME)
+    original = logger.handlers[:]
+    target = ListHandler()
+    logger.handlers = [target]
+
+    try:
+        # When
+        start_log_listener()
+        queued_handlers = logger.handlers[:]
+        logger.warning("queued %s", "message")
+        stop_log_listener()
+
+        # Then
+        assert [type(h) for h in queued_handlers] == [DroppingQueueHandler]
+        assert logger.handlers == [target]
+        assert [r.getMessage() for r in target.records] == ["queued message"]
+        assert log_queue_stats()["dropped"] == 0
+    finally:
+        logger.handlers = original
+        if was_running:
+            start_log_listener()
@@ -0,0 +1,104 @@
+import pytest
+
+from app.user.adapter.input.api.v1.request.import_stream import iter_lines, iter_rows
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows) -> list:
+    return [(line, row if isinstance(row, dict) else str(row)) async for line, row in rows]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks():
+    # When
+    sut = [line async for line in iter_lines(stream(b"fir", b"st\r\nsec", "ond\nthé".encode()[:-1], b"\xa9"))]
+
+    # Then
+    assert sut == [(1, "first"), (2, "second"), (3, "thé")]
+
+
+@pytest.mark.asyncio
+async def test_overlong_lines_are_reported_without_buffering():
+    # Given
+    # Line 2 spans three chunks, line 4 fills one, the last line ends the stream
+    chunks = stream(b"short\n", b"x" * 6, b"x" * 6, b"x\nafter\n", b"y" * 12, b"\nz\n", b"z" * 11)
+
+    # When
+    sut = [line async for line in iter_lines(chunks, max_bytes=10)]
+
+    # Then
+    assert [(number, str(line)) for number, line in sut] == [
+        (1, "short"),
+        (2, "line longer than 10 bytes"),
+        (3, "after"),
+        (4, "line longer than 10 bytes"),
+        (5, "z"),
+        (6, "line longer than 10 bytes"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_are_keyed_by_header():
+    # Given
+    body = b"email,password,nickname,lat,lng\na@b.c,pw,hide,37.1,127.1\n\nb@b.c,pw,\"x,y\"\nc@b.c,pw,c,1,2\n"
+
+    # When
+    sut = await collect(iter_rows(stream(body), "text/csv; charset=utf-8"))
+
+    # Then
+    assert sut == [
+        (2, {"email": "a@b.c", "password": "pw", "nickname": "hide", "lat": "37.1", "lng": "127.1"}),
+        (4, "expected 5 fields, got 3"),
+        (5, {"email": "c@b.c", "password": "pw", "nickname": "c", "lat": "1", "lng": "2"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_reports_malformed_lines():
+    # Given
+    body = b'{"email": "a@b.c"}\n[1, 2]\n{not json\n'
+
+    # When
+    sut = await collect(iter_rows(stream(body), "application/x-ndjson"))
+
+    # Then
+    assert sut[0] == (1, {"email": "a@b.c"})
+    assert sut[1] == (2, "expected a JSON object")
+    assert sut[2][0] == 3 and sut[2][1].startswith("invalid JSON")
+
+
+@pytest.mark.asyncio
+async def test_invalid_utf8_is_reported_on_its_line():
+    # Given
+    body = b'{"email": "a@b.c"}\n{"email":"\xff"}\n{"email": "c@b.c"}\n'
+
+    # When
+    sut = await collect(iter_rows(stream(body), "application/x-ndjson"))
+
+    # Then
+    assert sut == [
+        (1, {"email": "a@b.c"}),
+        (2, "invalid UTF-8 at byte 10"),
+        (3, {"email": "c@b.c"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_header_with_invalid_utf8_stops_the_import():
+    # Given
+    body = b"email,\xffpassword\na@b.c,pw\n"
+
+    # When
+    sut = await collect(iter_rows(stream(body), "text/csv"))
+
+    # Then
+    assert sut == [(1, "invalid UTF-8 at byte 6")]
+
+
+def test_unsupported_content_type():
+    # Then
+    assert iter_rows(stream(b""), "application/json") is None
@@ -175,3 +175,40 @@ async def test_login(session: AsyncSession):
     sut = response.json()
     assert "token" in sut
     assert "refresh_token" in sut
+
+
+@pytest.mark.asyncio
+async def test_import_users(session: AsyncSession):
+    # Given
+    admin = make_user(
+        id=1,
+        password="password",
+        email="a@b.c",
+        nickname="hide",
+        is_admin=True,
+        lat=37.123,
+        lng=127.123,
+    )
+    session.add(admin)
+    await session.commit()
+    body = (
+        "email,password,nickname,lat,lng\n"
+        "new@b.c,pw,new,37.1,127.1\n"
+        "a@b.c,pw,dup,37.1,127.1\n"
+        "broken,pw\n"
+    )
+
+    # When
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/user/import",
+            headers={**HEADERS, "Content-Type": "text/csv"},
+            content=body,
+        )
+
+    # Then
+    sut = response.json()
+    assert sut["created"] == 1
+    assert sut["failed"] == 2
+    assert [error["line"] for error in sut["errors"]] == [4, 3]
+    assert await UserSQLAlchemyRepo(cache=None).get_user_by_email(email="new@b.c") is not None
@@ -1,13 +1,20 @@
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.user.adapter.output.persistence.sqlalchemy.user import UserSQLAlchemyRepo
-from app.user.domain.entity.user import User
+from app.user.adapter.output.persistence.sqlalchemy.user import UserSQLAlchemyRepo, user_cache
+from app.user.domain.entity.user import User, UserSnapshot
+from core.db.session import pool_stats
 from tests.support.user_fixture import make_user
 
 user_repo = UserSQLAlchemyRepo()
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    # Tables are truncated between tests, which bypasses cache invalidation
+    user_cache.clear()
+
+
 @pytest.mark.asyncio
 async def test_get_users(session: AsyncSession):
     # Given
@@ -72,7 +79,7 @@ async def test_get_user_by_email_or_nickname(session: AsyncSession):
     sut = await user_repo.get_user_by_email_or_nickname(email=email, nickname=nickname)
 
     # Then
-    assert isinstance(sut, User)
+    assert isinstance(sut, UserSnapshot)
     assert sut.id == user.id
     assert sut.email == email
     assert sut.nickname == nickname
@@ -91,7 +98,31 @@ async def test_get_user_by_id(session: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_email_and_password(session: AsyncSession):
+async def test_get_users_by_ids(session: AsyncSession):
+    # Given
+    users = [
+        make_user(
+            password="password",
+            email=f"{nickname}@b.c",
+            nickname=nickname,
+            is_admin=False,
+            lat=37.123,
+            lng=127.123,
+        )
+        for nickname in ("hide", "test", "other")
+    ]
+    session.add_all(users)
+    await session.commit()
+
+    # When
+    sut = await user_repo.get_users_by_ids(user_ids=[users[0].id, users[2].id, users[0].id])
+
+    # Then
+    assert sorted(user.nickname for user in sut) == ["hide", "other"]
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email(session: AsyncSession):
     # Given
     email = "b@c.d"
     password = "hide"
@@ -107,15 +138,73 @@ async def test_get_user_by_email_and_password(session: AsyncSession):
     await session.commit()
 
     # When
-    sut = await user_repo.get_user_by_email_and_password(email=email, password=password)
+    sut = await user_repo.get_user_by_email(email=email)
 
     # Then
-    assert isinstance(sut, User)
+    assert isinstance(sut, UserSnapshot)
     assert sut.id == user.id
     assert sut.email == email
     assert sut.password == password
 
 
+@pytest.mark.asyncio
+async def test_read_returns_its_connection_to_the_pool(session: AsyncSession):
+    # Given
+    user = make_user(email="b@c.d", nickname="hide")
+    session.add(user)
+    await session.commit()
+    user_cache.clear()
+
+    # When
+    sut = await user_repo.get_user_by_email(email="b@c.d")
+
+    # Then
+    assert sut.id == user.id
+    assert all(stats["checked_out"] == 0 for stats in pool_stats().values())
+
+
+@pytest.mark.asyncio
+async def test_update_password(session: AsyncSession):
+    # Given
+    user = make_user(
+        password="plain",
+        email="b@c.d",
+        nickname="hide",
+        is_admin=False,
+        lat=37.123,
+        lng=127.123,
+    )
+    session.add(user)
+    await session.commit()
+
+    # When
+    await user_repo.update_password(user_id=user.id, password="hashed")
+    await session.commit()
+    session.expire_all()
+
+    # Then
+    sut = await user_repo.get_user_by_email(email="b@c.d")
+    assert sut.password == "hashed"
+
+
+@pytest.mark.asyncio
+async def test_get_users_near(session: AsyncSession):
+    # Given
+    city_hall = make_user(email="a@b.c", nickname="city_hall", lat=37.5665, lng=126.9780)
+    gwanghwamun = make_user(email="b@b.c", nickname="gwanghwamun", lat=37.5759, lng=126.9769)
+    busan = make_user(email="c@b.c", nickname="busan", lat=35.1796, lng=129.0756)
+    session.add_all([city_hall, gwanghwamun, busan])
+    await session.commit()
+
+    # When
+    sut = await user_repo.get_users_near(lat=37.5665, lng=126.9780, radius_m=2_000)
+
+    # Then
+    assert [user.nickname for user in sut] == ["city_hall", "gwanghwamun"]
+    assert sut[0].distance_m == 0
+    assert 1_000 < sut[1].distance_m < 1_100
+
+
 @pytest.mark.asyncio
 async def test_save(session: AsyncSession):
     # Given
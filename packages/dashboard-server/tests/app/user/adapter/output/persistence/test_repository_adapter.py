@@ -4,6 +4,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.user.adapter.output.persistence.repository_adapter import UserRepositoryAdapter
+from app.user.domain.entity.user import NearbyUser
 from app.user.domain.repository.user import UserRepo
 from tests.support.user_fixture import make_user
 
@@ -111,7 +112,7 @@ async def test_get_user_by_id(session: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_email_and_password(session: AsyncSession):
+async def test_get_users_by_ids():
     # Given
     user = make_user(
         id=1,
@@ -122,26 +123,68 @@ async def test_get_user_by_email_and_password(session: AsyncSession):
         lat=37.123,
         lng=127.123,
     )
-    user_repo_mock.get_user_by_email_and_password.return_value = user
+    user_repo_mock.get_users_by_ids.return_value = [user]
     repository_adapter.user_repo = user_repo_mock
 
     # When
-    sut = await repository_adapter.get_user_by_email_and_password(
-        email=user.email, password=user.password
+    sut = await repository_adapter.get_users_by_ids(user_ids=[user.id])
+
+    # Then
+    assert sut == [user]
+    repository_adapter.user_repo.get_users_by_ids.assert_awaited_once_with(user_ids=[user.id])
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email(session: AsyncSession):
+    # Given
+    user = make_user(
+        id=1,
+        password="password",
+        email="a@b.c",
+        nickname="hide",
+        is_admin=True,
+        lat=37.123,
+        lng=127.123,
     )
+    user_repo_mock.get_user_by_email.return_value = user
+    repository_adapter.user_repo = user_repo_mock
+
+    # When
+    sut = await repository_adapter.get_user_by_email(email=user.email)
 
     # Then
     assert sut is not None
     assert sut.id == user.id
-    assert sut.password == user.password
     assert sut.email == user.email
-    assert sut.nickname == user.nickname
-    assert sut.is_admin == user.is_admin
-    assert sut.location.lat == user.location.lat
-    assert sut.location.lng == user.location.lng
-    repository_adapter.user_repo.get_user_by_email_and_password.assert_awaited_once_with(
-        email=user.email,
-        password=user.password,
+    repository_adapter.user_repo.get_user_by_email.assert_awaited_once_with(email=user.email)
+
+
+@pytest.mark.asyncio
+async def test_update_password():
+    # Given
+    repository_adapter.user_repo = user_repo_mock
+
+    # When
+    await repository_adapter.update_password(user_id=1, password="hashed")
+
+    # Then
+    repository_adapter.user_repo.update_password.assert_awaited_once_with(user_id=1, password="hashed")
+
+
+@pytest.mark.asyncio
+async def test_get_users_near():
+    # Given
+    nearby = [NearbyUser(id=1, nickname="hide", distance_m=12.5)]
+    user_repo_mock.get_users_near.return_value = nearby
+    repository_adapter.user_repo = user_repo_mock
+
+    # When
+    sut = await repository_adapter.get_users_near(lat=37.5665, lng=126.9780, radius_m=1_000, limit=10)
+
+    # Then
+    assert sut == nearby
+    repository_adapter.user_repo.get_users_near.assert_awaited_once_with(
+        lat=37.5665, lng=126.9780, radius_m=1_000, limit=10
     )
 
 
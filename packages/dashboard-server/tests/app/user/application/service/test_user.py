@@ -1,16 +1,22 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.user.adapter.output.persistence.repository_adapter import UserRepositoryAdapter
+from app.user.adapter.output.persistence.sqlalchemy.user import UserSQLAlchemyRepo
 from app.user.application.exception import (
     DuplicateEmailOrNicknameException,
     PasswordDoesNotMatchException,
     UserNotFoundException,
 )
+from app.user.application.service import user as service_module
 from app.user.application.service.user import UserService
 from app.user.domain.command import CreateUserCommand
+from app.user.application.dto import ImportUsersResponseDTO
 from app.user.domain.entity.user import UserRead
+from core.db.session import pool_stats
+from core.helpers.password import PasswordHasher
 from core.helpers.token import TokenHelper
 from tests.support.user_fixture import make_user
 
@@ -18,6 +24,14 @@ repository_mock = AsyncMock(spec=UserRepositoryAdapter)
 user_service = UserService(repository=repository_mock)
 
 
+@pytest.fixture(autouse=True)
+def hasher(monkeypatch):
+    fast_hasher = PasswordHasher(iterations=1000, max_workers=1, max_pending=2)
+    monkeypatch.setattr(service_module, "password_hasher", fast_hasher)
+    yield fast_hasher
+    fast_hasher.stop()
+
+
 @pytest.mark.asyncio
 async def test_get_user_list():
     # Given
@@ -164,7 +178,7 @@ async def test_is_admin():
 @pytest.mark.asyncio
 async def test_login_user_not_exist():
     # Given
-    repository_mock.get_user_by_email_and_password.return_value = None
+    repository_mock.get_user_by_email.return_value = None
     user_service.repository = repository_mock
 
     # When, Then
@@ -173,18 +187,39 @@ async def test_login_user_not_exist():
 
 
 @pytest.mark.asyncio
-async def test_login():
+async def test_login_wrong_password(hasher: PasswordHasher):
     # Given
     user = make_user(
         id=1,
-        password="password",
+        password=await hasher.hash("password"),
         email="h@id.e",
         nickname="hide",
         is_admin=False,
         lat=37.123,
         lng=127.123,
     )
-    repository_mock.get_user_by_email_and_password.return_value = user
+    repository_mock.get_user_by_email.return_value = user
+    user_service.repository = repository_mock
+
+    # When, Then
+    with pytest.raises(UserNotFoundException):
+        await user_service.login(email="email", password="wrong")
+
+
+@pytest.mark.asyncio
+async def test_login(hasher: PasswordHasher):
+    # Given
+    user = make_user(
+        id=1,
+        password=await hasher.hash("password"),
+        email="h@id.e",
+        nickname="hide",
+        is_admin=False,
+        lat=37.123,
+        lng=127.123,
+    )
+    repository_mock.get_user_by_email.return_value = user
+    repository_mock.update_password.reset_mock()
     user_service.repository = repository_mock
     token = TokenHelper.encode(payload={"user_id": user.id})
     refresh_token = TokenHelper.encode(payload={"sub": "refresh"})
@@ -195,3 +230,160 @@ async def test_login():
     # Then
     assert sut.token == token
     assert sut.refresh_token == refresh_token
+    repository_mock.update_password.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_login_holds_no_connection_during_verify(session, hasher: PasswordHasher, monkeypatch):
+    # Given
+    session.add(make_user(password=await hasher.hash("password"), email="h@id.e"))
+    await session.commit()
+    service = UserService(repository=UserRepositoryAdapter(user_repo=UserSQLAlchemyRepo(cache=None)))
+    checked_out = []
+    verify = hasher.verify
+
+    async def verify_and_record(password, encoded):
+        checked_out.append(sum(stats["checked_out"] for stats in pool_stats().values()))
+        return await verify(password, encoded)
+
+    monkeypatch.setattr(hasher, "verify", verify_and_record)
+
+    # When
+    await service.login(email="h@id.e", password="password")
+
+    # Then
+    assert checked_out == [0]
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_plain_text_password(hasher: PasswordHasher):
+    # Given
+    user = make_user(
+        id=1,
+        password="password",
+        email="h@id.e",
+        nickname="hide",
+        is_admin=False,
+        lat=37.123,
+        lng=127.123,
+    )
+    repository_mock.get_user_by_email.return_value = user
+    repository_mock.update_password.reset_mock()
+    user_service.repository = repository_mock
+
+    # When
+    await user_service.login(email="email", password="password")
+
+    # Then
+    repository_mock.update_password.assert_awaited_once()
+    upgraded = repository_mock.update_password.await_args.kwargs["password"]
+    assert await hasher.verify("password", upgraded)
+    assert not hasher.needs_rehash(upgraded)
+
+
+async def import_rows(*rows):
+    for line, row in enumerate(rows, start=2):
+        yield line, row
+
+
+def import_row(name: str, **overrides) -> dict:
+    return {"email": f"{name}@b.c", "password": "pw", "nickname": name, "lat": 37.1, "lng": 127.1, **overrides}
+
+
+@pytest.mark.asyncio
+async def test_import_users_reports_rejected_rows(hasher: PasswordHasher):
+    # Given
+    repository_mock.get_taken_emails_and_nicknames.reset_mock()
+    repository_mock.get_taken_emails_and_nicknames.return_value = ({"taken@b.c"}, set())
+    repository_mock.bulk_create.reset_mock()
+    user_service.repository = repository_mock
+    rows = import_rows(
+        import_row("ok"),
+        import_row("bad", lat="north"),
+        import_row("taken"),
+        ValueError("invalid JSON"),
+        import_row("ok", email="other@b.c"),
+    )
+
+    # When
+    sut = await user_service.import_users(rows=rows)
+
+    # Then
+    assert isinstance(sut, ImportUsersResponseDTO)
+    assert sut.created == 1
+    assert sut.failed == 4
+    assert [error.line for error in sut.errors] == [3, 5, 6, 4]
+    assert sut.errors[0].message.startswith("lat:")
+    users = repository_mock.bulk_create.await_args.kwargs["users"]
+    assert [user["email"] for user in users] == ["ok@b.c"]
+    assert await hasher.verify("pw", users[0]["password"])
+
+
+@pytest.mark.asyncio
+async def test_import_users_checks_duplicates_once_per_chunk():
+    # Given
+    repository_mock.get_taken_emails_and_nicknames.reset_mock()
+    repository_mock.get_taken_emails_and_nicknames.return_value = (set(), set())
+    repository_mock.bulk_create.reset_mock()
+    user_service.repository = repository_mock
+    rows = import_rows(*(import_row(f"user{i}") for i in range(5)))
+
+    # When
+    sut = await user_service.import_users(rows=rows, chunk_size=2)
+
+    # Then
+    assert sut.created == 5
+    assert repository_mock.get_taken_emails_and_nicknames.await_count == 3
+    assert repository_mock.bulk_create.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_import_users_retries_names_from_a_rolled_back_chunk():
+    # Given
+    repository_mock.get_taken_emails_and_nicknames.reset_mock()
+    repository_mock.get_taken_emails_and_nicknames.return_value = (set(), set())
+    repository_mock.bulk_create.reset_mock()
+    repository_mock.bulk_create.side_effect = [IntegrityError("INSERT", {}, Exception()), None]
+    user_service.repository = repository_mock
+    rows = import_rows(import_row("user"), import_row("user"))
+
+    # When
+    sut = await user_service.import_users(rows=rows, chunk_size=1)
+
+    # Then
+    repository_mock.bulk_create.side_effect = None
+    assert sut.created == 1
+    assert [error.line for error in sut.errors] == [2]
+    assert sut.errors[0].message.startswith("conflicted with a concurrent insert")
+    users = repository_mock.bulk_create.await_args.kwargs["users"]
+    assert [user["email"] for user in users] == ["user@b.c"]
+
+
+@pytest.mark.asyncio
+async def test_import_users_hashes_before_the_duplicate_check(hasher: PasswordHasher, monkeypatch):
+    # Given
+    calls = []
+    hash_password = hasher.hash
+
+    async def record_hash(password):
+        calls.append("hash")
+        return await hash_password(password)
+
+    async def record_lookup(**kwargs):
+        calls.append("lookup")
+        return set(), set()
+
+    monkeypatch.setattr(hasher, "hash", record_hash)
+    repository_mock.get_taken_emails_and_nicknames.reset_mock()
+    repository_mock.get_taken_emails_and_nicknames.side_effect = record_lookup
+    repository_mock.bulk_create.reset_mock()
+    user_service.repository = repository_mock
+    rows = import_rows(import_row("first"), import_row("second"))
+
+    # When
+    sut = await user_service.import_users(rows=rows)
+
+    # Then
+    repository_mock.get_taken_emails_and_nicknames.side_effect = None
+    assert sut.created == 2
+    assert calls == ["hash", "hash", "lookup"]
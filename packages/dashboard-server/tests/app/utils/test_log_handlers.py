@@ -0,0 +1,94 @@
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import BackgroundTasks
+
+from app.utils import log_handlers
+from app.utils.log_handlers import SessionRecorder, SessionSampler, session_logger_with_task
+
+
+def make_sampler(**kwargs) -> SessionSampler:
+    options = {"sample_rate": 0.0, "slow_ms": 1000, "pool_size": 2}
+    options.update(kwargs)
+    return SessionSampler(**options)
+
+
+def record(level: int) -> logging.LogRecord:
+    return logging.makeLogRecord({"levelno": level, "msg": "message"})
+
+
+def test_sampler_always_keeps_errored_and_slow_sessions():
+    # Given
+    sampler = make_sampler()
+
+    # When
+    errored = sampler.should_keep([record(logging.INFO), record(logging.ERROR)], elapsed_ms=1)
+    slow = sampler.should_keep([record(logging.INFO)], elapsed_ms=1500)
+    normal = sampler.should_keep([record(logging.INFO)], elapsed_ms=1)
+
+    # Then
+    assert (errored, slow, normal) == (True, True, False)
+    assert sampler.stats()["kept"] == 2 and sampler.stats()["discarded"] == 1
+
+
+def test_sampler_keeps_fraction_of_normal_sessions():
+    # Given
+    sampler = make_sampler(sample_rate=0.5)
+
+    # When
+    with patch("app.utils.log_handlers.random.random", side_effect=[0.4, 0.6]):
+        kept = [sampler.should_keep([record(logging.INFO)], elapsed_ms=1) for _ in range(2)]
+
+    # Then
+    assert kept == [True, False]
+
+
+def test_recorders_are_reused_without_previous_records():
+    # Given
+    sampler = make_sampler()
+    recorder = sampler.acquire()
+    recorder.info("first")
+
+    # When
+    sampler.release(recorder)
+    reused = sampler.acquire()
+
+    # Then
+    assert reused is recorder
+    assert reused.records == []
+
+
+def test_discarded_session_is_not_shipped():
+    # Given
+    background_tasks = BackgroundTasks()
+
+    # When
+    with patch.object(log_handlers, "session_sampler", make_sampler()):
+        with session_logger_with_task(background_tasks) as logger:
+            logger.info("routine")
+
+    # Then
+    assert background_tasks.tasks == []
+
+
+@pytest.mark.asyncio
+async def test_failed_session_is_masked_and_shipped():
+    # Given
+    background_tasks = BackgroundTasks()
+    shipper = Mock()
+
+    # When
+    with patch.object(log_handlers, "session_sampler", make_sampler()), \
+            patch.object(log_handlers, "session_log_shipper", shipper):
+        with pytest.raises(RuntimeError):
+            with session_logger_with_task(background_tasks) as logger:
+                logger.info("calling with token=secret")
+                raise RuntimeError("boom")
+        await background_tasks()
+
+    # Then
+    content = shipper.append.call_args.args[1]
+    assert "token=******" in content and "secret" not in content
+    assert "Session failed with an unhandled exception" in content
+    assert isinstance(logger, SessionRecorder)
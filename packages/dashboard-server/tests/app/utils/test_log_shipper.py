@@ -0,0 +1,135 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from app.utils.log_shipper import SessionLogShipper
+
+
+class FakeS3:
+    """In-memory stand-in for the boto3 S3 client"""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.failing = False
+        self.gate: threading.Event | None = None
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, **kwargs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failing:
+            raise ConnectionError("S3 unavailable")
+        self.objects[f"{Bucket}/{Key}"] = Body
+
+
+def make_shipper(tmp_path, s3: FakeS3, **kwargs) -> SessionLogShipper:
+    options = {
+        "s3_client": s3,
+        "bucket": "bucket",
+        "prefix": "session_logs",
+        "max_bytes": 1024,
+        "max_age_sec": 60,
+        "spool_dir": str(tmp_path / "spool"),
+    }
+    options.update(kwargs)
+    return SessionLogShipper(**options)
+
+
+def segments(s3: FakeS3) -> list[tuple[bytes, dict]]:
+    result = []
+    for key, body in s3.objects.items():
+        if key.endswith(".log.gz"):
+            manifest = json.loads(s3.objects[key[: -len(".log.gz")] + ".manifest.json"])
+            result.append((gzip.decompress(body), manifest))
+    return result
+
+
+@pytest.mark.asyncio
+async def test_logs_are_shipped_as_one_object_with_manifest(tmp_path):
+    # Given
+    s3 = FakeS3()
+    shipper = make_shipper(tmp_path, s3)
+
+    # When
+    shipper.append("req-1", "first\n")
+    shipper.append("req-2", "second\n")
+    await shipper.stop()
+
+    # Then
+    [(data, manifest)] = segments(s3)
+    assert "/dt=" in manifest["object"] and "/hour=" in manifest["object"]
+    offset, length = manifest["records"]["req-2"]
+    assert data[offset:offset + length] == b"second\n"
+
+
+@pytest.mark.asyncio
+async def test_segment_rolls_when_size_limit_reached(tmp_path):
+    # Given
+    s3 = FakeS3()
+    shipper = make_shipper(tmp_path, s3, max_bytes=10)
+
+    # When
+    for i in range(3):
+        shipper.append(f"req-{i}", "0123456789")
+    await shipper.stop()
+
+    # Then
+    assert len(segments(s3)) == 3
+
+
+def test_roll_only_seals_segment_past_max_age(tmp_path):
+    # Given
+    s3 = FakeS3()
+    shipper = make_shipper(tmp_path, s3, max_age_sec=0)
+    fresh = make_shipper(tmp_path, s3, max_age_sec=60)
+    shipper.append("req-1", "old\n")
+    fresh.append("req-2", "new\n")
+
+    # When
+    shipper.roll()
+    fresh.roll()
+    shipper._executor.shutdown(wait=True)
+
+    # Then
+    assert shipper.uploaded == 1
+    assert fresh._segment is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_spooled_and_retried(tmp_path):
+    # Given
+    s3 = FakeS3()
+    s3.failing = True
+    # One worker, so the no-op below runs only after the failed upload is spooled
+    shipper = make_shipper(tmp_path, s3, max_bytes=1, upload_workers=1)
+    shipper.append("req-1", "lost?\n")
+    shipper._executor.submit(lambda: None).result()
+
+    # When
+    s3.failing = False
+    shipper.append("req-2", "back\n")
+    await shipper.stop()
+
+    # Then
+    assert shipper.failed == 1 and shipper.spooled == 1
+    assert sorted(req for _, m in segments(s3) for req in m["records"]) == ["req-1", "req-2"]
+    assert not list((tmp_path / "spool").rglob("*.log.gz"))
+
+
+@pytest.mark.asyncio
+async def test_slow_s3_spools_instead_of_queueing(tmp_path):
+    # Given
+    s3 = FakeS3()
+    s3.gate = threading.Event()
+    shipper = make_shipper(tmp_path, s3, max_bytes=1, max_pending_uploads=1)
+
+    # When
+    shipper.append("req-1", "a")
+    shipper.append("req-2", "b")
+
+    # Then
+    assert shipper.spooled == 1
+    s3.gate.set()
+    await shipper.stop()
+    assert len(segments(s3)) == 2
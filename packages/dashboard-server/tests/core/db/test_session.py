@@ -0,0 +1,157 @@
+import importlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db.session import (
+    COMPILED_CACHE,
+    POOL_WAIT,
+    TimedQueuePool,
+    engines,
+    pool_stats,
+    read_session,
+    session,
+    session_context,
+    track_compiled_cache,
+)
+
+# core.db re-exports the scoped `session`, which shadows the module attribute
+session_module = importlib.import_module("core.db.session")
+
+
+def test_timed_pool_records_checkout_wait():
+    # Given
+    pool = TimedQueuePool(creator=MagicMock, pool_size=1, max_overflow=0, label="test")
+
+    # When
+    connection = pool.connect()
+    stats_while_checked_out = (pool.checkedout(), pool.checkedin())
+    connection.close()
+
+    # Then
+    assert POOL_WAIT.count("test") == 1
+    assert stats_while_checked_out == (1, 0)
+    assert pool.checkedin() == 1
+
+
+def test_recreated_pool_keeps_its_label():
+    # Given
+    pool = TimedQueuePool(creator=MagicMock, pool_size=1, max_overflow=0, label="recreated")
+
+    # When
+    sut = pool.recreate()
+    sut.connect().close()
+
+    # Then
+    assert isinstance(sut, TimedQueuePool)
+    assert sut.label == "recreated"
+    assert POOL_WAIT.count("recreated") == 1
+
+
+def test_compiled_cache_counts_hits_and_misses():
+    # Given
+    engine = create_engine("sqlite://")
+    track_compiled_cache(engine, "compiled-cache-test")
+
+    # When
+    with engine.connect() as conn:
+        for value in (1, 2, 3):
+            conn.execute(select(text("1")).where(text("1 = :value")).params(value=value))
+
+    # Then
+    assert COMPILED_CACHE.value("compiled-cache-test", "miss") == 1
+    assert COMPILED_CACHE.value("compiled-cache-test", "hit") == 2
+
+
+def test_pool_stats_reports_every_engine():
+    # When
+    sut = pool_stats()
+
+    # Then
+    assert set(sut) == set(engines)
+    assert set(sut["writer"]) == {"size", "checked_out", "checked_in", "overflow"}
+
+
+@pytest.mark.asyncio
+async def test_read_session_reuses_request_session():
+    # When
+    async with read_session() as first, read_session() as second:
+        pass
+
+    # Then
+    assert first is session
+    assert second is session
+
+
+@pytest.mark.asyncio
+async def test_read_session_outside_request_is_short_lived():
+    # Given
+    context = session_context.set(None)
+
+    # When
+    try:
+        async with read_session() as first, read_session() as second:
+            pass
+    finally:
+        session_context.reset(context)
+
+    # Then
+    assert isinstance(first, AsyncSession)
+    assert first is not second
+
+
+def make_scoped_session(*, in_transaction: bool = False, new: tuple = ()) -> MagicMock:
+    scoped = MagicMock()
+    scoped.in_transaction.return_value = in_transaction
+    scoped.new, scoped.dirty, scoped.deleted = set(new), set(), set()
+    scoped.info = {}
+    scoped.commit = AsyncMock()
+    return scoped
+
+
+@pytest.mark.asyncio
+async def test_read_session_releases_the_connection_it_took(monkeypatch):
+    # Given
+    scoped = make_scoped_session()
+    monkeypatch.setattr(session_module, "session", MagicMock(return_value=scoped))
+
+    # When
+    async with read_session() as db:
+        # The first query begins the transaction and checks out a connection
+        scoped.in_transaction.return_value = True
+
+    # Then
+    assert db is session_module.session
+    scoped.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("state", [{"in_transaction": True}, {"new": ("pending user",)}])
+async def test_read_session_leaves_a_writing_session_open(monkeypatch, state):
+    # Given
+    scoped = make_scoped_session(**state)
+    monkeypatch.setattr(session_module, "session", MagicMock(return_value=scoped))
+
+    # When
+    async with read_session():
+        scoped.in_transaction.return_value = True
+
+    # Then
+    scoped.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_session_keeps_a_transaction_that_wrote(monkeypatch):
+    # Given
+    scoped = make_scoped_session()
+    monkeypatch.setattr(session_module, "session", MagicMock(return_value=scoped))
+
+    # When
+    async with read_session():
+        scoped.in_transaction.return_value = True
+        scoped.info[session_module._WROTE_AT] = 1.0
+
+    # Then
+    scoped.commit.assert_not_awaited()
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi import Request
@@ -10,6 +10,7 @@ from core.fastapi.dependencies import (
     IsAuthenticated,
     PermissionDependency,
 )
+from core.fastapi.dependencies import permission
 from core.fastapi.dependencies.permission import UnauthorizedException
 
 container = Container()
@@ -69,3 +70,23 @@ async def test_permission_dependency_allow_all():
 
     # Then
     assert sut is None
+
+
+@pytest.mark.asyncio
+async def test_permission_dependency_is_admin_uses_cached_result():
+    # Given
+    dependency = PermissionDependency(permissions=[IsAdmin])
+    request = AsyncMock(spec=Request)
+    request.user = Mock(id=1)
+    user_service_mock = AsyncMock()
+    cache_mock = AsyncMock()
+    cache_mock.get.return_value = True
+
+    # When
+    with container.user_service.override(user_service_mock), \
+            patch.object(permission, "permission_cache", cache_mock):
+        sut = await dependency(request=request)
+
+    # Then
+    assert sut is None
+    user_service_mock.is_admin.assert_not_called()
@@ -104,3 +104,60 @@ async def test_auth_backend(jwt_mock):
     # Then
     assert authenticated is True
     assert user == CurrentUser(id=1)
+
+
+@pytest.mark.asyncio
+@patch.object(authentication, "jwt")
+async def test_auth_backend_caches_verified_token(jwt_mock):
+    # Given
+    backend = AuthBackend()
+    conn_mock = Mock(spec=HTTPConnection)
+    conn_mock.headers = {"Authorization": "bearer credentials"}
+    jwt_mock.decode.return_value = {"user_id": 1}
+
+    # When
+    await backend.authenticate(conn=conn_mock)
+    authenticated, user = await backend.authenticate(conn=conn_mock)
+
+    # Then
+    assert authenticated is True
+    assert user == CurrentUser(id=1)
+    assert jwt_mock.decode.call_count == 1
+    assert backend.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+@patch.object(authentication, "jwt")
+async def test_auth_backend_does_not_cache_past_expiry(jwt_mock):
+    # Given
+    backend = AuthBackend()
+    conn_mock = Mock(spec=HTTPConnection)
+    conn_mock.headers = {"Authorization": "bearer credentials"}
+    jwt_mock.decode.return_value = {"user_id": 1, "exp": 0}
+
+    # When
+    await backend.authenticate(conn=conn_mock)
+    await backend.authenticate(conn=conn_mock)
+
+    # Then
+    assert jwt_mock.decode.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch.object(authentication, "jwt")
+async def test_auth_backend_caches_rejected_token(jwt_mock):
+    # Given
+    backend = AuthBackend()
+    conn_mock = Mock(spec=HTTPConnection)
+    conn_mock.headers = {"Authorization": "bearer forged"}
+    jwt_mock.exceptions.PyJWTError = PyJWTError
+    jwt_mock.decode.side_effect = PyJWTError
+
+    # When
+    await backend.authenticate(conn=conn_mock)
+    authenticated, user = await backend.authenticate(conn=conn_mock)
+
+    # Then
+    assert authenticated is False
+    assert user.id is None
+    assert jwt_mock.decode.call_count == 1
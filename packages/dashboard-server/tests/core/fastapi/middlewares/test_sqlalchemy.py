@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from sqlalchemy.ext.asyncio import async_scoped_session
 
@@ -34,21 +34,62 @@ async def exception_app(scope: Scope, receive: Receive, send: Send) -> None:
     raise Exception
 
 
+def make_session_mock(used: bool) -> Mock:
+    session_mock = Mock(spec=async_scoped_session)
+    session_mock.registry = Mock()
+    session_mock.registry.has.return_value = used
+    session_mock.remove = AsyncMock()
+    return session_mock
+
+
 @pytest.mark.asyncio
-@patch.object(sqlalchemy, "session", spec=async_scoped_session)
-async def test_sqlalchemy_middleware(session_mock):
+async def test_sqlalchemy_middleware():
     # Given
     test_app = SQLAlchemyMiddleware(app=app)
+    session_mock = make_session_mock(used=True)
 
     # When, Then
-    async with AsyncClient(app=test_app, base_url="http://127.0.0.1") as client:
-        response = await client.get("/")
-        assert response.status_code == 200
-        assert session_mock.remove.called
+    with patch.object(sqlalchemy, "session", session_mock):
+        async with AsyncClient(app=test_app, base_url="http://127.0.0.1") as client:
+            response = await client.get("/")
+            assert response.status_code == 200
+            assert session_mock.remove.called
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_middleware_skips_unused_session():
+    # Given
+    test_app = SQLAlchemyMiddleware(app=app)
+    session_mock = make_session_mock(used=False)
+
+    # When
+    with patch.object(sqlalchemy, "session", session_mock):
+        async with AsyncClient(app=test_app, base_url="http://127.0.0.1") as client:
+            response = await client.get("/")
+
+    # Then
+    assert response.status_code == 200
+    assert not session_mock.remove.called
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_middleware_passes_through_lifespan():
+    # Given
+    inner = AsyncMock()
+    test_app = SQLAlchemyMiddleware(app=inner)
+    session_mock = make_session_mock(used=False)
+
+    # When
+    with patch.object(sqlalchemy, "session", session_mock):
+        await test_app({"type": "lifespan"}, AsyncMock(), AsyncMock())
+
+    # Then
+    inner.assert_awaited_once()
+    session_mock.registry.has.assert_not_called()
 
 
 @pytest.mark.asyncio
-@patch.object(sqlalchemy, "session", spec=async_scoped_session)
+@patch.object(sqlalchemy, "session", new_callable=lambda: make_session_mock(used=True))
 async def test_sqlalchemy_middleware_exception(session_mock):
     # Given
     test_app = SQLAlchemyMiddleware(app=exception_app)
@@ -0,0 +1,185 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.helpers.cache import CacheTag
+from core.helpers.cache.base import BaseBackend, BaseKeyMaker
+from core.helpers.cache.cache_manager import CacheManager
+
+
+class DictBackend(BaseBackend):
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, *, key):
+        return self.data.get(key)
+
+    async def set(self, *, response, key, ttl=60):
+        self.data[key] = response
+
+    async def invalidate_namespace(self, *, namespace):
+        for key in [k for k in self.data if k.startswith(f"{namespace}::")]:
+            del self.data[key]
+
+
+class StaticKeyMaker(BaseKeyMaker):
+    async def make(self, *, function, prefix, **_):
+        return f"{prefix}::{function.__name__}"
+
+
+def make_manager() -> CacheManager:
+    manager = CacheManager()
+    manager.init(backend=DictBackend(), key_maker=StaticKeyMaker())
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    # Given
+    manager = make_manager()
+    release = asyncio.Event()
+    loader = AsyncMock()
+
+    @manager.cached(tag=CacheTag.GET_USER_LIST)
+    async def get_users():
+        await loader()
+        await release.wait()
+        return ["user"]
+
+    # When
+    calls = [asyncio.create_task(get_users()) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    # Then
+    assert results == [["user"]] * 10
+    assert loader.await_count == 1
+    assert manager.requests["get_user_list", "coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_get_their_own_copy():
+    # Given
+    manager = make_manager()
+    release = asyncio.Event()
+
+    @manager.cached(tag=CacheTag.GET_USER_LIST)
+    async def get_users():
+        await release.wait()
+        return [{"nickname": "hide"}]
+
+    calls = [asyncio.create_task(get_users()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    leader, *waiters = await asyncio.gather(*calls)
+
+    # When
+    leader[0]["nickname"] = "changed"
+    waiters[0].append({"nickname": "extra"})
+
+    # Then
+    assert waiters[0] is not waiters[1]
+    assert waiters[1] == [{"nickname": "hide"}]
+    assert waiters[0][0] == {"nickname": "hide"}
+
+
+@pytest.mark.asyncio
+async def test_falsy_results_are_cached():
+    # Given
+    manager = make_manager()
+    loader = AsyncMock(return_value=[])
+
+    @manager.cached(prefix="empty")
+    async def get_nothing():
+        return await loader()
+
+    # When
+    await get_nothing()
+    sut = await get_nothing()
+
+    # Then
+    assert sut == []
+    assert loader.await_count == 1
+    assert manager.hit_ratios() == {"empty": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_failure_is_shared_and_not_cached():
+    # Given
+    manager = make_manager()
+    release = asyncio.Event()
+
+    @manager.cached(prefix="failing")
+    async def fail():
+        await release.wait()
+        raise RuntimeError("db down")
+
+    # When
+    calls = [asyncio.create_task(fail()) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    # Then
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert manager.backend.data == {}
+    assert manager._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_a_waiter():
+    # Given
+    manager = make_manager()
+    release = asyncio.Event()
+    loader = AsyncMock()
+
+    @manager.cached(prefix="handover")
+    async def get_users():
+        await loader()
+        await release.wait()
+        return ["user"]
+
+    leader = asyncio.create_task(get_users())
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(get_users()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    # When
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    # Then
+    assert leader.cancelled()
+    assert results == [["user"]] * 3
+    assert loader.await_count == 2
+    assert manager._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_leader_running():
+    # Given
+    manager = make_manager()
+    release = asyncio.Event()
+
+    @manager.cached(prefix="waiter")
+    async def get_users():
+        await release.wait()
+        return ["user"]
+
+    leader = asyncio.create_task(get_users())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(get_users())
+    await asyncio.sleep(0)
+
+    # When
+    waiter.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    # Then
+    assert await leader == ["user"]
+    assert waiter.cancelled()
@@ -25,7 +25,100 @@ async def test_make_with_args():
         pass
 
     # When
-    sut = await key_maker.make(function=test, prefix="hide")
+    sut = await key_maker.make(function=test, prefix="hide", args=(1,))
+
+    # Then
+    assert sut.startswith("hide::tests.core.helpers.cache.test_custom_key_maker.test:")
+    assert len(sut.rsplit(":", 1)[1]) == 24
+
+
+@pytest.mark.asyncio
+async def test_make_distinguishes_argument_values():
+    # Given
+    def get_user_list(limit: int = 12, prev: int | None = None):
+        pass
+
+    # When
+    by_limit = await key_maker.make(function=get_user_list, prefix="hide", kwargs={"limit": 10})
+    by_prev = await key_maker.make(function=get_user_list, prefix="hide", kwargs={"prev": 500})
+
+    # Then
+    assert by_limit != by_prev
+
+
+@pytest.mark.asyncio
+async def test_make_canonicalizes_positional_keyword_and_default():
+    # Given
+    def get_user_list(limit: int = 12, prev: int | None = None):
+        pass
+
+    # When
+    keys = {
+        await key_maker.make(function=get_user_list, prefix="hide"),
+        await key_maker.make(function=get_user_list, prefix="hide", args=(12,)),
+        await key_maker.make(function=get_user_list, prefix="hide", kwargs={"prev": None, "limit": 12}),
+    }
+
+    # Then
+    assert len(keys) == 1
+
+
+@pytest.mark.asyncio
+async def test_make_excludes_self_and_requested_arguments():
+    # Given
+    class Service:
+        def get(self, user_id: int, session=None):
+            pass
+
+    # When
+    first = await key_maker.make(
+        function=Service.get, prefix="hide", args=(Service(), 1), kwargs={"session": object()}, exclude=("session",)
+    )
+    second = await key_maker.make(
+        function=Service.get, prefix="hide", args=(Service(), 1), kwargs={"session": object()}, exclude=("session",)
+    )
+
+    # Then
+    assert first == second
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", [object(), {object()}, [1, object()]])
+async def test_make_rejects_arguments_without_a_stable_form(value):
+    # Given
+    def get(user_id: int, filters=None):
+        pass
+
+    # When, Then
+    with pytest.raises(TypeError, match="argument 'filters'"):
+        await key_maker.make(function=get, prefix="hide", args=(1, value))
+
+
+@pytest.mark.asyncio
+async def test_make_accepts_mixed_key_types():
+    # Given
+    def get(filters: dict):
+        pass
+
+    # When
+    first = await key_maker.make(function=get, prefix="hide", args=({1: "a", "1": "b", None: "c"},))
+    reordered = await key_maker.make(function=get, prefix="hide", args=({None: "c", "1": "b", 1: "a"},))
+    swapped = await key_maker.make(function=get, prefix="hide", args=({1: "b", "1": "a", None: "c"},))
+
+    # Then
+    assert first == reordered
+    assert first != swapped
+
+
+@pytest.mark.asyncio
+async def test_make_is_stable_for_sets_of_mixed_types():
+    # Given
+    def get(ids: frozenset):
+        pass
+
+    # When
+    first = await key_maker.make(function=get, prefix="hide", args=(frozenset({1, "a", (2, 3)}),))
+    second = await key_maker.make(function=get, prefix="hide", args=(frozenset({(2, 3), "a", 1}),))
 
     # Then
-    assert sut == "hide::tests.core.helpers.cache.test_custom_key_maker.test.a"
+    assert first == second
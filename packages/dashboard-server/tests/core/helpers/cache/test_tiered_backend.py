@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from core.helpers.cache.redis_backend import RedisBackend
+from core.helpers.cache.serialization import dumps, loads
+from core.helpers.cache.tiered_backend import TieredBackend
+
+
+class FakeRedis:
+    """Runs the backend's scripts against a dict, one Mock per script"""
+
+    def __init__(self, stored: dict):
+        self.stored = stored
+        self.get = AsyncMock(side_effect=self._get)
+        self.set = AsyncMock(side_effect=self._set)
+
+    def register_script(self, script: str):
+        return self.get if "return redis.call('GET'" in script else self.set
+
+    def _versioned(self, keys, args) -> str:
+        return f"{args[0]}@{self.stored.get(keys[0], 0)}{args[1]}"
+
+    async def _get(self, keys, args):
+        return self.stored.get(self._versioned(keys, args))
+
+    async def _set(self, keys, args):
+        self.stored[self._versioned(keys, args)] = args[2]
+
+    async def incr(self, key):
+        self.stored[key] = self.stored.get(key, 0) + 1
+
+
+def make_backend(stored: dict | None = None) -> tuple[TieredBackend, FakeRedis]:
+    client = FakeRedis({} if stored is None else stored)
+    return TieredBackend(l2=RedisBackend(client), maxsize=10, l1_ttl=5), client
+
+
+def test_serialization_round_trips_small_and_compressed_values():
+    # Given
+    small = {"id": 1}
+    large = [{"nickname": "hide"}] * 1000
+
+    # When
+    small_data, large_data = dumps(small), dumps(large)
+
+    # Then
+    assert loads(small_data) == small
+    assert loads(large_data) == large
+    assert large_data[:1] == b"\x01"
+
+
+@pytest.mark.asyncio
+async def test_set_then_get_is_served_from_l1():
+    # Given
+    backend, client = make_backend()
+
+    # When
+    await backend.set(response={"id": 1}, key="k", ttl=60)
+    sut = await backend.get(key="k")
+
+    # Then
+    assert sut == {"id": 1}
+    client.set.assert_awaited_once()
+    client.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_l1_miss_fills_from_redis():
+    # Given
+    backend, client = make_backend({"ns@0::k": dumps([1, 2])})
+
+    # When
+    first = await backend.get(key="ns::k")
+    second = await backend.get(key="ns::k")
+
+    # Then
+    assert first == second == [1, 2]
+    assert first is not second
+    assert client.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_is_a_miss():
+    # Given
+    backend, client = make_backend()
+    client.get.side_effect = ConnectionError
+
+    # When
+    sut = await backend.get(key="k")
+
+    # Then
+    assert sut is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_namespace_bumps_version_once():
+    # Given
+    backend, client = make_backend()
+    for i in range(100):
+        await backend.set(response=i, key=f"users::{i}", ttl=60)
+    await backend.set(response="kept", key="other::k", ttl=60)
+
+    # When
+    await backend.invalidate_namespace(namespace="users")
+
+    # Then
+    assert client.stored["cache:ns:users"] == 1
+    assert await backend.get(key="users::1") is None
+    assert await backend.get(key="other::k") == "kept"
+    await backend.set(response="fresh", key="users::1", ttl=60)
+    assert client.stored["users@1::1"] == dumps("fresh")
@@ -0,0 +1,93 @@
+import math
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.user.domain.entity.user import User
+from app.user.domain.vo.location import Location
+from core.db import Base
+from core.helpers import geohash
+from tests.support.user_fixture import make_user
+
+
+def test_encode_matches_reference_value():
+    # Then
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_covering_cells_contain_points_within_radius():
+    # Given
+    lat, lng, radius_m = 37.5665, 126.9780, 2_000
+    nearby = (37.5800, 126.9900)
+
+    # When
+    sut = geohash.covering_cells(lat, lng, radius_m)
+
+    # Then
+    assert geohash.haversine_m(lat, lng, *nearby) < radius_m
+    assert any(geohash.encode(*nearby).startswith(cell) for cell in sut)
+    assert 1 < len(sut) <= geohash.MAX_CELLS
+    assert all(len(cell) == len(sut[0]) for cell in sut)
+
+
+@pytest.mark.parametrize(
+    ("lat", "lng", "radius_m", "direction"),
+    [(11.9961, 81.0502, 5_000, 1), (2.402, -110.964, 2_000, -1)],
+)
+def test_covering_cells_contain_points_at_the_north_and_south_edge(lat, lng, radius_m, direction):
+    # Given
+    edge = (lat + direction * math.degrees(0.999 * radius_m / geohash.EARTH_RADIUS_M), lng)
+
+    # When
+    sut = geohash.covering_cells(lat, lng, radius_m)
+
+    # Then
+    assert geohash.haversine_m(lat, lng, *edge) < radius_m
+    assert any(geohash.encode(*edge).startswith(cell) for cell in sut)
+
+
+def test_covering_cells_across_antimeridian():
+    # When
+    sut = geohash.covering_cells(0.0, 179.999, 1_000)
+
+    # Then
+    assert any(geohash.encode(0.0, -179.999).startswith(cell) for cell in sut)
+
+
+def test_radius_too_large_for_a_prefix_disables_prefilter():
+    # Then
+    assert geohash.covering_cells(37.5, 127.0, 10_000_000) == []
+
+
+def test_haversine_seoul_busan():
+    # When
+    sut = geohash.haversine_m(37.5665, 126.9780, 35.1796, 129.0756)
+
+    # Then
+    assert 320_000 < sut < 330_000
+
+
+def test_user_geohash_follows_location():
+    # Given
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        user = make_user(lat=37.5, lng=127.0)
+
+        # When
+        db.add(user)
+        db.commit()
+        inserted = user.geohash
+        user.location = Location(lat=35.1, lng=129.0)
+        db.commit()
+        moved = user.geohash
+        db.execute(insert(User.__table__).values([
+            {"email": "b@b.c", "password": "p", "nickname": "b", "is_admin": False, "lat": 1.0, "lng": 2.0},
+        ]))
+        bulk = db.execute(select(User.geohash).where(User.email == "b@b.c")).scalar_one()
+
+    # Then
+    assert inserted == geohash.encode(37.5, 127.0)
+    assert moved == geohash.encode(35.1, 129.0)
+    assert bulk == geohash.encode(1.0, 2.0)
@@ -0,0 +1,137 @@
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.user.adapter.output.persistence.sqlalchemy.user import user_cache
+from app.user.domain.entity.user import User, UserSnapshot
+from app.user.domain.vo.location import Location
+from core.db import Base
+from core.helpers.identity_cache import IdentityCache
+
+
+def make_redis() -> Mock:
+    redis_mock = Mock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_mock.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis_mock.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    return redis_mock
+
+
+def make_cache(redis_mock=None, quarantine_sec: float = 60) -> IdentityCache:
+    return IdentityCache(
+        redis_mock or make_redis(),
+        name="test",
+        maxsize=10,
+        ttl=60,
+        indexes=("email", "nickname"),
+        quarantine_sec=quarantine_sec,
+    )
+
+
+def make_snapshot(id: int = 1, email: str = "a@b.c", nickname: str = "hide") -> UserSnapshot:
+    return UserSnapshot(
+        id=id, password="p", email=email, nickname=nickname, is_admin=False, lat=1.0, lng=2.0,
+    )
+
+
+def test_snapshot_is_found_by_id_and_indexes():
+    # Given
+    cache = make_cache()
+    snapshot = make_snapshot()
+
+    # When
+    cache.put(snapshot)
+
+    # Then
+    assert cache.get(1) is snapshot
+    assert cache.get_by("email", "a@b.c") is snapshot
+    assert cache.get_by("nickname", "hide") is snapshot
+    assert cache.get_by("email", "other@b.c") is None
+
+
+def test_stale_index_entry_is_a_miss():
+    # Given
+    cache = make_cache(quarantine_sec=0)
+    cache.put(make_snapshot(email="old@b.c"))
+
+    # When
+    cache.invalidate_local(1)
+    cache.put(make_snapshot(email="new@b.c"))
+
+    # Then
+    assert cache.get_by("email", "old@b.c") is None
+    assert cache.get_by("email", "new@b.c").email == "new@b.c"
+
+
+def test_invalidated_id_is_not_cached_during_quarantine():
+    # Given
+    cache = make_cache()
+    cache.put(make_snapshot())
+
+    # When
+    cache.invalidate_local(1)
+    cache.put(make_snapshot())
+
+    # Then
+    assert cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_publishes_to_other_workers():
+    # Given
+    redis_mock = make_redis()
+    cache = make_cache(redis_mock)
+    cache.put(make_snapshot())
+
+    # When
+    await cache.invalidate({1})
+
+    # Then
+    pipe = await redis_mock.pipeline.return_value.__aenter__()
+    pipe.publish.assert_called_once_with("test:invalidate", "1")
+    assert cache.get(1) is None
+
+
+def test_committed_user_change_invalidates_user_cache():
+    # Given
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        user = User.create(email="h@id.e", password="p", nickname="hide", location=Location(lat=1, lng=2))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+        with patch.object(user_cache, "invalidate_soon") as invalidate_mock:
+            # When
+            user.nickname = "renamed"
+            db.flush()
+            before_commit = invalidate_mock.called
+            db.commit()
+
+    # Then
+    assert before_commit is False
+    invalidate_mock.assert_called_once_with({user_id})
+
+
+def test_rolled_back_user_change_is_not_invalidated():
+    # Given
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        user = User.create(email="h@id.e", password="p", nickname="hide", location=Location(lat=1, lng=2))
+        db.add(user)
+        db.commit()
+
+        with patch.object(user_cache, "invalidate_soon") as invalidate_mock:
+            # When
+            user.nickname = "renamed"
+            db.flush()
+            db.rollback()
+            db.commit()
+
+    # Then
+    invalidate_mock.assert_not_called()
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from core.helpers.lru import MISSING, TTLCache
+
+
+def test_evicts_least_recently_used():
+    # Given
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # When
+    cache.set("c", 3)
+
+    # Then
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire_after_their_ttl():
+    # Given
+    cache = TTLCache(maxsize=2, ttl=60)
+    with patch("core.helpers.lru.time.monotonic", return_value=100):
+        cache.set("a", None, ttl=5)
+
+    # When
+    with patch("core.helpers.lru.time.monotonic", return_value=104):
+        fresh = cache.get("a")
+    with patch("core.helpers.lru.time.monotonic", return_value=105):
+        expired = cache.get("a")
+
+    # Then
+    assert fresh is None
+    assert expired is MISSING
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+
+def test_non_positive_ttl_is_not_stored():
+    # Given
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    # When
+    cache.set("a", 1, ttl=-1)
+
+    # Then
+    assert len(cache) == 0
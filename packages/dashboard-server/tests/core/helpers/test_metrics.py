@@ -0,0 +1,61 @@
+import pytest
+
+from core.helpers.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    # Given
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+    # When
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    output = registry.render()
+
+    # Then
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_sum{route="/a"} 5.55' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+
+
+def test_counter_and_callback_gauge_render():
+    # Given
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("status",))
+    registry.gauge("queue", "Queue", ("stat",), callback=lambda: {("depth",): 7})
+
+    # When
+    counter.inc(200)
+    counter.inc(200)
+    output = registry.render()
+
+    # Then
+    assert "# TYPE requests_total counter" in output
+    assert 'requests_total{status="200"} 2' in output
+    assert 'queue{stat="depth"} 7' in output
+
+
+def test_label_values_are_escaped():
+    # Given
+    registry = MetricsRegistry()
+
+    # When
+    registry.counter("c", "C", ("path",)).inc('a"b\nc')
+
+    # Then
+    assert 'c{path="a\\"b\\nc"} 1' in registry.render()
+
+
+def test_registering_same_name_returns_existing_metric():
+    # Given
+    registry = MetricsRegistry()
+    counter = registry.counter("c", "C")
+
+    # When / Then
+    assert registry.counter("c", "C") is counter
+    with pytest.raises(ValueError):
+        registry.histogram("c", "C")
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from core.helpers.password import PASSWORD_QUEUE, PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(iterations=1000, max_workers=2, max_pending=2)
+    yield hasher
+    hasher.stop()
+
+
+@pytest.mark.asyncio
+async def test_hash_round_trip(hasher: PasswordHasher):
+    # When
+    encoded = await hasher.hash("s3cret")
+
+    # Then
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert await hasher.verify("s3cret", encoded) is True
+    assert await hasher.verify("wrong", encoded) is False
+    assert hasher.needs_rehash(encoded) is False
+
+
+@pytest.mark.asyncio
+async def test_same_password_gets_distinct_salts(hasher: PasswordHasher):
+    # When
+    first, second = await asyncio.gather(hasher.hash("s3cret"), hasher.hash("s3cret"))
+
+    # Then
+    assert first != second
+
+
+@pytest.mark.asyncio
+async def test_plain_text_password_verifies_and_needs_rehash(hasher: PasswordHasher):
+    # Then
+    assert await hasher.verify("plain", "plain") is True
+    assert await hasher.verify("other", "plain") is False
+    assert hasher.needs_rehash("plain") is True
+
+
+@pytest.mark.asyncio
+async def test_plain_text_password_still_costs_a_verify(hasher: PasswordHasher):
+    # Given
+    before = PASSWORD_QUEUE.count("verify")
+
+    # When
+    await hasher.verify("plain", "plain")
+
+    # Then
+    assert PASSWORD_QUEUE.count("verify") == before + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "pbkdf2_sha256$",
+        "pbkdf2_sha256$1000$c2FsdA",
+        "pbkdf2_sha256$abc$c2FsdA$ZGlnZXN0",
+        "pbkdf2_sha256$²$c2FsdA$ZGlnZXN0",
+        "pbkdf2_sha256$0$c2FsdA$ZGlnZXN0",
+        "pbkdf2_sha256$1000$not base64!$ZGlnZXN0",
+        "pbkdf2_sha256$1000$c2FsdA$ZGlnZXN0$extra",
+    ],
+)
+async def test_malformed_hash_never_verifies(hasher: PasswordHasher, encoded: str):
+    # Given
+    before = PASSWORD_QUEUE.count("verify")
+
+    # When
+    sut = await hasher.verify(encoded, encoded)
+
+    # Then
+    assert sut is False
+    assert hasher.needs_rehash(encoded) is True
+    assert PASSWORD_QUEUE.count("verify") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_changed_iterations_need_rehash(hasher: PasswordHasher):
+    # Given
+    encoded = await hasher.hash("s3cret")
+
+    # When
+    hasher.iterations = 2000
+
+    # Then
+    assert hasher.needs_rehash(encoded) is True
+    assert await hasher.verify("s3cret", encoded) is True
+
+
+@pytest.mark.asyncio
+async def test_missing_user_still_costs_a_verify(hasher: PasswordHasher):
+    # Given
+    before = PASSWORD_QUEUE.count("verify")
+
+    # When
+    sut = await hasher.verify("s3cret", None)
+
+    # Then
+    assert sut is False
+    assert PASSWORD_QUEUE.count("verify") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_jobs_beyond_max_pending_wait_for_a_slot(hasher: PasswordHasher):
+    # When
+    results = await asyncio.gather(*(hasher.hash(str(i)) for i in range(6)))
+
+    # Then
+    assert len(set(results)) == 6
+    assert hasher.in_flight == 0
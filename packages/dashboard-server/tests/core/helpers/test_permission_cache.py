@@ -0,0 +1,131 @@
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.user.adapter.output.persistence.sqlalchemy.user  # noqa: F401 registers tracking
+from app.user.domain.entity.user import User
+from app.user.domain.vo.location import Location
+from core.db import Base
+from core.helpers import permission_cache as module
+from core.helpers.permission_cache import PermissionCache
+
+
+def make_cache(redis_mock) -> PermissionCache:
+    return PermissionCache(redis_mock, maxsize=10, l1_ttl=60, l2_ttl=300, permissions=("is_admin",))
+
+
+def make_redis() -> Mock:
+    redis_mock = Mock()
+    redis_mock.get = AsyncMock(return_value=None)
+    redis_mock.set = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_mock.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis_mock.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_set_value_is_served_from_l1():
+    # Given
+    redis_mock = make_redis()
+    cache = make_cache(redis_mock)
+
+    # When
+    await cache.put(1, "is_admin", True)
+    sut = await cache.get(1, "is_admin")
+
+    # Then
+    assert sut is True
+    redis_mock.set.assert_awaited_once_with("permission:1:is_admin", "1", ex=300)
+    redis_mock.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_l1_miss_falls_back_to_redis():
+    # Given
+    redis_mock = make_redis()
+    redis_mock.get.return_value = "0"
+    cache = make_cache(redis_mock)
+
+    # When
+    sut = await cache.get(1, "is_admin")
+
+    # Then
+    assert sut is False
+    assert cache.stats()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_is_a_miss():
+    # Given
+    redis_mock = make_redis()
+    redis_mock.get.side_effect = ConnectionError
+    cache = make_cache(redis_mock)
+
+    # When
+    sut = await cache.get(1, "is_admin")
+
+    # Then
+    assert sut is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_l1_deletes_l2_and_publishes():
+    # Given
+    redis_mock = make_redis()
+    cache = make_cache(redis_mock)
+    await cache.put(1, "is_admin", True)
+
+    # When
+    await cache.invalidate({1})
+
+    # Then
+    pipe = await redis_mock.pipeline.return_value.__aenter__()
+    pipe.delete.assert_called_once_with("permission:1:is_admin")
+    pipe.publish.assert_called_once_with("permission:invalidate", "1")
+    assert await cache.get(1, "is_admin") is None
+
+
+def test_committed_is_admin_change_invalidates_user():
+    # Given
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        user = User.create(email="h@id.e", password="p", nickname="hide", location=Location(lat=1, lng=2))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+        with patch.object(module, "permission_cache") as cache_mock:
+            # When
+            user.nickname = "renamed"
+            db.commit()
+            untouched = cache_mock.invalidate_soon.called
+            user.is_admin = True
+            db.commit()
+
+    # Then
+    assert untouched is False
+    cache_mock.invalidate_soon.assert_called_once_with({user_id})
+
+
+def test_rolled_back_is_admin_change_is_not_invalidated():
+    # Given
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with Session(engine) as db:
+        user = User.create(email="h@id.e", password="p", nickname="hide", location=Location(lat=1, lng=2))
+        db.add(user)
+        db.commit()
+
+        with patch.object(module, "permission_cache") as cache_mock:
+            # When
+            user.is_admin = True
+            db.rollback()
+            db.commit()
+
+    # Then
+    cache_mock.invalidate_soon.assert_not_called()
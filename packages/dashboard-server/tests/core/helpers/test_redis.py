@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from core.helpers.redis import REDIS_LATENCY, TimedRedis
+
+
+@pytest.mark.asyncio
+async def test_commands_are_timed_by_client_and_command(monkeypatch):
+    # Given
+    monkeypatch.setattr(Redis, "execute_command", AsyncMock(return_value=[]))
+    client = TimedRedis(label="timed-commands")
+
+    # When
+    await client.xread({"stream": "0-0"}, block=10)
+    await client.xrange("stream", count=1)
+    await client.xrange("stream", count=1)
+
+    # Then
+    assert REDIS_LATENCY.count("timed-commands", "XREAD") == 1
+    assert REDIS_LATENCY.count("timed-commands", "XRANGE") == 2
+
+
+@pytest.mark.asyncio
+async def test_script_calls_are_timed(monkeypatch):
+    # Given
+    monkeypatch.setattr(Redis, "execute_command", AsyncMock(return_value=1))
+    client = TimedRedis(label="timed-scripts")
+    script = client.register_script("return 1")
+
+    # When
+    await script(keys=["key"], args=[])
+
+    # Then
+    assert REDIS_LATENCY.count("timed-scripts", "EVALSHA") == 1
+
+
+@pytest.mark.asyncio
+async def test_pipelines_are_timed_once(monkeypatch):
+    # Given
+    monkeypatch.setattr(Pipeline, "execute", AsyncMock(return_value=[True, True]))
+    client = TimedRedis(label="timed-pipelines")
+
+    # When
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.set("a", 1)
+        pipe.set("b", 2)
+        await pipe.execute()
+
+    # Then
+    assert REDIS_LATENCY.count("timed-pipelines", "PIPELINE") == 1
+    assert REDIS_LATENCY.count("timed-pipelines", "SET") == 0
@@ -1,14 +1,34 @@
 import json
 import uuid
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, get_args
+from config import settings
 from lib.redis_client import redis_client
 from schemas.reply import DashboardCard
 from lib.gemini_client import gemini_client
 
+# Timestamp-ordered indexes read by the server's GET /event/notifications
+INDEX_KEY = "dashboard:items_by_ts"
+INDEX_KEYS = [
+    INDEX_KEY,
+    *(f"{INDEX_KEY}:urgency:{u}" for u in get_args(DashboardCard.model_fields["urgency"].annotation)),
+    *(f"{INDEX_KEY}:action:{a}" for a in get_args(DashboardCard.model_fields["suggested_action"].annotation)),
+]
+
+# Capped event log the server tails for /event/stream; clients resume from it
+EVENTS_STREAM = "dashboard:stream"
+
 class MainProcessWorker():
     def __init__(self):
         pass
+
+    def _append_event(self, pipe, payload: str) -> None:
+        pipe.xadd(
+            EVENTS_STREAM,
+            {"data": payload},
+            maxlen=settings.dashboard_stream_maxlen,
+            approximate=True,
+        )
     
     async def process_batch(self, chat_id: str, card_name:str, history_objs: List[str]):
         if not history_objs:
@@ -39,10 +59,15 @@ class MainProcessWorker():
             if existing_card_id:
                 print(f"🔄 Follow-up detected for {chat_id}. Removing stale card {existing_card_id}...")
                 
-                await redis_client.hdel("dashboard:items", existing_card_id)
-                
                 delete_event = json.dumps({"action": "delete", "id": existing_card_id})
-                await redis_client.publish("dashboard:events", delete_event)
+
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    pipe.hdel("dashboard:items", existing_card_id)
+                    pipe.hdel("dashboard:card_chats", existing_card_id)
+                    for index_key in INDEX_KEYS:
+                        pipe.zrem(index_key, existing_card_id)
+                    self._append_event(pipe, delete_event)
+                    await pipe.execute()
         
         
             card_object: DashboardCard = gemini_client.prompt_llm(full_conversation=full_conversation)
@@ -68,17 +93,25 @@ class MainProcessWorker():
             card_dict['id'] = card_id
             card_dict['title'] = card_name
             card_dict['chat_id'] = chat_id
-            card_dict['timestamp'] = datetime.now().isoformat()
+            # Aware UTC, so index scores do not depend on this host's timezone or DST
+            created_at = datetime.now(timezone.utc)
+            card_dict['timestamp'] = created_at.isoformat()
             card_dict['conversation_history'] = lines
 
             json_payload = json.dumps(card_dict)
 
-            # Store to database
-            await redis_client.hset("dashboard:items", card_id, json_payload)
-
-            await redis_client.hset("dashboard:active_chats", str(chat_id), card_id)
-            
-            await redis_client.publish("dashboard:events", json_payload)
+            # Store to database. dashboard:card_chats is the reverse index the
+            # server uses to unlink active_chats without decoding the card.
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset("dashboard:items", card_id, json_payload)
+                pipe.hset("dashboard:active_chats", str(chat_id), card_id)
+                pipe.hset("dashboard:card_chats", card_id, str(chat_id))
+                score = {card_id: created_at.timestamp()}
+                pipe.zadd(INDEX_KEY, score)
+                pipe.zadd(f"{INDEX_KEY}:urgency:{card_object.urgency}", score)
+                pipe.zadd(f"{INDEX_KEY}:action:{card_object.suggested_action}", score)
+                self._append_event(pipe, json_payload)
+                await pipe.execute()
             print(f"✅ Queued summary for {chat_id}")
 
         except Exception as e:
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     # App Settings
     omit_group_messages: bool = False
     debounce_buffer_sec: int = 15
+    dashboard_stream_maxlen: int = 1000
     
     gemini_model: str = "gemini-3-pro-preview"
 